@@ -5,6 +5,7 @@ from ... import constants
 
 from ...helpers.showMessage import showMessage
 from ...helpers.Gemstones import GemstoneInfo, extractGemstonesInfo, findValidConnections, isGemstone
+from ...helpers.Bodies import deleteBodiesAfter
 
 
 _handlers = []
@@ -701,8 +702,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
             component.bRepBodies.add(channel, baseFeature)
 
         # Remove extra bodies if any exist (there should only be one channel body)
-        while baseFeature.bodies.count > 1:
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, 1)
 
         baseFeature.finishEdit()
 
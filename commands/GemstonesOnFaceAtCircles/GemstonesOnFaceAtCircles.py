@@ -6,6 +6,7 @@ from ... import constants
 from ...constants import minimumGemstoneSize
 from ...helpers.showMessage import showMessage
 from ...helpers.Gemstones import createGemstone, updateGemstone, setGemstoneAttributes, updateGemstoneFeature, diamondMaterial
+from ...helpers.Bodies import deleteBodiesAfter
 
 _app: adsk.core.Application = None
 _ui: adsk.core.UserInterface = None
@@ -651,8 +652,7 @@ def computeFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                     success = False
 
 
-        while baseFeature.bodies.count > len(circles):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, len(circles))
 
         baseFeature.finishEdit()
 
@@ -7,6 +7,7 @@ from ...helpers.showMessage import showMessage
 from ...helpers.Gemstones import createGemstone, updateGemstone, setGemstoneAttributes, updateGemstoneFeature, diamondMaterial
 from ...helpers.Curves import calculatePointsAndSizesAlongCurveChain, getCurve3D, getCurveEndpoints, canConnectToChain
 from ...helpers.Surface import getClosestFace
+from ...helpers.Bodies import deleteBodiesAfter
 
 _app: adsk.core.Application = None
 _ui: adsk.core.UserInterface = None
@@ -1111,8 +1112,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                     success = False
 
 
-        while baseFeature.bodies.count > len(pointsAndSizes):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, len(pointsAndSizes))
 
         baseFeature.finishEdit()
 
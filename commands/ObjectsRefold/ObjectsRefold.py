@@ -7,6 +7,7 @@ from ... import constants
 from ...helpers.showMessage import showMessage
 from ...helpers.Surface import refoldBodiesToSurface
 from ...helpers.Points import getPointGeometry
+from ...helpers.Bodies import deleteBodiesAfter
 from ...helpers import Bodies
 
 
@@ -648,8 +649,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                 newBody = component.bRepBodies.add(resultBody, baseFeature)
                 if not _isRolledForEdit: Bodies.copyAttributes(sourceBody, newBody)
 
-        while baseFeature.bodies.count > len(resultBodies):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, len(resultBodies))
 
         baseFeature.finishEdit()
         
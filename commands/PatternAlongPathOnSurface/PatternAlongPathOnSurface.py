@@ -9,6 +9,7 @@ from ...helpers.Curves import calculatePointsAlongCurve, getCurve3D
 from ...helpers.Surface import getDataFromPointAndFace
 from ...helpers import Bodies
 from ...helpers.Points import getPointGeometry
+from ...helpers.Bodies import deleteBodiesAfter
 
 _app: adsk.core.Application = None
 _ui: adsk.core.UserInterface = None
@@ -1387,8 +1388,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                 newTransforms.append(transform)
                 outputIndex += 1
 
-        while baseFeature.bodies.count > totalOutputBodies:
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, totalOutputBodies)
 
         saveTransformsToFeature(baseFeature, newTransforms)
         baseFeature.finishEdit()
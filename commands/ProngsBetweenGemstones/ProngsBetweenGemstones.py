@@ -6,6 +6,7 @@ from ... import constants
 from ...helpers.showMessage import showMessage
 from ...helpers.Gemstones import extractGemstonesInfo, findValidConnections, isGemstone
 from ...helpers.Prongs import createProngInfosFromConnections, createProngFromInfo, updateProngFromInfo, createProngInfosFromConnections, setProngAttributes, updateProngFeature
+from ...helpers.Bodies import deleteBodiesAfter
 
 
 _handlers = []
@@ -765,8 +766,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                     if not _isRolledForEdit:
                         setProngAttributes(newBody)
 
-        while baseFeature.bodies.count > len(prongInfos):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, len(prongInfos))
 
         baseFeature.finishEdit()
 
@@ -1,24 +1,38 @@
 import os
+import json
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
 import adsk.core, adsk.fusion, traceback
 
 from ... import constants
 
-from ...helpers.showMessage import showMessage
-from ...helpers.Prongs import createProng, updateProngAndNormalize, setProngAttributes, updateProngFeature
-from ...helpers.Bodies import placeBody
-from ...helpers.Surface import getDataFromPointAndFace
+from ...helpers.showMessage import showMessage, formatException
+from ...helpers.Prongs import createProngAt, setProngAttributes, updateProngFeature
+from ...helpers.Surface import FaceContext, getFaceContext, getDataFromPointsAndFaceContext
 
 
 _handlers = []
+_commandHandlers = []
 
 _app: adsk.core.Application = None
 _ui: adsk.core.UserInterface = None
 
 _customFeatureDefinition: adsk.fusion.CustomFeature = None
 
-_editedCustomFeature: adsk.fusion.CustomFeature = None
-_restoreTimelineObject: adsk.fusion.TimelineObject = None
-_isRolledForEdit: bool = False
+
+@dataclass
+class _EditState:
+    """Timeline state of the prongs feature that is currently being edited."""
+
+    feature: adsk.fusion.CustomFeature = None
+    restoreTimelineObject: adsk.fusion.TimelineObject = None
+    isRolled: bool = False
+    activatedToken: str = None
+
+
+_editState = _EditState()
 
 _faceSelectionInput: adsk.core.SelectionCommandInput = None
 _pointSelectionInput: adsk.core.SelectionCommandInput = None
@@ -26,6 +40,32 @@ _pointSelectionInput: adsk.core.SelectionCommandInput = None
 _sizeValueInput: adsk.core.ValueCommandInput = None
 _heightValueInput: adsk.core.ValueCommandInput = None
 
+_PARAMETERS_HASH_SCALE = 1e5
+
+_POINT_DEPENDENCY_PREFIX = 'point'
+_pointDependencyIds: list[str] = [f'{_POINT_DEPENDENCY_PREFIX}{i}' for i in range(64)]
+
+_previewCache: dict[tuple[str, str], tuple] = {}
+_previewBodies: dict[tuple[str, str, float, float], adsk.fusion.BRepBody] = {}
+_previewFaceKey: str = None
+_pointWorldGeometries: dict[str, adsk.core.Point3D] = {}
+_previewComponent: adsk.fusion.Component = None
+
+_trailingPreviewEventId = constants.ProngsAtPoints.commandId + 'TrailingPreview'
+_trailingPreviewEvent: adsk.core.CustomEvent = None
+_previewDebounceSeconds = 0.08
+_lastPreviewTime: float = 0.0
+_isValueInputChanging: bool = False
+_previewTimer: threading.Timer = None
+_activeCommand: adsk.core.Command = None
+
+_previewSizeTolerance = 0.005
+_lastPreviewSize: float = None
+_lastPreviewHeight: float = None
+
+_messageEventId = constants.ProngsAtPoints.commandId + 'ShowMessage'
+_messageEvent: adsk.core.CustomEvent = None
+
 
 RESOURCES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '')
 
@@ -56,6 +96,8 @@ heightInputDef = constants.InputDef(
     "Prong height above the surface.\nControls how tall the prong extends."
     )
 
+_valueInputIds = frozenset((sizeInputDef.id, heightInputDef.id))
+
 
 def run(panel: adsk.core.ToolbarPanel):
     """Initialize the prongs command when the add-in is loaded.
@@ -66,7 +108,7 @@ def run(panel: adsk.core.ToolbarPanel):
         panel: The toolbar panel to add the command to
     """
     try:
-        global _app, _ui, _customFeatureDefinition
+        global _app, _ui, _customFeatureDefinition, _trailingPreviewEvent, _messageEvent
         _app = adsk.core.Application.get()
         _ui  = _app.userInterface
 
@@ -96,7 +138,17 @@ def run(panel: adsk.core.ToolbarPanel):
         computeCustomFeature = ComputeCustomFeature()
         _customFeatureDefinition.customFeatureCompute.add(computeCustomFeature)
         _handlers.append(computeCustomFeature)
-    except:
+
+        _trailingPreviewEvent = _app.registerCustomEvent(_trailingPreviewEventId)
+        trailingPreview = TrailingPreviewHandler()
+        _trailingPreviewEvent.add(trailingPreview)
+        _handlers.append(trailingPreview)
+
+        _messageEvent = _app.registerCustomEvent(_messageEventId)
+        onMessage = MessageEventHandler()
+        _messageEvent.add(onMessage)
+        _handlers.append(onMessage)
+    except Exception:
         showMessage(f'Run failed:\n{traceback.format_exc()}', True)
 
 
@@ -120,7 +172,15 @@ def stop(panel: adsk.core.ToolbarPanel):
         commandDefinition = _ui.commandDefinitions.itemById(constants.ProngsAtPoints.editCommandId)
         if commandDefinition:
             commandDefinition.deleteMe()
-    except:
+
+        clearCommandCache()
+
+        cancelTrailingPreview()
+        _commandHandlers.clear()
+        _app.unregisterCustomEvent(_trailingPreviewEventId)
+        _app.unregisterCustomEvent(_messageEventId)
+        _handlers.clear()
+    except Exception:
         showMessage(f'Stop Failed:\n{traceback.format_exc()}', True)
 
 
@@ -135,10 +195,15 @@ class CreateCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         super().__init__()
     def notify(self, args):
         try:
-            global _faceSelectionInput, _pointSelectionInput, _sizeValueInput, _heightValueInput
+            global _faceSelectionInput, _pointSelectionInput, _sizeValueInput, _heightValueInput, _activeCommand
 
             eventArgs = adsk.core.CommandCreatedEventArgs.cast(args)
             command = eventArgs.command
+            _activeCommand = command
+
+            # Only one command runs at a time, so the handlers of the previous one can be released.
+            _commandHandlers.clear()
+            clearCommandCache()
             inputs = command.commandInputs
             defaultLengthUnits = _app.activeProduct.unitsManager.defaultLengthUnits
 
@@ -165,21 +230,29 @@ class CreateCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
             onPreSelect = PreSelectHandler()
             command.preSelect.add(onPreSelect)
-            _handlers.append(onPreSelect)
+            _commandHandlers.append(onPreSelect)
 
             onValidate = ValidateInputsHandler()
             command.validateInputs.add(onValidate)
-            _handlers.append(onValidate)
+            _commandHandlers.append(onValidate)
+
+            onInputChanged = InputChangedHandler()
+            command.inputChanged.add(onInputChanged)
+            _commandHandlers.append(onInputChanged)
 
             onExecutePreview = ExecutePreviewHandler()
             command.executePreview.add(onExecutePreview)
-            _handlers.append(onExecutePreview)
+            _commandHandlers.append(onExecutePreview)
 
             onExecute = CreateExecuteHandler()
             command.execute.add(onExecute)
-            _handlers.append(onExecute)
+            _commandHandlers.append(onExecute)
+
+            onDestroy = CreateDestroyHandler()
+            command.destroy.add(onDestroy)
+            _commandHandlers.append(onDestroy)
 
-        except:
+        except Exception:
             showMessage(f'CreateCommandCreatedHandler: {traceback.format_exc()}\n', True)
 
 
@@ -193,15 +266,20 @@ class EditCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         super().__init__()
     def notify(self, args):
         try:
-            global _editedCustomFeature, _faceSelectionInput, _pointSelectionInput, _sizeValueInput, _heightValueInput
+            global _faceSelectionInput, _pointSelectionInput, _sizeValueInput, _heightValueInput, _activeCommand
 
             eventArgs = adsk.core.CommandCreatedEventArgs.cast(args)
             command = eventArgs.command
+            _activeCommand = command
+
+            # Only one command runs at a time, so the handlers of the previous one can be released.
+            _commandHandlers.clear()
+            clearCommandCache()
             inputs = command.commandInputs
             defaultLengthUnits = _app.activeProduct.unitsManager.defaultLengthUnits
 
-            _editedCustomFeature = _ui.activeSelections.item(0).entity
-            if _editedCustomFeature is None:
+            _editState.feature = _ui.activeSelections.item(0).entity
+            if _editState.feature is None:
                 return
 
             _pointSelectionInput = inputs.addSelectionInput(selectPointsInputDef.id, selectPointsInputDef.name, selectPointsInputDef.tooltip)
@@ -217,7 +295,7 @@ class EditCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
             inputs.addSeparatorCommandInput('separatorAfterPoints')
 
-            parameters = _editedCustomFeature.parameters
+            parameters = _editState.feature.parameters
 
             size = adsk.core.ValueInput.createByString(parameters.itemById(sizeInputDef.id).expression)
             _sizeValueInput = inputs.addValueInput(sizeInputDef.id, sizeInputDef.name, defaultLengthUnits, size)
@@ -229,29 +307,33 @@ class EditCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
             onPreSelect = PreSelectHandler()
             command.preSelect.add(onPreSelect)
-            _handlers.append(onPreSelect)
+            _commandHandlers.append(onPreSelect)
 
             onValidate = ValidateInputsHandler()
             command.validateInputs.add(onValidate)
-            _handlers.append(onValidate)
+            _commandHandlers.append(onValidate)
+
+            onInputChanged = InputChangedHandler()
+            command.inputChanged.add(onInputChanged)
+            _commandHandlers.append(onInputChanged)
 
             onExecutePreview = ExecutePreviewHandler()
             command.executePreview.add(onExecutePreview)
-            _handlers.append(onExecutePreview)
+            _commandHandlers.append(onExecutePreview)
 
             onActivate = EditActivateHandler()
             command.activate.add(onActivate)
-            _handlers.append(onActivate)
+            _commandHandlers.append(onActivate)
 
             onDestroy = EditDestroyHandler()
             command.destroy.add(onDestroy)
-            _handlers.append(onDestroy)
+            _commandHandlers.append(onDestroy)
 
             onExecute = EditExecuteHandler()
             command.execute.add(onExecute)
-            _handlers.append(onExecute)
+            _commandHandlers.append(onExecute)
 
-        except:
+        except Exception:
             showMessage(f'EditCommandCreatedHandler: {traceback.format_exc()}\n', True)
 
 
@@ -288,8 +370,8 @@ class PreSelectHandler(adsk.core.SelectionEventHandler):
                         eventArgs.isSelectable = False
                         return
 
-        except:
-            showMessage(f'PreSelectHandler: {traceback.format_exc()}\n', True)
+        except Exception as e:
+            postMessage(f'PreSelectHandler: {formatException(e)}\n', True)
 
 
 class ValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
@@ -332,15 +414,40 @@ class ValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
                 eventArgs.areInputsValid = False
                 return
 
-        except:
-            showMessage(f'ValidateInputsHandler: {traceback.format_exc()}\n', True)
+        except Exception as e:
+            postMessage(f'ValidateInputsHandler: {formatException(e)}\n', True)
+
+class InputChangedHandler(adsk.core.InputChangedEventHandler):
+    """Event handler for the inputChanged event."""
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        global _isValueInputChanging
+        try:
+            eventArgs = adsk.core.InputChangedEventArgs.cast(args)
+            _isValueInputChanging = eventArgs.input.id in _valueInputIds
+
+        except Exception as e:
+            postMessage(f'InputChangedHandler: {formatException(e)}\n', True)
 
 class ExecutePreviewHandler(adsk.core.CommandEventHandler):
     """Event handler for the executePreview event."""
     def __init__(self):
         super().__init__()
     def notify(self, args):
+        global _previewFaceKey, _previewComponent, _lastPreviewTime, _lastPreviewSize, _lastPreviewHeight
+
         try:
+            # Coalesce bursts of size/height slider events; the trailing preview renders the final value.
+            if _isValueInputChanging:
+                elapsed = time.monotonic() - _lastPreviewTime
+                if elapsed < _previewDebounceSeconds:
+                    scheduleTrailingPreview(_previewDebounceSeconds - elapsed)
+                    # Fusion has already rolled back the last preview, so its prongs are drawn again until the trailing preview.
+                    if _previewComponent is not None and _previewBodies:
+                        addPreviewProngs(_previewComponent, list(_previewBodies.values()))
+                    return
+
             if _faceSelectionInput.selectionCount < 1 or _pointSelectionInput.selectionCount < 1:
                 return
 
@@ -350,8 +457,9 @@ class ExecutePreviewHandler(adsk.core.CommandEventHandler):
                 return
 
 
+            pointCount = _pointSelectionInput.selectionCount
             pointEntities = []
-            for i in range(_pointSelectionInput.selectionCount):
+            for i in range(pointCount):
                 point = _pointSelectionInput.selection(i).entity
                 if point is None:
                     return
@@ -360,36 +468,88 @@ class ExecutePreviewHandler(adsk.core.CommandEventHandler):
             size = _sizeValueInput.value
             depth = _heightValueInput.value
 
+            # Changes below the tolerance are not visible, so they reuse the cached prongs of the last preview.
+            if isWithinPreviewTolerance(size, _lastPreviewSize) and isWithinPreviewTolerance(depth, _lastPreviewHeight):
+                size = _lastPreviewSize
+                depth = _lastPreviewHeight
+            else:
+                _lastPreviewSize = size
+                _lastPreviewHeight = depth
+
+            faceKey = faceEntity.entityToken
+            if faceKey != _previewFaceKey:
+                clearPreviewCache()
+                _previewFaceKey = faceKey
+                if faceEntity.objectType == adsk.fusion.ConstructionPlane.classType():
+                    _previewComponent = faceEntity.component
+                else:
+                    _previewComponent = faceEntity.body.parentComponent
+            component = _previewComponent
+
+            # Fusion discards the preview base feature before every executePreview, so the diff is
+            # kept on the temporary prongs: only added points or a new size/height build new bodies.
+            missingPoints = [pointEntity for pointEntity in pointEntities if (faceKey, pointEntity.entityToken) not in _previewCache]
+            if missingPoints:
+                placements = computePlacements(getFaceContext(faceEntity), getWorldPoints(missingPoints))
+                if placements is None:
+                    return
+                for pointEntity, placement in zip(missingPoints, placements):
+                    _previewCache[(faceKey, pointEntity.entityToken)] = placement
+
+            sizeKey = (round(size, 6), round(depth, 6))
+            previewBodies: dict[tuple[str, str, float, float], adsk.fusion.BRepBody] = {}
             prongs = []
             for pointEntity in pointEntities:
-                prong = createBody(faceEntity, pointEntity.worldGeometry, size, depth)
+                cacheKey = (faceKey, pointEntity.entityToken)
+                prong = _previewBodies.get(cacheKey + sizeKey)
                 if prong is None:
-                    return
+                    prong = createBodyAtPlacement(_previewCache[cacheKey], size, depth)
+                    if prong is None:
+                        return
+
+                previewBodies[cacheKey + sizeKey] = prong
                 prongs.append(prong)
 
+            _previewBodies.clear()
+            _previewBodies.update(previewBodies)
 
-            if faceEntity.objectType == adsk.fusion.ConstructionPlane.classType():
-                component = faceEntity.component
-            else:
-                parametricBody = faceEntity.body
-                component = parametricBody.parentComponent
+            addPreviewProngs(component, prongs)
+            _lastPreviewTime = time.monotonic()
 
-            baseFeature = component.features.baseFeatures.add()
-            baseFeature.startEdit()
-            for i in range(len(prongs)):
-                body = component.bRepBodies.add(prongs[i], baseFeature)
-                setProngAttributes(body)
-            baseFeature.finishEdit()
+        except Exception as e:
+            postMessage(f'ExecutePreviewHandler: {formatException(e)}\n', True)
 
-        except:
-            baseFeature.finishEdit()
-            showMessage(f'ExecutePreviewHandler: {traceback.format_exc()}\n', True)
+class TrailingPreviewHandler(adsk.core.CustomEventHandler):
+    """Re-runs the preview after a burst of skipped executePreview events."""
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # The destroy handlers cancel the timer and forget the command, so a closed command is never previewed.
+            if _activeCommand is not None:
+                _activeCommand.doExecutePreview()
+        except Exception as e:
+            postMessage(f'TrailingPreviewHandler: {formatException(e)}\n', True)
+
+class MessageEventHandler(adsk.core.CustomEventHandler):
+    """Shows messages posted by postMessage once Fusion processes the custom event."""
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            eventArgs = adsk.core.CustomEventArgs.cast(args)
+            data = json.loads(eventArgs.additionalInfo)
+            showMessage(data['message'], data['error'])
+        except Exception:
+            showMessage(f'MessageEventHandler: {traceback.format_exc()}\n', True)
 
 class CreateExecuteHandler(adsk.core.CommandEventHandler):
     """Event handler for the execute event of the create command."""
     def __init__(self):
         super().__init__()
     def notify(self, args):
+        baseFeature: adsk.fusion.BaseFeature = None
+        isEditing = False
         try:
             eventArgs = adsk.core.CommandEventArgs.cast(args)
 
@@ -402,21 +562,31 @@ class CreateExecuteHandler(adsk.core.CommandEventHandler):
                 component = parametricBody.parentComponent
 
 
+            pointCount = _pointSelectionInput.selectionCount
             pointEntities: list[adsk.fusion.SketchPoint] = []
-            for i in range(_pointSelectionInput.selectionCount):
+            for i in range(pointCount):
                 pointEntities.append(_pointSelectionInput.selection(i).entity)
 
 
+            # Fusion API calls must stay on the main thread, so the independent per-point work is
+            # done in one pass before the base feature is opened and only the adds run inside it.
+            size = _sizeValueInput.value
+            height = _heightValueInput.value
+            prongs = buildProngs(faceEntity, pointEntities, size, height)
+            if prongs is None:
+                eventArgs.executeFailed = True
+                return
+
             baseFeature = component.features.baseFeatures.add()
             baseFeature.startEdit()
-            for i in range(len(pointEntities)):
-                prong = createBody(faceEntity, pointEntities[i].worldGeometry, _sizeValueInput.value, _heightValueInput.value)
-                if prong is None:
-                    eventArgs.executeFailed = True
-                    return
-                body = component.bRepBodies.add(prong, baseFeature)
-                setProngAttributes(body)
+            isEditing = True
+            bodies = [component.bRepBodies.add(prong, baseFeature) for prong in prongs]
             baseFeature.finishEdit()
+            isEditing = False
+
+            # Attributes are written after the edit, the same way updateFeature does it.
+            for body in bodies:
+                setProngAttributes(body)
 
             design: adsk.fusion.Design = _app.activeProduct
             defaultLengthUnits = design.unitsManager.defaultLengthUnits
@@ -424,9 +594,11 @@ class CreateExecuteHandler(adsk.core.CommandEventHandler):
             customFeatureInput = component.features.customFeatures.createInput(_customFeatureDefinition)
 
 
-            customFeatureInput.addDependency('face', faceEntity)
-            for i in range(len(pointEntities)):
-                customFeatureInput.addDependency(f'point{i}', pointEntities[i])
+            # The API has no bulk dependency method, so the ids are built up front and the bound method is reused.
+            addDependency = customFeatureInput.addDependency
+            addDependency('face', faceEntity)
+            for dependencyId, pointEntity in getPointDependencyIds(pointEntities):
+                addDependency(dependencyId, pointEntity)
 
 
             sizeInput = adsk.core.ValueInput.createByString(_sizeValueInput.expression)
@@ -440,13 +612,28 @@ class CreateExecuteHandler(adsk.core.CommandEventHandler):
             customFeatureInput.setStartAndEndFeatures(baseFeature, baseFeature)
 
             component.features.customFeatures.add(customFeatureInput)
+            clearCommandCache()
+            cancelTrailingPreview()
 
-        except:
-            baseFeature.finishEdit()
+        except Exception:
+            if isEditing:
+                baseFeature.finishEdit()
             eventArgs.executeFailed = True
             showMessage(f'CreateExecuteHandler: {traceback.format_exc()}\n', True)
 
 
+class CreateDestroyHandler(adsk.core.CommandEventHandler):
+    """Releases the preview caches and the pending trailing preview when the create command is closed."""
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            clearCommandCache()
+            cancelTrailingPreview()
+        except Exception:
+            showMessage(f'CreateDestroyHandler: {traceback.format_exc()}\n', True)
+
+
 class EditActivateHandler(adsk.core.CommandEventHandler):
     """Event handler for the activation of the edit command for a custom feature.
 
@@ -457,42 +644,39 @@ class EditActivateHandler(adsk.core.CommandEventHandler):
         super().__init__()
     def notify(self, args):
         try:
-            global _restoreTimelineObject, _isRolledForEdit, _editedCustomFeature, _faceSelectionInput, _pointSelectionInput
+            global _faceSelectionInput, _pointSelectionInput
 
             eventArgs = adsk.core.CommandEventArgs.cast(args)
 
-            if _isRolledForEdit: return
-
+            # Re-activation (e.g. after a palette takes focus) keeps the rolled timeline and the selections.
+            featureToken = _editState.feature.entityToken
+            if _editState.activatedToken == featureToken: return
 
-            design: adsk.fusion.Design = _app.activeProduct
-            timeline = design.timeline
-            markerPosition = timeline.markerPosition
-            _restoreTimelineObject = timeline.item(markerPosition - 1)
+            if not _editState.isRolled:
+                design: adsk.fusion.Design = _app.activeProduct
+                timeline = design.timeline
+                markerPosition = timeline.markerPosition
+                _editState.restoreTimelineObject = timeline.item(markerPosition - 1)
 
 
-            _editedCustomFeature.timelineObject.rollTo(True)
-            _isRolledForEdit = True
+                _editState.feature.timelineObject.rollTo(True)
+                _editState.isRolled = True
 
-            command = eventArgs.command
+                command = eventArgs.command
 
-            command.beginStep()
+                command.beginStep()
 
 
-            i = 0
-            while True:
-                try:
-                    dependency = _editedCustomFeature.dependencies.itemById(f'point{i}')
-                    if dependency is None: break
-                    sketchPoint = dependency.entity
-                    if sketchPoint is not None: _pointSelectionInput.addSelection(sketchPoint)
-                    i += 1
-                except:
-                    break
+            dependencyEntities = getDependencyEntities(_editState.feature)
+            for sketchPoint in getPointDependencies(dependencyEntities):
+                if sketchPoint is not None: _pointSelectionInput.addSelection(sketchPoint)
 
-            faceEntity = _editedCustomFeature.dependencies.itemById('face').entity
+            faceEntity = dependencyEntities.get('face')
             _faceSelectionInput.addSelection(faceEntity)
 
-        except:
+            _editState.activatedToken = featureToken
+
+        except Exception:
             showMessage(f'EditActivateHandler: {traceback.format_exc()}\n', True)
             pass
 
@@ -506,7 +690,7 @@ class EditDestroyHandler(adsk.core.CommandEventHandler):
             eventArgs = adsk.core.CommandEventArgs.cast(args)
             if eventArgs.terminationReason != adsk.core.CommandTerminationReason.CompletedTerminationReason:
                 rollBack()
-        except:
+        except Exception:
             showMessage(f'EditDeactivateHandler: {traceback.format_exc()}\n', True)
 
 
@@ -515,8 +699,6 @@ class EditExecuteHandler(adsk.core.CommandEventHandler):
     def __init__(self):
         super().__init__()
     def notify(self, args):
-        global _editedCustomFeature, _isRolledForEdit, _restoreTimelineObject
-
         try:
 
             eventArgs = adsk.core.CommandEventArgs.cast(args)
@@ -527,16 +709,16 @@ class EditExecuteHandler(adsk.core.CommandEventHandler):
             for i in range(pointCount):
                 pointEntities.append(_pointSelectionInput.selection(i).entity)
 
-            _editedCustomFeature.dependencies.deleteAll()
-            _editedCustomFeature.dependencies.add('face', faceEntity)
+            editedCustomFeature = _editState.feature
+            updateDependencies(editedCustomFeature.dependencies, faceEntity, pointEntities)
 
-            for i in range(pointCount):
-                _editedCustomFeature.dependencies.add(f'point{i}', pointEntities[i])
-
-            _editedCustomFeature.parameters.itemById(sizeInputDef.id).expression = _sizeValueInput.expression
-            _editedCustomFeature.parameters.itemById(heightInputDef.id).expression = _heightValueInput.expression
+            parameters = editedCustomFeature.parameters
+            for parameterId, expression in ((sizeInputDef.id, _sizeValueInput.expression), (heightInputDef.id, _heightValueInput.expression)):
+                parameter = parameters.itemById(parameterId)
+                if parameter.expression != expression:
+                    parameter.expression = expression
 
-        except:
+        except Exception:
             showMessage(f'EditExecuteHandler: {traceback.format_exc()}\n', True)
 
         finally: rollBack()
@@ -556,74 +738,364 @@ class ComputeCustomFeature(adsk.fusion.CustomFeatureEventHandler):
             customFeature = eventArgs.customFeature
             updateFeature(customFeature)
 
-        except:
-            showMessage(f'ComputeCustomFeature: {traceback.format_exc()}\n', True)
+        except Exception as e:
+            postMessage(f'ComputeCustomFeature: {formatException(e)}\n', True)
 
 
-def createBody(face: adsk.fusion.BRepFace, point: adsk.core.Point3D, size: float, height: float, flat: bool = True) -> adsk.fusion.BRepBody | None:
-    """Create a prong body based on the face, point, size, and height.
+def scheduleTrailingPreview(delay: float):
+    """Fire the trailing preview event once the debounce interval has passed.
+
+    Fusion custom events may be fired from a worker thread; the handler itself runs on the main thread.
 
     Args:
-        face: The face where the prong will be placed.
-        point: The point on the face where the prong will be created.
+        delay: Seconds to wait before firing the event.
+    """
+    global _previewTimer
+
+    if _previewTimer is not None:
+        _previewTimer.cancel()
+
+    _previewTimer = threading.Timer(delay, _app.fireCustomEvent, (_trailingPreviewEventId,))
+    _previewTimer.daemon = True
+    _previewTimer.start()
+
+
+def cancelTrailingPreview():
+    """Cancel a pending trailing preview and forget the active command."""
+    global _previewTimer, _activeCommand, _isValueInputChanging
+
+    if _previewTimer is not None:
+        _previewTimer.cancel()
+        _previewTimer = None
+
+    _activeCommand = None
+    _isValueInputChanging = False
+
+
+def addPreviewProngs(component: adsk.fusion.Component, prongs: list[adsk.fusion.BRepBody]):
+    """Add temporary prongs to a preview base feature and tag them as prongs.
+
+    Args:
+        component: The component that receives the preview base feature.
+        prongs: The temporary prong bodies to add.
+    """
+    baseFeature = component.features.baseFeatures.add()
+    baseFeature.startEdit()
+    try:
+        bodies = [component.bRepBodies.add(prong, baseFeature) for prong in prongs]
+    finally:
+        baseFeature.finishEdit()
+
+    for body in bodies:
+        setProngAttributes(body)
+
+
+def postMessage(message: str, error: bool = False):
+    """Queue a message for showMessage instead of showing it from inside the current handler.
+
+    Selection, validation, preview and compute handlers fire repeatedly; a modal message box
+    opened from inside them blocks the interaction that raised it. The custom event is
+    handled by Fusion after the current handler returns.
+
+    Args:
+        message: The message text to display.
+        error: If True, shows the message as an error.
+    """
+    if _messageEvent is None:
+        showMessage(message, error)
+        return
+
+    _app.fireCustomEvent(_messageEventId, json.dumps({'message': message, 'error': error}))
+
+
+def isWithinPreviewTolerance(value: float, lastValue: float | None) -> bool:
+    """Check whether a value differs from the last previewed one by less than _previewSizeTolerance.
+
+    Args:
+        value: The current input value.
+        lastValue: The value used by the last preview, or None if there was none.
+
+    Returns:
+        True if the preview can keep using lastValue.
+    """
+    if lastValue is None or lastValue == 0:
+        return False
+
+    return abs(value - lastValue) / abs(lastValue) < _previewSizeTolerance
+
+
+def getWorldPoints(pointEntities: list[adsk.fusion.SketchPoint]) -> list[adsk.core.Point3D]:
+    """Return the world positions of sketch points, querying each selected point only once per command.
+
+    Every worldGeometry access walks the occurrence tree of the point, so the positions
+    are kept by entity token for the preview and execute handlers of the running command.
+
+    Args:
+        pointEntities: The selected sketch points.
+
+    Returns:
+        The world positions in the same order.
+    """
+    worldPoints = []
+    for pointEntity in pointEntities:
+        token = pointEntity.entityToken
+        worldPoint = _pointWorldGeometries.get(token)
+        if worldPoint is None:
+            worldPoint = pointEntity.worldGeometry
+            _pointWorldGeometries[token] = worldPoint
+        worldPoints.append(worldPoint)
+
+    return worldPoints
+
+
+def clearCommandCache():
+    """Forget everything cached for the running command, including the point world positions."""
+    clearPreviewCache()
+    _pointWorldGeometries.clear()
+
+
+def clearPreviewCache():
+    """Forget the face evaluations and temporary prongs cached by the preview handler."""
+    global _previewFaceKey, _previewComponent, _lastPreviewSize, _lastPreviewHeight
+
+    _previewCache.clear()
+    _previewBodies.clear()
+    _previewFaceKey = None
+    _previewComponent = None
+    _lastPreviewSize = None
+    _lastPreviewHeight = None
+
+
+class _ProngUpdateError(Exception):
+    """Raised when a prong body cannot be created or updated during a feature update."""
+
+
+ProngPlacement = tuple[adsk.core.Point3D, adsk.core.Vector3D, adsk.core.Vector3D, adsk.core.Vector3D]
+
+
+def computePlacements(faceContext: FaceContext, points: list[adsk.core.Point3D]) -> list[ProngPlacement] | None:
+    """Evaluate the prong frames of many points with batched surface evaluator calls.
+
+    Args:
+        faceContext: The precomputed context of the face where the prongs are placed.
+        points: The points on the face where the prongs should be.
+
+    Returns:
+        One placement per point or None if the face could not be evaluated.
+    """
+    if faceContext is None: return None
+
+    return getDataFromPointsAndFaceContext(faceContext, points)
+
+
+def createBodyAtPlacement(placement: ProngPlacement, size: float, height: float) -> adsk.fusion.BRepBody | None:
+    """Create a prong body at a precomputed placement.
+
+    The prong is built directly in its target frame, so no separate placement transform is needed.
+
+    Args:
+        placement: A placement returned by computePlacements.
         size: The size of the prong.
         height: The height of the prong.
-        flat: Whether the prong should be flat (default True).
 
     Returns:
         The created prong body or None if creation failed.
     """
-    try:
-        if face is None or point is None: return None
+    originPoint, _, _, normal = placement
+    return createProngAt(size, height, originPoint, normal)
 
 
-        prong = createProng(size, height)
-        if prong is None:
+def buildProngs(faceEntity: adsk.fusion.BRepFace | adsk.fusion.ConstructionPlane, pointEntities: list[adsk.fusion.SketchPoint],
+                size: float, height: float) -> list[adsk.fusion.BRepBody] | None:
+    """Build the temporary prong bodies for a list of points before any of them is added to the document.
+
+    Placements already evaluated by the preview of the same face are reused, so committing
+    the command does not evaluate the face again for points the user has just previewed.
+
+    Args:
+        faceEntity: The face or construction plane where the prongs will be placed.
+        pointEntities: The sketch points of the prong centers.
+        size: The size of the prongs.
+        height: The height of the prongs.
+
+    Returns:
+        The prong bodies in point order or None if any of them could not be created.
+    """
+    faceKey = faceEntity.entityToken
+    cachedPlacements = _previewCache if faceKey == _previewFaceKey else {}
+
+    placements: list[ProngPlacement] = [cachedPlacements.get((faceKey, pointEntity.entityToken)) for pointEntity in pointEntities]
+    missingIndices = [i for i, placement in enumerate(placements) if placement is None]
+    if missingIndices:
+        missingPlacements = computePlacements(getFaceContext(faceEntity), getWorldPoints([pointEntities[i] for i in missingIndices]))
+        if missingPlacements is None:
             return None
+        for i, placement in zip(missingIndices, missingPlacements):
+            placements[i] = placement
 
-        pointOnFace, lengthDirection, widthDirection, normal = getDataFromPointAndFace(face, point)
-        if pointOnFace is None:
+    prongs = []
+    for placement in placements:
+        prong = createBodyAtPlacement(placement, size, height)
+        if prong is None:
             return None
+        prongs.append(prong)
 
-        placeBody(prong, pointOnFace, lengthDirection, widthDirection, normal)
+    return prongs
 
-        return prong
 
-    except:
-        showMessage(f'CreateBodies: {traceback.format_exc()}\n', True)
-        return None
+def getPointDependencyIds(pointEntities: list[adsk.fusion.SketchPoint]) -> list[tuple[str, adsk.fusion.SketchPoint]]:
+    """Pair the selected points with their dependency ids ('point0', 'point1', ...).
 
-def updateBody(body: adsk.fusion.BRepBody, face: adsk.fusion.BRepFace, point: adsk.core.Point3D, size: float, height: float) -> adsk.fusion.BRepBody | None:
-    """Update an existing prong body with new parameters.
+    Args:
+        pointEntities: The sketch points of the prongs in selection order.
+
+    Returns:
+        A list of (dependency id, sketch point) tuples.
+    """
+    return [(getPointDependencyId(i), pointEntity) for i, pointEntity in enumerate(pointEntities)]
+
+
+def getPointDependencyId(index: int) -> str:
+    """Return the dependency id of a point, reusing the cached id strings.
 
     Args:
-        body: The existing prong body to update.
-        face: The face where the prong is placed.
-        point: The point on the face where the prong should be.
-        size: The new size of the prong.
-        height: The new height of the prong.
+        index: The index of the point in the selection.
 
     Returns:
-        The updated prong body or None if update failed.
+        The dependency id, e.g. 'point3'.
     """
-    try:
-        if face is None or point is None: return None
+    while index >= len(_pointDependencyIds):
+        _pointDependencyIds.append(f'{_POINT_DEPENDENCY_PREFIX}{len(_pointDependencyIds)}')
 
+    return _pointDependencyIds[index]
 
-        tempBody = updateProngAndNormalize(body, size, height)
-        if tempBody is None:
-            return None
 
-        pointOnFace, lengthDirection, widthDirection, normal = getDataFromPointAndFace(face, point)
-        if pointOnFace is None:
-            return None
+def updateDependencies(dependencies: adsk.fusion.CustomFeatureDependencies, faceEntity: adsk.core.Base,
+                       pointEntities: list[adsk.fusion.SketchPoint]):
+    """Bring the dependencies of a prongs feature in line with the current selection.
+
+    Only the differences are applied: surplus points are deleted, new ones are added and
+    dependencies whose entity changed are retargeted. Editing only the size or height
+    leaves the dependencies untouched.
+
+    Args:
+        dependencies: The dependencies of the edited custom feature.
+        faceEntity: The selected face or construction plane.
+        pointEntities: The selected sketch points in selection order.
+    """
+    oldDependencies: dict[str, adsk.fusion.CustomFeatureDependency] = {}
+    for k in range(dependencies.count):
+        dependency = dependencies.item(k)
+        oldDependencies[dependency.id] = dependency
+
+    newEntities: dict[str, adsk.core.Base] = {'face': faceEntity}
+    newEntities.update(getPointDependencyIds(pointEntities))
 
-        placeBody(tempBody, pointOnFace, lengthDirection, widthDirection, normal)
+    for dependencyId, dependency in oldDependencies.items():
+        if dependencyId not in newEntities:
+            dependency.deleteMe()
 
-        return tempBody
+    addDependency = dependencies.add
+    for dependencyId, entity in newEntities.items():
+        dependency = oldDependencies.get(dependencyId)
+        if dependency is None:
+            addDependency(dependencyId, entity)
+            continue
 
-    except:
-        showMessage(f'updateBody: {traceback.format_exc()}\n', True)
+        oldEntity = dependency.entity
+        if oldEntity is None or oldEntity.entityToken != entity.entityToken:
+            dependency.entity = entity
+
+
+def getDependencyEntities(customFeature: adsk.fusion.CustomFeature) -> dict[str, adsk.core.Base]:
+    """Map the dependency ids of a custom feature to their entities in a single enumeration.
+
+    Looking up 'face', 'point0', 'point1', ... with itemById costs a name search per lookup,
+    which makes a per-point walk quadratic in the number of points.
+
+    Args:
+        customFeature: The prongs custom feature.
+
+    Returns:
+        A dictionary from dependency id to entity. Entities are None when the dependency
+        has lost its entity.
+    """
+    dependencies = customFeature.dependencies
+    dependencyEntities: dict[str, adsk.core.Base] = {}
+    for k in range(dependencies.count):
+        dependency = dependencies.item(k)
+        dependencyEntities[dependency.id] = dependency.entity
+
+    return dependencyEntities
+
+
+def getPointDependencies(dependencyEntities: dict[str, adsk.core.Base]) -> list[adsk.fusion.SketchPoint | None]:
+    """Collect the point dependencies of a prongs feature in index order.
+
+    Args:
+        dependencyEntities: The map returned by getDependencyEntities.
+
+    Returns:
+        The sketch points from 'point0' up to the first missing index. Entries are None
+        when the dependency has lost its entity.
+    """
+    points = []
+    while (dependencyId := getPointDependencyId(len(points))) in dependencyEntities:
+        points.append(dependencyEntities[dependencyId])
+
+    return points
+
+
+def quantize(value: float) -> int:
+    """Snap a length in centimeters to a 100 nm integer grid so transform noise does not change hashes."""
+    return int(round(value * _PARAMETERS_HASH_SCALE))
+
+
+def getFaceSignature(face: adsk.fusion.BRepFace | adsk.fusion.ConstructionPlane) -> tuple:
+    """Build a geometric signature of the support face or plane.
+
+    The entity token alone stays the same when an upstream edit reshapes the face,
+    so the signature also includes its geometry.
+
+    Args:
+        face: The face or construction plane the prongs are placed on.
+
+    Returns:
+        A tuple that changes whenever the face identity or geometry changes.
+    """
+    if face.objectType == adsk.fusion.ConstructionPlane.classType():
+        plane = face.geometry
+        geometry = plane.origin.asArray() + plane.normal.asArray()
+    else:
+        boundingBox = face.boundingBox
+        geometry = (face.area,) + boundingBox.minPoint.asArray() + boundingBox.maxPoint.asArray()
+
+    return (face.entityToken,) + tuple(quantize(value) for value in geometry)
+
+
+def getParametersHash(point: adsk.fusion.SketchPoint, worldPoint: adsk.core.Point3D, placement: ProngPlacement,
+                      faceSignature: tuple, size: float, height: float) -> str:
+    """Build the key stored on a prong body to detect unchanged inputs.
+
+    The face signature misses upstream edits that keep the face area and extents, such as
+    a flipped orientation, so the key also holds the origin and normal the prong is built from.
+
+    Args:
+        point: The sketch point the prong is placed at.
+        worldPoint: The world position of the point.
+        placement: The placement of the prong returned by computePlacements.
+        faceSignature: The signature returned by getFaceSignature.
+        size: The size of the prong.
+        height: The height of the prong.
+
+    Returns:
+        The parameters hash as a string. It is stable across sessions, unlike Python's salted hash().
+    """
+    originPoint, _, _, normal = placement
+    frame = originPoint.asArray() + normal.asArray()
+    key = (point.entityToken, quantize(worldPoint.x), quantize(worldPoint.y), quantize(worldPoint.z),
+           quantize(size), quantize(height)) + tuple(quantize(value) for value in frame) + faceSignature
+    return '|'.join(str(value) for value in key)
 
 
 def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
@@ -644,73 +1116,147 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                 baseFeature = feature
         if baseFeature is None: return False
 
-        faceEntity = customFeature.dependencies.itemById('face').entity
+        dependencyEntities = getDependencyEntities(customFeature)
+        faceEntity = dependencyEntities.get('face')
         if faceEntity is None: return False
 
 
         points: list[adsk.fusion.SketchPoint] = []
-        i = 0
-        while True:
-            dependency = customFeature.dependencies.itemById(f'point{i}')
-            if dependency is None: break
-            sketchPoint = dependency.entity
+        for sketchPoint in getPointDependencies(dependencyEntities):
             if sketchPoint is None: break
             points.append(sketchPoint)
-            i += 1
         if len(points) == 0: return False
 
-        size = customFeature.parameters.itemById(sizeInputDef.id).value
-        height = customFeature.parameters.itemById(heightInputDef.id).value
+        parameters = customFeature.parameters
+        size = parameters.itemById(sizeInputDef.id).value
+        height = parameters.itemById(heightInputDef.id).value
 
         if faceEntity.objectType == adsk.fusion.ConstructionPlane.classType():
             component = faceEntity.component
         else:
             component = faceEntity.body.parentComponent
 
-        baseFeature.startEdit()
-
+        faceSignature = getFaceSignature(faceEntity)
+        worldPoints = [point.worldGeometry for point in points]
+        # One batched evaluation gives every prong frame; the frames are part of the hashes and build the changed prongs.
+        placements = computePlacements(getFaceContext(faceEntity), worldPoints)
+        if placements is None: return False
+        parametersHashes = [getParametersHash(point, worldPoint, placement, faceSignature, size, height)
+                            for point, worldPoint, placement in zip(points, worldPoints, placements)]
 
-        for i in range(len(points)):
-            point = points[i]
+        # Spurious recomputes with unchanged inputs skip the base feature edit entirely.
+        computeHash = hashlib.blake2b('\n'.join(parametersHashes).encode(), digest_size=16).hexdigest()
+        computeHashAttribute = customFeature.attributes.itemByName(constants.PREFIX, constants.PRONG_COMPUTE_HASH)
+        if computeHashAttribute is not None and computeHashAttribute.value == computeHash and baseFeature.bodies.count == len(points):
+            return True
 
-            if i < baseFeature.bodies.count:
-                currentBody = baseFeature.bodies.item(i)
-                newBody = updateBody(currentBody, faceEntity, point.worldGeometry, size, height)
-                if newBody is not None:
-                    baseFeature.updateBody(currentBody, newBody)
-                else:
-                    baseFeature.finishEdit()
-                    return False
-            else:
-                prong = createBody(faceEntity, point.worldGeometry, size, height)
-                if prong is None:
-                    baseFeature.finishEdit()
-                    return False
-                body = component.bRepBodies.add(prong, baseFeature)
-                if not _isRolledForEdit:
-                    setProngAttributes(body, size, height)
+        baseFeature.startEdit()
+        try:
+            pendingAttributes = updateProngBodies(baseFeature, component, placements, parametersHashes, size, height)
+        finally:
+            baseFeature.finishEdit()
 
-        while baseFeature.bodies.count > len(points):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        for body, isNewProng, parametersHash in pendingAttributes:
+            if isNewProng:
+                setProngAttributes(body, size, height)
+            body.attributes.add(constants.PREFIX, constants.PRONG_PARAMETERS_HASH, parametersHash)
 
-        baseFeature.finishEdit()
+        customFeature.attributes.add(constants.PREFIX, constants.PRONG_COMPUTE_HASH, computeHash)
 
         return True
 
-    except:
-        baseFeature.finishEdit()
-        showMessage(f'UpdateBody: {traceback.format_exc()}\n', True)
+    except _ProngUpdateError:
         return False
 
+    except Exception as e:
+        postMessage(f'UpdateBody: {formatException(e)}\n', True)
+        return False
 
-def rollBack():
-    """Roll back the timeline to the state before editing."""
-    global _restoreTimelineObject, _isRolledForEdit, _editedCustomFeature
 
-    if _isRolledForEdit:
-        _editedCustomFeature.timelineObject.rollTo(False)
-        updateProngFeature(_editedCustomFeature)
-        _restoreTimelineObject.rollTo(False)
-        _isRolledForEdit = False
+def updateProngBodies(baseFeature: adsk.fusion.BaseFeature, component: adsk.fusion.Component, placements: list[ProngPlacement],
+                      parametersHashes: list[str], size: float, height: float) -> list[tuple[adsk.fusion.BRepBody, bool, str]]:
+    """Update, create and delete prong bodies of a base feature that is being edited.
 
-    _editedCustomFeature = None
\ No newline at end of file
+    Args:
+        baseFeature: The base feature in edit mode.
+        component: The component that owns the prong bodies.
+        placements: The placement of every prong, in point order.
+        parametersHashes: The getParametersHash key of every prong, in point order.
+        size: The size of the prongs.
+        height: The height of the prongs.
+
+    Returns:
+        Tuples of (body, isNewProng, parametersHash) whose attributes must be written after the edit.
+
+    Raises:
+        _ProngUpdateError: If any prong body cannot be created or updated.
+    """
+    bodies = baseFeature.bodies
+    existingBodies = [bodies.item(j) for j in range(bodies.count)]
+    existingCount = len(existingBodies)
+    pointCount = len(placements)
+    bRepBodies = component.bRepBodies
+    pendingAttributes: list[tuple[adsk.fusion.BRepBody, bool, str]] = []
+    newProngs: list[tuple[adsk.fusion.BRepBody, str]] = []
+
+    for i, (parametersHash, placement) in enumerate(zip(parametersHashes, placements)):
+        if i < existingCount:
+            currentBody = existingBodies[i]
+            hashAttribute = currentBody.attributes.itemByName(constants.PREFIX, constants.PRONG_PARAMETERS_HASH)
+            if hashAttribute is not None and hashAttribute.value == parametersHash:
+                continue
+
+            newBody = createBodyAtPlacement(placement, size, height)
+            if newBody is None:
+                raise _ProngUpdateError(f'Failed to update prong {i}')
+
+            baseFeature.updateBody(currentBody, newBody)
+            pendingAttributes.append((currentBody, False, parametersHash))
+        else:
+            prong = createBodyAtPlacement(placement, size, height)
+            if prong is None:
+                raise _ProngUpdateError(f'Failed to create prong {i}')
+
+            newProngs.append((prong, parametersHash))
+
+    # All new prongs are built before the first one is added, so document changes run in one pass.
+    for prong, parametersHash in newProngs:
+        body = bRepBodies.add(prong, baseFeature)
+        pendingAttributes.append((body, not _editState.isRolled, parametersHash))
+
+    # Surplus bodies only exist when the point list shrank, in which case no prongs were added above.
+    for extraBody in reversed(existingBodies[pointCount:]):
+        extraBody.deleteMe()
+
+    return pendingAttributes
+
+
+def rollBack():
+    """Roll back the timeline to the state before editing.
+
+    Safe to call repeatedly: the timeline is only restored while the edit state is rolled.
+    """
+    state = _editState
+
+    if state.isRolled:
+        state.isRolled = False
+        restoreTimelineObject = state.restoreTimelineObject
+        if restoreTimelineObject is not None and not restoreTimelineObject.isValid:
+            restoreTimelineObject = None
+
+        # The prong bodies only exist after the feature, so it is rolled forward to refresh them.
+        # When the marker was right after the feature, that roll already is the final position.
+        featureIndex = None
+        if state.feature is not None and state.feature.isValid:
+            featureTimelineObject = state.feature.timelineObject
+            featureIndex = featureTimelineObject.index
+            featureTimelineObject.rollTo(False)
+            updateProngFeature(state.feature)
+        if restoreTimelineObject is not None and restoreTimelineObject.index != featureIndex:
+            restoreTimelineObject.rollTo(False)
+
+    state.feature = None
+    state.restoreTimelineObject = None
+    state.activatedToken = None
+    clearCommandCache()
+    cancelTrailingPreview()
\ No newline at end of file
@@ -7,7 +7,7 @@ import adsk.fusion
 
 from ... import constants
 
-from ...helpers.Bodies import placeBody
+from ...helpers.Bodies import placeBody, deleteBodiesAfter
 from ...helpers.Gemstones import GemstoneInfo, extractGemstonesInfo, findValidConnections, isGemstone
 from ...helpers.showMessage import showMessage
 
@@ -1179,8 +1179,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
                 newBody = component.bRepBodies.add(newBodySource, baseFeature)
                 handleNewBody(newBody, cutterInfo.name)
 
-        while baseFeature.bodies.count > len(cutters):
-            baseFeature.bodies.item(baseFeature.bodies.count - 1).deleteMe()
+        deleteBodiesAfter(baseFeature, len(cutters))
 
         baseFeature.finishEdit()
 
@@ -1257,7 +1256,7 @@ def tangentForGemstone(info: GemstoneInfo, gemstoneInfos: list[GemstoneInfo], ne
         return tangentBetween(info, neighbors[0], normal)
 
     if len(neighbors) >= 2:
-        neighbors = sorted(neighbors, key=lambda neighbor: info.centroid.distanceTo(neighbor.centroid))
+        neighbors = sorted(neighbors, key=lambda neighbor: math.dist(info.centroidCoordinates, neighbor.centroidCoordinates))
         tangent = vectorBetween(neighbors[0].centroid, neighbors[1].centroid)
         tangent = projectToPlane(tangent, normal)
         tangent = normalized(tangent)
@@ -1280,7 +1279,7 @@ def closestGemstone(info: GemstoneInfo, gemstoneInfos: list[GemstoneInfo]) -> Ge
         if other is info:
             continue
 
-        distance = info.centroid.distanceTo(other.centroid)
+        distance = math.dist(info.centroidCoordinates, other.centroidCoordinates)
         if closest is None or distance < closestDistance:
             closest = other
             closestDistance = distance
@@ -1,9 +1,14 @@
+import hashlib
 import os
+import threading
+import time
+from array import array
+from typing import NamedTuple
 import adsk.core, adsk.fusion, traceback
 
 from ... import constants
 from ...helpers.showMessage import showMessage
-from ...helpers.Surface import unfoldFaceToSketch, unfoldMeshToSketch
+from ...helpers.Surface import UnfoldResult, unfoldFace, unfoldMesh, emitUnfoldToSketch
 from ...helpers.Points import getPointGeometry
 from ...helpers.Meshes import core as meshCore
 from ...helpers.Meshes import isotropic as meshIsotropic
@@ -28,9 +33,25 @@ _editedCustomFeature: adsk.fusion.CustomFeature = None
 _restoreTimelineObject: adsk.fusion.TimelineObject = None
 _isRolledForEdit: bool = False
 
+_sourceType: constants.UnfoldSourceType = constants.UnfoldSourceType.Face
+
 _previewGraphicsGroup: adsk.fusion.CustomGraphicsGroup | None = None
+_previewUnfoldCache = {'key': None, 'result': None}
+# The last unfolded layout of the most recently computed custom features, keyed by feature entity token
+# and stored as (unfoldKey, result). Dict order is the recency order, oldest first.
+_featureUnfoldCache: dict[str, tuple[tuple, UnfoldResult]] = {}
+_featureUnfoldCacheSize = 4
+
+_trailingPreviewEventId = constants.Unfold.createCommandId + 'TrailingPreview'
+_trailingPreviewEvent: adsk.core.CustomEvent = None
+_previewDebounceSeconds = 0.15
+_lastPreviewTime: float = 0.0
+_isValueInputChanging: bool = False
+_previewTimer: threading.Timer = None
+_activeCommand: adsk.core.Command = None
 
 _handlers = []
+_commandHandlers = []
 
 createCommandInputDef = constants.InputDef(constants.Unfold.createCommandId, 'Surface Unfold', 'Unfolds a NURBS surface or mesh to a sketch.')
 editCommandInputDef = constants.InputDef(constants.Unfold.editCommandId, 'Edit Surface Unfold', 'Edits the parameters of the unfold feature.')
@@ -89,6 +110,23 @@ algorithmInputDef = constants.InputDef(
     'Select the unfolding algorithm: NURBS (parametric grid) or Mesh (tessellation).'
     )
 
+_valueInputIds = frozenset((xOffsetInputDef.id, yOffsetInputDef.id, accuracyInputDef.id))
+_meshPreviewInputIds = frozenset((selectSourceInputDef.id, accuracyInputDef.id, algorithmInputDef.id))
+
+_computeHashScale = 1e5
+# Parameter fractions of the face samples in the source signature (a 3 x 3 grid inside the parametric range).
+_signatureSampleFractions = (0.25, 0.5, 0.75)
+
+_meshBodyType = adsk.fusion.MeshBody.classType()
+_baseFeatureType = adsk.fusion.BaseFeature.classType()
+
+_algorithmsByName = {member.name.lower(): member for member in constants.UnfoldAlgorithm}
+_algorithmsByIndex = list(constants.UnfoldAlgorithm)
+
+_sourceSelectionFilters = [adsk.core.SelectionCommandInput.Faces, adsk.core.SelectionCommandInput.MeshBodies]
+_pointSelectionFilters = [adsk.core.SelectionCommandInput.Vertices, adsk.core.SelectionCommandInput.SketchPoints]
+_planeSelectionFilters = [adsk.core.SelectionCommandInput.ConstructionPlanes]
+
 RESOURCES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '')
 
 
@@ -100,6 +138,127 @@ def clearPreviewGraphics() -> None:
     _previewGraphicsGroup = None
 
 
+class UnfoldInputs(NamedTuple):
+    """Snapshot of the command inputs, read once per event."""
+
+    sourceEntity: adsk.fusion.BRepFace | adsk.fusion.MeshBody
+    isMesh: bool
+    component: adsk.fusion.Component
+    originEntity: adsk.core.Base
+    xDirectionEntity: adsk.core.Base
+    yDirectionEntity: adsk.core.Base
+    originPoint: adsk.core.Point3D
+    xDirectionPoint: adsk.core.Point3D
+    yDirectionPoint: adsk.core.Point3D
+    constructionPlane: adsk.fusion.ConstructionPlane
+    xOffset: float
+    yOffset: float
+    accuracy: float | None
+    algorithm: constants.UnfoldAlgorithm | None
+
+
+def getUnfoldInputs() -> UnfoldInputs:
+    """Read the current command inputs into an UnfoldInputs snapshot.
+
+    Accuracy and algorithm are None for a mesh source, which does not use them.
+    """
+    sourceEntity = _sourceSelectionInput.selection(0).entity
+    originEntity = _originVertexSelectionInput.selection(0).entity
+    xDirectionEntity = _xDirectionVertexSelectionInput.selection(0).entity
+    yDirectionEntity = _yDirectionVertexSelectionInput.selection(0).entity
+
+    isMesh = sourceEntity.objectType == _meshBodyType
+    if isMesh:
+        component = sourceEntity.parentComponent
+        accuracy = None
+        algorithm = None
+    else:
+        component = sourceEntity.body.parentComponent
+        accuracy = _accuracyValueInput.value
+        algorithm = getSelectedAlgorithm()
+
+    return UnfoldInputs(
+        sourceEntity,
+        isMesh,
+        component,
+        originEntity,
+        xDirectionEntity,
+        yDirectionEntity,
+        getPointGeometry(originEntity),
+        getPointGeometry(xDirectionEntity),
+        getPointGeometry(yDirectionEntity),
+        _constructionPlaneSelectionInput.selection(0).entity,
+        _xOffsetValueInput.value,
+        _yOffsetValueInput.value,
+        accuracy,
+        algorithm
+    )
+
+
+def getAlgorithmByName(name: str | None) -> constants.UnfoldAlgorithm:
+    """Return the unfold algorithm with the given case-insensitive name, or Mesh if there is none."""
+    if not name:
+        return constants.UnfoldAlgorithm.Mesh
+    return _algorithmsByName.get(name.strip().lower(), constants.UnfoldAlgorithm.Mesh)
+
+
+def getAlgorithmFromParameterValue(value) -> constants.UnfoldAlgorithm:
+    """Return the unfold algorithm stored in the algorithm parameter.
+
+    The parameter holds the dropdown index; older features may hold the algorithm name instead.
+    """
+    try:
+        algorithmIndex = int(value)
+    except (ValueError, TypeError):
+        return getAlgorithmByName(str(value))
+    if 0 <= algorithmIndex < len(_algorithmsByIndex):
+        return _algorithmsByIndex[algorithmIndex]
+    return constants.UnfoldAlgorithm.Mesh
+
+
+def getSelectedAlgorithm() -> constants.UnfoldAlgorithm:
+    """Return the unfold algorithm selected in the algorithm dropdown, or Mesh if there is none."""
+    if _algorithmDropdownInput is None or _algorithmDropdownInput.selectedItem is None:
+        return constants.UnfoldAlgorithm.Mesh
+    return getAlgorithmByName(_algorithmDropdownInput.selectedItem.name)
+
+
+def clearPreviewUnfoldCache() -> None:
+    """Forget the unfolded layout cached by the preview."""
+    _previewUnfoldCache['key'] = None
+    _previewUnfoldCache['result'] = None
+
+
+def getPreviewUnfold(unfoldInputs: 'UnfoldInputs') -> UnfoldResult | None:
+    """Return the unfolded layout for the given inputs, reusing the cached one when the unfold inputs are unchanged.
+
+    The construction plane and the offsets only place the layout in the sketch, so changing
+    them re-emits the cached layout instead of unfolding the source again.
+
+    Args:
+        unfoldInputs: The snapshot of the command inputs.
+
+    Returns:
+        The unfolded layout, or None if the source could not be unfolded.
+    """
+    sourceEntity, isMesh = unfoldInputs.sourceEntity, unfoldInputs.isMesh
+    originPoint, xDirPoint, yDirPoint = unfoldInputs.originPoint, unfoldInputs.xDirectionPoint, unfoldInputs.yDirectionPoint
+    accuracy, algorithm = unfoldInputs.accuracy, unfoldInputs.algorithm
+
+    key = (sourceEntity.entityToken, originPoint.asArray(), xDirPoint.asArray(), yDirPoint.asArray(), accuracy, algorithm)
+    if _previewUnfoldCache['key'] == key:
+        return _previewUnfoldCache['result']
+
+    if isMesh:
+        result = unfoldMesh(sourceEntity.displayMesh, originPoint, xDirPoint, yDirPoint)
+    else:
+        result = unfoldFace(sourceEntity, accuracy, originPoint, xDirPoint, yDirPoint, algorithm)
+
+    _previewUnfoldCache['key'] = key if result is not None else None
+    _previewUnfoldCache['result'] = result
+    return result
+
+
 def buildNurbsGridMeshData(face: adsk.fusion.BRepFace, stepSize: float) -> meshCore.TriangleMeshData | None:
     """Build flat TriangleMeshData from the NURBS parametric grid on the face.
 
@@ -204,7 +363,7 @@ def getMeshDataForPreview() -> meshCore.TriangleMeshData | None:
 
     sourceEntity = _sourceSelectionInput.selection(0).entity
 
-    if sourceEntity.objectType == adsk.fusion.MeshBody.classType():
+    if sourceEntity.objectType == _meshBodyType:
         meshBody = adsk.fusion.MeshBody.cast(sourceEntity)
         displayMesh = meshBody.displayMesh
         if displayMesh is None:
@@ -223,11 +382,7 @@ def getMeshDataForPreview() -> meshCore.TriangleMeshData | None:
     if face is None:
         return None
 
-    algorithmName = _algorithmDropdownInput.selectedItem.name if _algorithmDropdownInput else None
-    try:
-        algorithm = constants.UnfoldAlgorithm[algorithmName]
-    except (KeyError, AttributeError, TypeError):
-        algorithm = constants.UnfoldAlgorithm.Mesh
+    algorithm = getSelectedAlgorithm()
 
     if algorithm == constants.UnfoldAlgorithm.Mesh:
         tessellationResult = meshIsotropic.createIsotropicTessellationResult(
@@ -260,7 +415,7 @@ def updateMeshPreview() -> None:
 def run(panel: adsk.core.ToolbarPanel):
     """Initialize the surface unfold command by setting up command definitions and UI elements."""
     try:
-        global _app, _ui, _customFeatureDefinition
+        global _app, _ui, _customFeatureDefinition, _trailingPreviewEvent
         _app = adsk.core.Application.get()
         _ui  = _app.userInterface
 
@@ -285,13 +440,17 @@ def run(panel: adsk.core.ToolbarPanel):
         editCommandDefinition.commandCreated.add(editCommandCreated)
         _handlers.append(editCommandCreated)
 
-        global _customFeatureDefinition
         _customFeatureDefinition = adsk.fusion.CustomFeatureDefinition.create(constants.Unfold.commandId, constants.Unfold.id, RESOURCES_FOLDER)
         _customFeatureDefinition.editCommandId = constants.Unfold.editCommandId
 
         computeCustomFeature = ComputeCustomFeature()
         _customFeatureDefinition.customFeatureCompute.add(computeCustomFeature)
         _handlers.append(computeCustomFeature)
+
+        _trailingPreviewEvent = _app.registerCustomEvent(_trailingPreviewEventId)
+        trailingPreview = TrailingPreviewHandler()
+        _trailingPreviewEvent.add(trailingPreview)
+        _handlers.append(trailingPreview)
     except:
         showMessage(f'Run failed:\n{traceback.format_exc()}', True)
 
@@ -310,6 +469,12 @@ def stop(panel: adsk.core.ToolbarPanel):
         commandDefinition = _ui.commandDefinitions.itemById(constants.Unfold.editCommandId)
         if commandDefinition:
             commandDefinition.deleteMe()
+
+        cancelTrailingPreview()
+        _featureUnfoldCache.clear()
+        _commandHandlers.clear()
+        _app.unregisterCustomEvent(_trailingPreviewEventId)
+        _handlers.clear()
     except:
         showMessage(f'Stop Failed:\n{traceback.format_exc()}', True)
 
@@ -317,11 +482,14 @@ def stop(panel: adsk.core.ToolbarPanel):
 def updateVisibility(sourceType: constants.UnfoldSourceType) -> None:
     """Update visibility of inputs according to the selected source type.
 
+    The source type is also kept for validation, so it does not have to query the selection.
+
     Args:
         sourceType: The type of source (Face or Mesh).
     """
-    global _accuracyValueInput, _algorithmDropdownInput
+    global _accuracyValueInput, _algorithmDropdownInput, _sourceType
 
+    _sourceType = sourceType
     isMesh = sourceType == constants.UnfoldSourceType.Mesh
     _accuracyValueInput.isVisible = not isMesh
     _algorithmDropdownInput.isVisible = not isMesh
@@ -339,7 +507,7 @@ def getSourceTypeFromSelection() -> constants.UnfoldSourceType:
         return constants.UnfoldSourceType.Face
 
     entity = _sourceSelectionInput.selection(0).entity
-    if entity.objectType == adsk.fusion.MeshBody.classType():
+    if entity.objectType == _meshBodyType:
         return constants.UnfoldSourceType.Mesh
     return constants.UnfoldSourceType.Face
 
@@ -355,12 +523,119 @@ def getSourceTypeFromFeature(customFeature: adsk.fusion.CustomFeature) -> consta
     """
     sourceDep = customFeature.dependencies.itemById(constants.Unfold.sourceDependencyId)
     if sourceDep and sourceDep.entity:
-        if sourceDep.entity.objectType == adsk.fusion.MeshBody.classType():
+        if sourceDep.entity.objectType == _meshBodyType:
             return constants.UnfoldSourceType.Mesh
 
     return constants.UnfoldSourceType.Face
 
 
+def getDependencyEntities(customFeature: adsk.fusion.CustomFeature) -> dict[str, adsk.core.Base]:
+    """Read all dependencies of a custom feature into a dictionary in one pass.
+
+    Args:
+        customFeature: The custom feature to read.
+
+    Returns:
+        A dictionary mapping dependency ids to their entities (None if the entity is lost).
+    """
+    return {dependency.id: dependency.entity for dependency in customFeature.dependencies}
+
+
+def getParameters(customFeature: adsk.fusion.CustomFeature) -> dict[str, adsk.fusion.CustomFeatureParameter]:
+    """Read all parameters of a custom feature into a dictionary in one pass.
+
+    Args:
+        customFeature: The custom feature to read.
+
+    Returns:
+        A dictionary mapping parameter ids to the parameters.
+    """
+    return {parameter.id: parameter for parameter in customFeature.parameters}
+
+
+def getParameterValueInput(parameters: dict[str, adsk.fusion.CustomFeatureParameter], parameterId: str, defaultValue: float) -> adsk.core.ValueInput:
+    """Return a value input for a command dialog from a stored parameter expression.
+
+    Args:
+        parameters: The parameters returned by getParameters.
+        parameterId: The id of the parameter to read.
+        defaultValue: The value in internal units used when the feature has no such parameter.
+
+    Returns:
+        A value input holding the parameter expression, or the default value.
+    """
+    parameter = parameters.get(parameterId)
+    if parameter is None:
+        return adsk.core.ValueInput.createByReal(defaultValue)
+    return adsk.core.ValueInput.createByString(parameter.expression)
+
+
+def initializeCommandInputs(inputs: adsk.core.CommandInputs, defaultLengthUnits: str,
+                            xOffset: adsk.core.ValueInput, yOffset: adsk.core.ValueInput,
+                            accuracy: adsk.core.ValueInput, algorithmIndex: int) -> None:
+    """Create all command inputs shared by the create and edit commands.
+
+    Args:
+        inputs: The command inputs collection to add to.
+        defaultLengthUnits: The length units of the value inputs.
+        xOffset: Initial value of the X offset input.
+        yOffset: Initial value of the Y offset input.
+        accuracy: Initial value of the accuracy input.
+        algorithmIndex: Index of the initially selected algorithm, the first one is used if out of range.
+    """
+    global _sourceSelectionInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput
+    global _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput, _accuracyValueInput, _algorithmDropdownInput, _sourceType
+
+    _sourceType = constants.UnfoldSourceType.Face
+
+    _sourceSelectionInput = inputs.addSelectionInput(selectSourceInputDef.id, selectSourceInputDef.name, selectSourceInputDef.tooltip)
+    _sourceSelectionInput.selectionFilters = _sourceSelectionFilters
+    _sourceSelectionInput.tooltip = selectSourceInputDef.tooltip
+    _sourceSelectionInput.setSelectionLimits(1, 1)
+
+    inputs.addSeparatorCommandInput('separatorAfterSource')
+
+    _originVertexSelectionInput = inputs.addSelectionInput(originVertexInputDef.id, originVertexInputDef.name, originVertexInputDef.tooltip)
+    _originVertexSelectionInput.selectionFilters = _pointSelectionFilters
+    _originVertexSelectionInput.tooltip = originVertexInputDef.tooltip
+    _originVertexSelectionInput.setSelectionLimits(1, 1)
+
+    _xDirectionVertexSelectionInput = inputs.addSelectionInput(xDirectionVertexInputDef.id, xDirectionVertexInputDef.name, xDirectionVertexInputDef.tooltip)
+    _xDirectionVertexSelectionInput.selectionFilters = _pointSelectionFilters
+    _xDirectionVertexSelectionInput.tooltip = xDirectionVertexInputDef.tooltip
+    _xDirectionVertexSelectionInput.setSelectionLimits(1, 1)
+
+    _yDirectionVertexSelectionInput = inputs.addSelectionInput(yDirectionVertexInputDef.id, yDirectionVertexInputDef.name, yDirectionVertexInputDef.tooltip)
+    _yDirectionVertexSelectionInput.selectionFilters = _pointSelectionFilters
+    _yDirectionVertexSelectionInput.tooltip = yDirectionVertexInputDef.tooltip
+    _yDirectionVertexSelectionInput.setSelectionLimits(1, 1)
+
+    inputs.addSeparatorCommandInput('separatorAfterDirectionVertices')
+
+    _constructionPlaneSelectionInput = inputs.addSelectionInput(constructionPlaneInputDef.id, constructionPlaneInputDef.name, constructionPlaneInputDef.tooltip)
+    _constructionPlaneSelectionInput.selectionFilters = _planeSelectionFilters
+    _constructionPlaneSelectionInput.tooltip = constructionPlaneInputDef.tooltip
+    _constructionPlaneSelectionInput.setSelectionLimits(1, 1)
+
+    _xOffsetValueInput = inputs.addValueInput(xOffsetInputDef.id, xOffsetInputDef.name, defaultLengthUnits, xOffset)
+    _xOffsetValueInput.tooltip = xOffsetInputDef.tooltip
+
+    _yOffsetValueInput = inputs.addValueInput(yOffsetInputDef.id, yOffsetInputDef.name, defaultLengthUnits, yOffset)
+    _yOffsetValueInput.tooltip = yOffsetInputDef.tooltip
+
+    inputs.addSeparatorCommandInput('separatorAfterOffsets')
+
+    _accuracyValueInput = inputs.addValueInput(accuracyInputDef.id, accuracyInputDef.name, defaultLengthUnits, accuracy)
+    _accuracyValueInput.tooltip = accuracyInputDef.tooltip
+
+    _algorithmDropdownInput = inputs.addDropDownCommandInput(algorithmInputDef.id, algorithmInputDef.name, adsk.core.DropDownStyles.TextListDropDownStyle)
+    _algorithmDropdownInput.tooltip = algorithmInputDef.tooltip
+    if not 0 <= algorithmIndex < len(constants.Unfold.algorithms):
+        algorithmIndex = 0
+    for i, algoName in enumerate(constants.Unfold.algorithms):
+        _algorithmDropdownInput.listItems.add(algoName, i == algorithmIndex)
+
+
 class CreateCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
     """Event handler for creating the command dialog for new surface unfold.
 
@@ -376,85 +651,36 @@ class CreateCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             inputs = command.commandInputs
             defaultLengthUnits = _app.activeProduct.unitsManager.defaultLengthUnits
 
-            global _sourceSelectionInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput, _accuracyValueInput, _algorithmDropdownInput
+            global _activeCommand
+            _activeCommand = command
 
-            _sourceSelectionInput = inputs.addSelectionInput(selectSourceInputDef.id, selectSourceInputDef.name, selectSourceInputDef.tooltip)
-            _sourceSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Faces)
-            _sourceSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.MeshBodies)
-            _sourceSelectionInput.tooltip = selectSourceInputDef.tooltip
-            _sourceSelectionInput.setSelectionLimits(1, 1)
-
-            inputs.addSeparatorCommandInput('separatorAfterSource')
-
-            _originVertexSelectionInput = inputs.addSelectionInput(originVertexInputDef.id, originVertexInputDef.name, originVertexInputDef.tooltip)
-            _originVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _originVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _originVertexSelectionInput.tooltip = originVertexInputDef.tooltip
-            _originVertexSelectionInput.setSelectionLimits(1, 1)
-
-            _xDirectionVertexSelectionInput = inputs.addSelectionInput(xDirectionVertexInputDef.id, xDirectionVertexInputDef.name, xDirectionVertexInputDef.tooltip)
-            _xDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _xDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _xDirectionVertexSelectionInput.tooltip = xDirectionVertexInputDef.tooltip
-            _xDirectionVertexSelectionInput.setSelectionLimits(1, 1)
-
-            _yDirectionVertexSelectionInput = inputs.addSelectionInput(yDirectionVertexInputDef.id, yDirectionVertexInputDef.name, yDirectionVertexInputDef.tooltip)
-            _yDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _yDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _yDirectionVertexSelectionInput.tooltip = yDirectionVertexInputDef.tooltip
-            _yDirectionVertexSelectionInput.setSelectionLimits(1, 1)
-
-            inputs.addSeparatorCommandInput('separatorAfterDirectionVertices')
-
-            global _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput
-
-            _constructionPlaneSelectionInput = inputs.addSelectionInput(constructionPlaneInputDef.id, constructionPlaneInputDef.name, constructionPlaneInputDef.tooltip)
-            _constructionPlaneSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.ConstructionPlanes)
-            _constructionPlaneSelectionInput.tooltip = constructionPlaneInputDef.tooltip
-            _constructionPlaneSelectionInput.setSelectionLimits(1, 1)
+            # Only one command runs at a time, so the handlers of the previous one can be released.
+            _commandHandlers.clear()
 
             xOffset = adsk.core.ValueInput.createByReal(0.0)
-            _xOffsetValueInput = inputs.addValueInput(xOffsetInputDef.id, xOffsetInputDef.name, defaultLengthUnits, xOffset)
-            _xOffsetValueInput.tooltip = xOffsetInputDef.tooltip
-
             yOffset = adsk.core.ValueInput.createByReal(0.0)
-            _yOffsetValueInput = inputs.addValueInput(yOffsetInputDef.id, yOffsetInputDef.name, defaultLengthUnits, yOffset)
-            _yOffsetValueInput.tooltip = yOffsetInputDef.tooltip
-
-            inputs.addSeparatorCommandInput('separatorAfterOffsets')
-
             accuracy = adsk.core.ValueInput.createByReal(0.5)
-            _accuracyValueInput = inputs.addValueInput(accuracyInputDef.id, accuracyInputDef.name, defaultLengthUnits, accuracy)
-            _accuracyValueInput.tooltip = accuracyInputDef.tooltip
-
-            _algorithmDropdownInput = inputs.addDropDownCommandInput(algorithmInputDef.id, algorithmInputDef.name, adsk.core.DropDownStyles.TextListDropDownStyle)
-            _algorithmDropdownInput.tooltip = algorithmInputDef.tooltip
-            for i, algoName in enumerate(constants.Unfold.algorithms):
-                _algorithmDropdownInput.listItems.add(algoName, i == 0)
-
-            onPreSelect = PreSelectHandler()
-            command.preSelect.add(onPreSelect)
-            _handlers.append(onPreSelect)
+            initializeCommandInputs(inputs, defaultLengthUnits, xOffset, yOffset, accuracy, 0)
 
             onValidate = ValidateInputsHandler()
             command.validateInputs.add(onValidate)
-            _handlers.append(onValidate)
+            _commandHandlers.append(onValidate)
 
             onInputChanged = InputChangedHandler()
             command.inputChanged.add(onInputChanged)
-            _handlers.append(onInputChanged)
+            _commandHandlers.append(onInputChanged)
 
             onExecutePreview = ExecutePreviewHandler()
             command.executePreview.add(onExecutePreview)
-            _handlers.append(onExecutePreview)
+            _commandHandlers.append(onExecutePreview)
 
             onExecute = CreateExecuteHandler()
             command.execute.add(onExecute)
-            _handlers.append(onExecute)
+            _commandHandlers.append(onExecute)
 
             onDestroy = CreateDestroyHandler()
             command.destroy.add(onDestroy)
-            _handlers.append(onDestroy)
+            _commandHandlers.append(onDestroy)
 
         except:
             showMessage(f'CreateCommandCreatedHandler: {traceback.format_exc()}\n', True)
@@ -476,149 +702,59 @@ class EditCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             inputs = command.commandInputs
             defaultLengthUnits = _app.activeProduct.unitsManager.defaultLengthUnits
 
-            global _editedCustomFeature, _sourceSelectionInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput, _accuracyValueInput, _algorithmDropdownInput
+            global _activeCommand
+            _activeCommand = command
+
+            # Only one command runs at a time, so the handlers of the previous one can be released.
+            _commandHandlers.clear()
+
+            global _editedCustomFeature
             _editedCustomFeature = _ui.activeSelections.item(0).entity
             if _editedCustomFeature is None:
                 return
 
-            _sourceSelectionInput = inputs.addSelectionInput(selectSourceInputDef.id, selectSourceInputDef.name, selectSourceInputDef.tooltip)
-            _sourceSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Faces)
-            _sourceSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.MeshBodies)
-            _sourceSelectionInput.tooltip = selectSourceInputDef.tooltip
-            _sourceSelectionInput.setSelectionLimits(1, 1)
-
-            inputs.addSeparatorCommandInput('separatorAfterSource')
-
-            _originVertexSelectionInput = inputs.addSelectionInput(originVertexInputDef.id, originVertexInputDef.name, originVertexInputDef.tooltip)
-            _originVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _originVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _originVertexSelectionInput.tooltip = originVertexInputDef.tooltip
-            _originVertexSelectionInput.setSelectionLimits(1, 1)
+            parameters = getParameters(_editedCustomFeature)
 
-            _xDirectionVertexSelectionInput = inputs.addSelectionInput(xDirectionVertexInputDef.id, xDirectionVertexInputDef.name, xDirectionVertexInputDef.tooltip)
-            _xDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _xDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _xDirectionVertexSelectionInput.tooltip = xDirectionVertexInputDef.tooltip
-            _xDirectionVertexSelectionInput.setSelectionLimits(1, 1)
+            xOffset = getParameterValueInput(parameters, xOffsetInputDef.id, 0.0)
+            yOffset = getParameterValueInput(parameters, yOffsetInputDef.id, 0.0)
+            accuracy = getParameterValueInput(parameters, accuracyInputDef.id, 0.5)
 
-            _yDirectionVertexSelectionInput = inputs.addSelectionInput(yDirectionVertexInputDef.id, yDirectionVertexInputDef.name, yDirectionVertexInputDef.tooltip)
-            _yDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.Vertices)
-            _yDirectionVertexSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.SketchPoints)
-            _yDirectionVertexSelectionInput.tooltip = yDirectionVertexInputDef.tooltip
-            _yDirectionVertexSelectionInput.setSelectionLimits(1, 1)
+            algorithmParameter = parameters.get(algorithmInputDef.id)
+            selectedIndex = getAlgorithmFromParameterValue(algorithmParameter.value).value if algorithmParameter else 0
 
-            inputs.addSeparatorCommandInput('separatorAfterDirectionVertices')
-
-            global _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput
-
-            _constructionPlaneSelectionInput = inputs.addSelectionInput(constructionPlaneInputDef.id, constructionPlaneInputDef.name, constructionPlaneInputDef.tooltip)
-            _constructionPlaneSelectionInput.addSelectionFilter(adsk.core.SelectionCommandInput.ConstructionPlanes)
-            _constructionPlaneSelectionInput.tooltip = constructionPlaneInputDef.tooltip
-            _constructionPlaneSelectionInput.setSelectionLimits(1, 1)
-
-            parameters = _editedCustomFeature.parameters
-
-            xOffset = adsk.core.ValueInput.createByString(parameters.itemById(xOffsetInputDef.id).expression)
-            _xOffsetValueInput = inputs.addValueInput(xOffsetInputDef.id, xOffsetInputDef.name, defaultLengthUnits, xOffset)
-            _xOffsetValueInput.tooltip = xOffsetInputDef.tooltip
-
-            yOffset = adsk.core.ValueInput.createByString(parameters.itemById(yOffsetInputDef.id).expression)
-            _yOffsetValueInput = inputs.addValueInput(yOffsetInputDef.id, yOffsetInputDef.name, defaultLengthUnits, yOffset)
-            _yOffsetValueInput.tooltip = yOffsetInputDef.tooltip
-
-            inputs.addSeparatorCommandInput('separatorAfterOffsets')
-
-            accuracy = adsk.core.ValueInput.createByString(parameters.itemById(accuracyInputDef.id).expression)
-            _accuracyValueInput = inputs.addValueInput(accuracyInputDef.id, accuracyInputDef.name, defaultLengthUnits, accuracy)
-            _accuracyValueInput.tooltip = accuracyInputDef.tooltip
-
-            _algorithmDropdownInput = inputs.addDropDownCommandInput(algorithmInputDef.id, algorithmInputDef.name, adsk.core.DropDownStyles.TextListDropDownStyle)
-            _algorithmDropdownInput.tooltip = algorithmInputDef.tooltip
-            for i, algoName in enumerate(constants.Unfold.algorithms):
-                _algorithmDropdownInput.listItems.add(algoName, False)
-
-            try:
-                algorithmParam = parameters.itemById(algorithmInputDef.id)
-                val = algorithmParam.value
-                try:
-                    selectedIndex = int(val)
-                except:
-                    name = str(val).strip()
-                    matched = None
-                    for member in constants.UnfoldAlgorithm:
-                        if member.name.lower() == name.lower():
-                            matched = member
-                            break
-                    selectedIndex = matched.value if matched is not None else constants.UnfoldAlgorithm.Mesh.value
-
-                if 0 <= selectedIndex < _algorithmDropdownInput.listItems.count:
-                    _algorithmDropdownInput.listItems.item(selectedIndex).isSelected = True
-                else:
-                    _algorithmDropdownInput.listItems.item(0).isSelected = True
-            except:
-                _algorithmDropdownInput.listItems.item(0).isSelected = True
+            initializeCommandInputs(inputs, defaultLengthUnits, xOffset, yOffset, accuracy, selectedIndex)
 
             sourceType = getSourceTypeFromFeature(_editedCustomFeature)
             updateVisibility(sourceType)
 
-            onPreSelect = PreSelectHandler()
-            command.preSelect.add(onPreSelect)
-            _handlers.append(onPreSelect)
-
             onValidate = ValidateInputsHandler()
             command.validateInputs.add(onValidate)
-            _handlers.append(onValidate)
+            _commandHandlers.append(onValidate)
 
             onInputChanged = InputChangedHandler()
             command.inputChanged.add(onInputChanged)
-            _handlers.append(onInputChanged)
+            _commandHandlers.append(onInputChanged)
 
             onExecutePreview = ExecutePreviewHandler()
             command.executePreview.add(onExecutePreview)
-            _handlers.append(onExecutePreview)
+            _commandHandlers.append(onExecutePreview)
 
             onActivate = EditActivateHandler()
             command.activate.add(onActivate)
-            _handlers.append(onActivate)
+            _commandHandlers.append(onActivate)
 
             onDestroy = EditDestroyHandler()
             command.destroy.add(onDestroy)
-            _handlers.append(onDestroy)
+            _commandHandlers.append(onDestroy)
 
             onExecute = EditExecuteHandler()
             command.execute.add(onExecute)
-            _handlers.append(onExecute)
+            _commandHandlers.append(onExecute)
 
         except:
             showMessage(f'EditCommandCreatedHandler: {traceback.format_exc()}\n', True)
 
 
-class PreSelectHandler(adsk.core.SelectionEventHandler):
-    """Event handler for controlling user selection during command execution.
-
-    This handler checks to ensure the selected face or mesh is valid.
-    """
-    def __init__(self):
-        super().__init__()
-    def notify(self, args):
-        try:
-            eventArgs = adsk.core.SelectionEventArgs.cast(args)
-            entity = eventArgs.selection.entity
-            entityType = entity.objectType
-
-            if entityType == adsk.fusion.BRepFace.classType():
-                if entity is None:
-                    eventArgs.isSelectable = False
-                    return
-            elif entityType == adsk.fusion.MeshBody.classType():
-                if entity is None:
-                    eventArgs.isSelectable = False
-                    return
-
-        except:
-            showMessage(f'PreSelectHandler: {traceback.format_exc()}\n', True)
-
-
 class ValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
     """Event handler for the validateInputs event."""
     def __init__(self):
@@ -656,10 +792,7 @@ class ValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
                 eventArgs.areInputsValid = False
                 return
 
-            sourceEntity = _sourceSelectionInput.selection(0).entity
-            isMesh = sourceEntity.objectType == adsk.fusion.MeshBody.classType()
-
-            if not isMesh:
+            if _sourceType != constants.UnfoldSourceType.Mesh:
                 if not _accuracyValueInput.isValidExpression:
                     eventArgs.areInputsValid = False
                     return
@@ -678,15 +811,19 @@ class InputChangedHandler(adsk.core.InputChangedEventHandler):
     def __init__(self):
         super().__init__()
     def notify(self, args):
+        global _isValueInputChanging
         try:
             eventArgs = adsk.core.InputChangedEventArgs.cast(args)
             changedInput = eventArgs.input
 
-            if changedInput.id == selectSourceInputDef.id:
+            changedInputId = changedInput.id
+            _isValueInputChanging = changedInputId in _valueInputIds
+
+            if changedInputId == selectSourceInputDef.id:
                 sourceType = getSourceTypeFromSelection()
                 updateVisibility(sourceType)
 
-            if changedInput.id in (selectSourceInputDef.id, accuracyInputDef.id, algorithmInputDef.id):
+            if changedInputId in _meshPreviewInputIds:
                 updateMeshPreview()
 
         except:
@@ -698,135 +835,146 @@ class ExecutePreviewHandler(adsk.core.CommandEventHandler):
     def __init__(self):
         super().__init__()
     def notify(self, args):
-        global _sourceSelectionInput, _accuracyValueInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput, _algorithmDropdownInput, _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput
+        global _lastPreviewTime
         try:
             eventArgs = adsk.core.CommandEventArgs.cast(args)
 
-            sourceEntity = _sourceSelectionInput.selection(0).entity
-            originPoint = getPointGeometry(_originVertexSelectionInput.selection(0).entity)
-            xDirPoint = getPointGeometry(_xDirectionVertexSelectionInput.selection(0).entity)
-            yDirPoint = getPointGeometry(_yDirectionVertexSelectionInput.selection(0).entity)
-            constructionPlane = _constructionPlaneSelectionInput.selection(0).entity
-            xOffset = _xOffsetValueInput.value
-            yOffset = _yOffsetValueInput.value
+            # Coalesce bursts of value input changes; the trailing preview renders the final value.
+            isDebounced = False
+            if _isValueInputChanging:
+                elapsed = time.monotonic() - _lastPreviewTime
+                if elapsed < _previewDebounceSeconds:
+                    scheduleTrailingPreview(_previewDebounceSeconds - elapsed)
+                    isDebounced = True
 
-            isMesh = sourceEntity.objectType == adsk.fusion.MeshBody.classType()
+            unfoldInputs = getUnfoldInputs()
 
-            if isMesh:
-                meshBody: adsk.fusion.MeshBody = sourceEntity
-                component = meshBody.parentComponent
-            else:
-                face: adsk.fusion.BRepFace = sourceEntity
-                component = face.body.parentComponent
-
-            baseFeature = component.features.baseFeatures.add()
-            baseFeature.startEdit()
+            # Fusion has already rolled back the previous preview sketch, so a skipped event
+            # redraws the last unfolded layout instead of leaving the preview empty.
+            result = _previewUnfoldCache['result'] if isDebounced else getPreviewUnfold(unfoldInputs)
 
-            sketches = component.sketches
-            sketch = sketches.add(component.xYConstructionPlane)
+            # Fusion rolls back everything created by the preview before the next executePreview,
+            # so the preview sketch is added directly instead of inside a throwaway base feature.
+            component = unfoldInputs.component
+            sketch = component.sketches.add(component.xYConstructionPlane)
             sketch.name = "Unfolded Surface"
 
-            if isMesh:
-                unfoldMeshToSketch(meshBody.displayMesh, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
+            emitUnfoldToSketch(result, sketch, unfoldInputs.constructionPlane, unfoldInputs.xOffset, unfoldInputs.yOffset)
 
-            else:
-                accuracy = _accuracyValueInput.value
-                algorithmName = _algorithmDropdownInput.selectedItem.name
-                try:
-                    algorithm = constants.UnfoldAlgorithm[algorithmName]
-                except (KeyError, AttributeError):
-                    algorithm = constants.UnfoldAlgorithm.Mesh
-                unfoldFaceToSketch(face, accuracy, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset, algorithm)
+            if isDebounced:
+                return
 
-            baseFeature.finishEdit()
             updateMeshPreview()
+            _lastPreviewTime = time.monotonic()
 
         except:
-            baseFeature.finishEdit()
             showMessage(f'ExecutePreviewHandler: {traceback.format_exc()}\n', True)
 
 
+class TrailingPreviewHandler(adsk.core.CustomEventHandler):
+    """Re-runs the preview after a burst of skipped executePreview events."""
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            if _activeCommand is not None:
+                _activeCommand.doExecutePreview()
+        except:
+            # The command may have been closed while the timer was pending.
+            pass
+
+
+def scheduleTrailingPreview(delay: float) -> None:
+    """Fire the trailing preview event once the debounce interval has passed.
+
+    Fusion custom events may be fired from a worker thread; the handler itself runs on the main thread.
+
+    Args:
+        delay: Seconds to wait before firing the event.
+    """
+    global _previewTimer
+
+    if _previewTimer is not None:
+        _previewTimer.cancel()
+
+    _previewTimer = threading.Timer(delay, _app.fireCustomEvent, (_trailingPreviewEventId,))
+    _previewTimer.daemon = True
+    _previewTimer.start()
+
+
+def cancelTrailingPreview() -> None:
+    """Cancel a pending trailing preview and forget the active command."""
+    global _previewTimer, _activeCommand, _isValueInputChanging
+
+    if _previewTimer is not None:
+        _previewTimer.cancel()
+        _previewTimer = None
+
+    _activeCommand = None
+    _isValueInputChanging = False
+
+
 class CreateExecuteHandler(adsk.core.CommandEventHandler):
     """Event handler for the execute event of the create command."""
     def __init__(self):
         super().__init__()
     def notify(self, args):
-        global _sourceSelectionInput, _accuracyValueInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput, _algorithmDropdownInput, _customFeatureDefinition, _app, _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput
+        baseFeature = None
+        isEditing = False
         try:
             eventArgs = adsk.core.CommandEventArgs.cast(args)
 
-            sourceEntity = _sourceSelectionInput.selection(0).entity
-            originVertex = _originVertexSelectionInput.selection(0).entity
-            xDirVertex = _xDirectionVertexSelectionInput.selection(0).entity
-            yDirVertex = _yDirectionVertexSelectionInput.selection(0).entity
-            constructionPlane = _constructionPlaneSelectionInput.selection(0).entity
-            xOffset = _xOffsetValueInput.value
-            yOffset = _yOffsetValueInput.value
-
-            originPoint = getPointGeometry(originVertex)
-            xDirPoint = getPointGeometry(xDirVertex)
-            yDirPoint = getPointGeometry(yDirVertex)
+            unfoldInputs = getUnfoldInputs()
+            sourceEntity = unfoldInputs.sourceEntity
+            isMesh = unfoldInputs.isMesh
+            constructionPlane = unfoldInputs.constructionPlane
+            comp = unfoldInputs.component
 
-            isMesh = sourceEntity.objectType == adsk.fusion.MeshBody.classType()
-
-            if isMesh:
-                meshBody: adsk.fusion.MeshBody = sourceEntity
-                comp = meshBody.parentComponent
-            else:
-                face: adsk.fusion.BRepFace = sourceEntity
-                comp = face.body.parentComponent
+            # The last preview usually unfolded the same inputs already.
+            result = getPreviewUnfold(unfoldInputs)
 
             baseFeature = comp.features.baseFeatures.add()
             baseFeature.startEdit()
+            isEditing = True
 
             sketches = comp.sketches
             sketch = sketches.add(comp.xYConstructionPlane)
             sketch.name = "Unfolded Surface"
 
-            if isMesh:
-                unfoldMeshToSketch(meshBody.displayMesh, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
-            else:
-                accuracy = _accuracyValueInput.value
-                algorithmName = _algorithmDropdownInput.selectedItem.name
-                try:
-                    algorithm = constants.UnfoldAlgorithm[algorithmName]
-                except:
-                    algorithm = constants.UnfoldAlgorithm.Mesh
-                unfoldFaceToSketch(face, accuracy, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset, algorithm)
+            emitUnfoldToSketch(result, sketch, constructionPlane, unfoldInputs.xOffset, unfoldInputs.yOffset)
 
             baseFeature.finishEdit()
+            isEditing = False
 
-            design: adsk.fusion.Design = _app.activeProduct
-            defLengthUnits = design.unitsManager.defaultLengthUnits
-            customFeatureInput = comp.features.customFeatures.createInput(_customFeatureDefinition)
+            defLengthUnits = _app.activeProduct.unitsManager.defaultLengthUnits
+            customFeatures = comp.features.customFeatures
+            customFeatureInput = customFeatures.createInput(_customFeatureDefinition)
+            addDependency = customFeatureInput.addDependency
+            addCustomParameter = customFeatureInput.addCustomParameter
+            createByString = adsk.core.ValueInput.createByString
 
-            customFeatureInput.addDependency(constants.Unfold.sourceDependencyId, sourceEntity)
+            addDependency(constants.Unfold.sourceDependencyId, sourceEntity)
+            addDependency(constants.Unfold.constructionPlaneDependencyId, constructionPlane)
+            addDependency(constants.Unfold.originVertexDependencyId, unfoldInputs.originEntity)
+            addDependency(constants.Unfold.xDirectionVertexDependencyId, unfoldInputs.xDirectionEntity)
+            addDependency(constants.Unfold.yDirectionVertexDependencyId, unfoldInputs.yDirectionEntity)
 
             if not isMesh:
-                accuracyInput = adsk.core.ValueInput.createByString(_accuracyValueInput.expression)
-                customFeatureInput.addCustomParameter(accuracyInputDef.id, accuracyInputDef.name, accuracyInput,
-                                                  defLengthUnits, True)
+                addCustomParameter(accuracyInputDef.id, accuracyInputDef.name, createByString(_accuracyValueInput.expression),
+                                   defLengthUnits, True)
 
                 algorithmIndex = adsk.core.ValueInput.createByReal(_algorithmDropdownInput.selectedItem.index)
-                customFeatureInput.addCustomParameter(algorithmInputDef.id, algorithmInputDef.name, algorithmIndex, '', False)
-
-            customFeatureInput.addDependency(constants.Unfold.constructionPlaneDependencyId, constructionPlane)
-
-            xOffsetInput = adsk.core.ValueInput.createByString(_xOffsetValueInput.expression)
-            customFeatureInput.addCustomParameter(xOffsetInputDef.id, xOffsetInputDef.name, xOffsetInput, defLengthUnits, True)
-
-            yOffsetInput = adsk.core.ValueInput.createByString(_yOffsetValueInput.expression)
-            customFeatureInput.addCustomParameter(yOffsetInputDef.id, yOffsetInputDef.name, yOffsetInput, defLengthUnits, True)
+                addCustomParameter(algorithmInputDef.id, algorithmInputDef.name, algorithmIndex, '', False)
 
-            customFeatureInput.addDependency(constants.Unfold.originVertexDependencyId, originVertex)
-            customFeatureInput.addDependency(constants.Unfold.xDirectionVertexDependencyId, xDirVertex)
-            customFeatureInput.addDependency(constants.Unfold.yDirectionVertexDependencyId, yDirVertex)
+            addCustomParameter(xOffsetInputDef.id, xOffsetInputDef.name, createByString(_xOffsetValueInput.expression), defLengthUnits, True)
+            addCustomParameter(yOffsetInputDef.id, yOffsetInputDef.name, createByString(_yOffsetValueInput.expression), defLengthUnits, True)
 
             customFeatureInput.setStartAndEndFeatures(baseFeature, baseFeature)
-            comp.features.customFeatures.add(customFeatureInput)
+            customFeatures.add(customFeatureInput)
 
         except:
-            baseFeature.finishEdit()
+            if isEditing:
+                baseFeature.finishEdit()
             eventArgs.executeFailed = True
             showMessage(f'CreateExecuteHandler: {traceback.format_exc()}\n', True)
 
@@ -840,6 +988,8 @@ class CreateDestroyHandler(adsk.core.CommandEventHandler):
     def notify(self, args: adsk.core.CommandEventArgs) -> None:
         try:
             clearPreviewGraphics()
+            clearPreviewUnfoldCache()
+            cancelTrailingPreview()
         except:
             showMessage(f'CreateDestroyHandler: {traceback.format_exc()}\n', True)
 
@@ -868,27 +1018,23 @@ class EditActivateHandler(adsk.core.CommandEventHandler):
             command = eventArgs.command
             command.beginStep()
 
-            sourceDep = _editedCustomFeature.dependencies.itemById(constants.Unfold.sourceDependencyId)
-            if sourceDep and sourceDep.entity:
-                _sourceSelectionInput.addSelection(sourceDep.entity)
-
-            sourceType = getSourceTypeFromSelection()
-
-            originVertexDep = _editedCustomFeature.dependencies.itemById(constants.Unfold.originVertexDependencyId)
-            if originVertexDep and originVertexDep.entity:
-                _originVertexSelectionInput.addSelection(originVertexDep.entity)
+            dependencies = getDependencyEntities(_editedCustomFeature)
 
-            xDirVertexDep = _editedCustomFeature.dependencies.itemById(constants.Unfold.xDirectionVertexDependencyId)
-            if xDirVertexDep and xDirVertexDep.entity:
-                _xDirectionVertexSelectionInput.addSelection(xDirVertexDep.entity)
+            sourceEntity = dependencies.get(constants.Unfold.sourceDependencyId)
+            if sourceEntity:
+                _sourceSelectionInput.addSelection(sourceEntity)
 
-            yDirVertexDep = _editedCustomFeature.dependencies.itemById(constants.Unfold.yDirectionVertexDependencyId)
-            if yDirVertexDep and yDirVertexDep.entity:
-                _yDirectionVertexSelectionInput.addSelection(yDirVertexDep.entity)
+            sourceType = getSourceTypeFromSelection()
 
-            constructionPlaneDep = _editedCustomFeature.dependencies.itemById(constants.Unfold.constructionPlaneDependencyId)
-            if constructionPlaneDep and constructionPlaneDep.entity:
-                _constructionPlaneSelectionInput.addSelection(constructionPlaneDep.entity)
+            for dependencyId, selectionInput in (
+                (constants.Unfold.originVertexDependencyId, _originVertexSelectionInput),
+                (constants.Unfold.xDirectionVertexDependencyId, _xDirectionVertexSelectionInput),
+                (constants.Unfold.yDirectionVertexDependencyId, _yDirectionVertexSelectionInput),
+                (constants.Unfold.constructionPlaneDependencyId, _constructionPlaneSelectionInput),
+            ):
+                entity = dependencies.get(dependencyId)
+                if entity:
+                    selectionInput.addSelection(entity)
 
             updateVisibility(sourceType)
             updateMeshPreview()
@@ -904,6 +1050,8 @@ class EditDestroyHandler(adsk.core.CommandEventHandler):
     def notify(self, args):
         try:
             clearPreviewGraphics()
+            clearPreviewUnfoldCache()
+            cancelTrailingPreview()
             eventArgs = adsk.core.CommandEventArgs.cast(args)
             if eventArgs.terminationReason != adsk.core.CommandTerminationReason.CompletedTerminationReason:
                 rollBack()
@@ -917,7 +1065,6 @@ class EditExecuteHandler(adsk.core.CommandEventHandler):
         super().__init__()
     def notify(self, args):
         global _editedCustomFeature, _isRolledForEdit
-        global _sourceSelectionInput, _originVertexSelectionInput, _xDirectionVertexSelectionInput, _yDirectionVertexSelectionInput, _accuracyValueInput, _algorithmDropdownInput, _constructionPlaneSelectionInput, _xOffsetValueInput, _yOffsetValueInput
 
         try:
             eventArgs = adsk.core.CommandEventArgs.cast(args)
@@ -928,30 +1075,35 @@ class EditExecuteHandler(adsk.core.CommandEventHandler):
             yDirVertex = _yDirectionVertexSelectionInput.selection(0).entity
             constructionPlane = _constructionPlaneSelectionInput.selection(0).entity
 
-            isMesh = sourceEntity.objectType == adsk.fusion.MeshBody.classType()
+            isMesh = _sourceType == constants.UnfoldSourceType.Mesh
+
+            dependencies = _editedCustomFeature.dependencies
+            parameters = getParameters(_editedCustomFeature)
 
-            _editedCustomFeature.dependencies.deleteAll()
+            dependencies.deleteAll()
 
-            _editedCustomFeature.dependencies.add(constants.Unfold.sourceDependencyId, sourceEntity)
+            dependencies.add(constants.Unfold.sourceDependencyId, sourceEntity)
 
+            # Features created from a mesh have no accuracy or algorithm parameters.
             if not isMesh:
-                try:
-                    _editedCustomFeature.parameters.itemById(accuracyInputDef.id).expression = _accuracyValueInput.expression
-                    _editedCustomFeature.parameters.itemById(algorithmInputDef.id).value = _algorithmDropdownInput.selectedItem.index
-                except:
-                    pass
+                accuracyParameter = parameters.get(accuracyInputDef.id)
+                if accuracyParameter is not None:
+                    accuracyParameter.expression = _accuracyValueInput.expression
 
-            _editedCustomFeature.dependencies.add(constants.Unfold.constructionPlaneDependencyId, constructionPlane)
+                algorithmParameter = parameters.get(algorithmInputDef.id)
+                if algorithmParameter is not None:
+                    algorithmParameter.value = _algorithmDropdownInput.selectedItem.index
 
-            try:
-                _editedCustomFeature.parameters.itemById(xOffsetInputDef.id).expression = _xOffsetValueInput.expression
-                _editedCustomFeature.parameters.itemById(yOffsetInputDef.id).expression = _yOffsetValueInput.expression
-            except:
-                pass
+            dependencies.add(constants.Unfold.constructionPlaneDependencyId, constructionPlane)
 
-            _editedCustomFeature.dependencies.add(constants.Unfold.originVertexDependencyId, originVertex)
-            _editedCustomFeature.dependencies.add(constants.Unfold.xDirectionVertexDependencyId, xDirVertex)
-            _editedCustomFeature.dependencies.add(constants.Unfold.yDirectionVertexDependencyId, yDirVertex)
+            for parameterId, valueInput in ((xOffsetInputDef.id, _xOffsetValueInput), (yOffsetInputDef.id, _yOffsetValueInput)):
+                parameter = parameters.get(parameterId)
+                if parameter is not None:
+                    parameter.expression = valueInput.expression
+
+            dependencies.add(constants.Unfold.originVertexDependencyId, originVertex)
+            dependencies.add(constants.Unfold.xDirectionVertexDependencyId, xDirVertex)
+            dependencies.add(constants.Unfold.yDirectionVertexDependencyId, yDirVertex)
 
         except:
             showMessage(f'EditExecuteHandler: {traceback.format_exc()}\n', True)
@@ -973,6 +1125,147 @@ class ComputeCustomFeature(adsk.fusion.CustomFeatureEventHandler):
             showMessage(f'ComputeCustomFeature: {traceback.format_exc()}\n', True)
 
 
+def quantize(value: float) -> int:
+    """Snap a length in centimeters to a 100 nm integer grid so transform noise does not change hashes."""
+    return int(round(value * _computeHashScale))
+
+
+def getSourceSignature(source: adsk.fusion.BRepFace | adsk.fusion.MeshBody, isMesh: bool) -> tuple:
+    """Build a geometric signature of the unfold source.
+
+    The entity token stays the same when an upstream edit reshapes the source, and edits
+    such as smoothing or a flipped face keep the size and bounding box. A mesh is therefore
+    signed by a digest of its packed vertices and triangles, and a face by its area,
+    bounding box and a grid of evaluated points and normals.
+
+    Args:
+        source: The face or mesh body being unfolded.
+        isMesh: True if the source is a mesh body.
+
+    Returns:
+        A tuple that changes whenever the source identity or geometry changes.
+    """
+    if isMesh:
+        displayMesh = source.displayMesh
+        digest = hashlib.blake2b(array('d', displayMesh.nodeCoordinatesAsDouble).tobytes(), digest_size=16)
+        digest.update(array('q', displayMesh.nodeIndices).tobytes())
+        return (source.entityToken, digest.hexdigest())
+
+    boundingBox = source.boundingBox
+    geometry = [*boundingBox.minPoint.asArray(), *boundingBox.maxPoint.asArray()]
+
+    evaluator = source.evaluator
+    rangeBox = evaluator.parametricRange()
+    uMin, vMin = rangeBox.minPoint.x, rangeBox.minPoint.y
+    uSpan, vSpan = rangeBox.maxPoint.x - uMin, rangeBox.maxPoint.y - vMin
+    parameters = [adsk.core.Point2D.create(uMin + u * uSpan, vMin + v * vSpan)
+                  for v in _signatureSampleFractions for u in _signatureSampleFractions]
+    _, points = evaluator.getPointsAtParameters(parameters)
+    _, normals = evaluator.getNormalsAtParameters(parameters)
+    geometry += [value for point in points for value in point.asArray()]
+    geometry += [value for normal in normals for value in normal.asArray()]
+
+    return (source.entityToken, quantize(source.area)) + tuple(quantize(value) for value in geometry)
+
+
+def getUnfoldKey(sourceSignature: tuple, points: list[adsk.core.Point3D],
+                 accuracy: float | None, algorithm: constants.UnfoldAlgorithm | None) -> tuple:
+    """Build the key of the inputs that shape the unfolded layout.
+
+    The construction plane and offsets only place the layout, so they are not part of it.
+
+    Args:
+        sourceSignature: The signature returned by getSourceSignature.
+        points: The origin, X direction and Y direction points.
+        accuracy: The face accuracy, or None for mesh sources.
+        algorithm: The face algorithm, or None for mesh sources.
+
+    Returns:
+        A tuple that changes whenever the unfolded layout would change.
+    """
+    pointGeometry = tuple(quantize(value) for point in points for value in point.asArray())
+    return sourceSignature + pointGeometry + (None if accuracy is None else quantize(accuracy), None if algorithm is None else algorithm.value)
+
+
+def getComputeHash(unfoldKey: tuple, constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float) -> str:
+    """Build the key stored on the feature to detect recomputes with unchanged inputs.
+
+    Args:
+        unfoldKey: The key returned by getUnfoldKey.
+        constructionPlane: The plane the unfold is placed on.
+        xOffset: The X offset of the unfold.
+        yOffset: The Y offset of the unfold.
+
+    Returns:
+        The compute hash as a hex string. It is stable across sessions, unlike Python's salted hash().
+    """
+    plane = constructionPlane.geometry
+    planeGeometry = plane.origin.asArray() + plane.normal.asArray() + plane.uDirection.asArray()
+
+    key = unfoldKey + (constructionPlane.entityToken,) + tuple(quantize(value) for value in planeGeometry)
+    key += (quantize(xOffset), quantize(yOffset))
+    return hashlib.blake2b('|'.join(str(value) for value in key).encode(), digest_size=16).hexdigest()
+
+
+def cacheFeatureUnfold(featureToken: str, unfoldKey: tuple, result: UnfoldResult) -> None:
+    """Remember the unfold of a feature as the most recent one and evict the oldest beyond _featureUnfoldCacheSize.
+
+    Unfold results hold full point and vector lists, so only the last few computed features
+    are kept. Entries of deleted features or closed documents fall out the same way.
+
+    Args:
+        featureToken: The entity token of the custom feature.
+        unfoldKey: The key returned by getUnfoldKey.
+        result: The unfolded layout.
+    """
+    _featureUnfoldCache.pop(featureToken, None)
+    _featureUnfoldCache[featureToken] = (unfoldKey, result)
+    while len(_featureUnfoldCache) > _featureUnfoldCacheSize:
+        del _featureUnfoldCache[next(iter(_featureUnfoldCache))]
+
+
+def clearSketch(sketch: adsk.fusion.Sketch, design: adsk.fusion.Design) -> None:
+    """Delete all curves and points of the unfold sketch in one call.
+
+    The sketch origin point cannot be deleted and is left out. If the bulk delete is
+    rejected, the entities are deleted one by one instead. Sketch compute is deferred
+    until the sketch is empty.
+
+    Args:
+        sketch: The sketch to clear.
+        design: The design that owns the sketch.
+    """
+    originPoint = sketch.originPoint
+    entities = adsk.core.ObjectCollection.create()
+    for curve in sketch.sketchCurves:
+        entities.add(curve)
+    for point in sketch.sketchPoints:
+        if point != originPoint:
+            entities.add(point)
+
+    if entities.count == 0:
+        return
+
+    sketch.isComputeDeferred = True
+    try:
+        try:
+            if design.deleteEntities(entities):
+                return
+        except RuntimeError:
+            pass
+
+        for curve in [curve for curve in sketch.sketchCurves]:
+            curve.deleteMe()
+
+        for point in [point for point in sketch.sketchPoints]:
+            try:
+                point.deleteMe()
+            except RuntimeError:
+                pass
+    finally:
+        sketch.isComputeDeferred = False
+
+
 def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
     """Update the sketch of an existing custom surface unfold feature.
 
@@ -988,7 +1281,7 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
         sketch: adsk.fusion.Sketch = None
 
         for feature in customFeature.features:
-            if feature.objectType == adsk.fusion.BaseFeature.classType():
+            if feature.objectType == _baseFeatureType:
                 baseFeature = feature
                 break
         if baseFeature is None: return False
@@ -998,92 +1291,79 @@ def updateFeature(customFeature: adsk.fusion.CustomFeature) -> bool:
             break
         if sketch is None: return False
 
-        sourceType = getSourceTypeFromFeature(customFeature)
-        isMesh = sourceType == constants.UnfoldSourceType.Mesh
+        dependencies = getDependencyEntities(customFeature)
+        parameters = getParameters(customFeature)
 
-        source = customFeature.dependencies.itemById(constants.Unfold.sourceDependencyId).entity
+        source = dependencies.get(constants.Unfold.sourceDependencyId)
 
         if source is None:
-            baseFeature.finishEdit()
             return False
 
-        originVertex = customFeature.dependencies.itemById(constants.Unfold.originVertexDependencyId).entity
-        xDirVertex = customFeature.dependencies.itemById(constants.Unfold.xDirectionVertexDependencyId).entity
-        yDirVertex = customFeature.dependencies.itemById(constants.Unfold.yDirectionVertexDependencyId).entity
+        isMesh = source.objectType == _meshBodyType
+
+        originVertex = dependencies.get(constants.Unfold.originVertexDependencyId)
+        xDirVertex = dependencies.get(constants.Unfold.xDirectionVertexDependencyId)
+        yDirVertex = dependencies.get(constants.Unfold.yDirectionVertexDependencyId)
 
         originPoint = getPointGeometry(originVertex)
         xDirPoint = getPointGeometry(xDirVertex)
         yDirPoint = getPointGeometry(yDirVertex)
 
-        constructionPlaneDep = customFeature.dependencies.itemById(constants.Unfold.constructionPlaneDependencyId)
-        if constructionPlaneDep and constructionPlaneDep.entity:
-            constructionPlane = constructionPlaneDep.entity
-        else:
+        constructionPlane = dependencies.get(constants.Unfold.constructionPlaneDependencyId)
+        if constructionPlane is None:
             constructionPlane = component.xYConstructionPlane
 
-        try:
-            xOffset = customFeature.parameters.itemById(xOffsetInputDef.id).value
-        except:
-            xOffset = 0.0
-
-        try:
-            yOffset = customFeature.parameters.itemById(yOffsetInputDef.id).value
-        except:
-            yOffset = 0.0
+        xOffsetParameter = parameters.get(xOffsetInputDef.id)
+        xOffset = xOffsetParameter.value if xOffsetParameter else 0.0
 
-
-        baseFeature.startEdit()
-
-        curvesToDelete = [curve for curve in sketch.sketchCurves]
-        for curve in curvesToDelete:
-            curve.deleteMe()
-
-        pointsToDelete = [p for p in sketch.sketchPoints]
-        for p in pointsToDelete:
-            try:
-                p.deleteMe()
-            except:
-                pass
+        yOffsetParameter = parameters.get(yOffsetInputDef.id)
+        yOffset = yOffsetParameter.value if yOffsetParameter else 0.0
 
         if isMesh:
-            meshBody: adsk.fusion.MeshBody = source
-            unfoldMeshToSketch(meshBody.displayMesh, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
+            accuracy = None
+            algorithm = None
         else:
-            faceEntity: adsk.fusion.BRepFace = source
+            accuracyParameter = parameters.get(accuracyInputDef.id)
+            accuracy = accuracyParameter.value if accuracyParameter else 0.5
+
+            algorithmParameter = parameters.get(algorithmInputDef.id)
+            algorithm = getAlgorithmFromParameterValue(algorithmParameter.value) if algorithmParameter else constants.UnfoldAlgorithm.Mesh
+
+        # Spurious recomputes with unchanged inputs skip the base feature edit entirely.
+        unfoldKey = getUnfoldKey(getSourceSignature(source, isMesh), [originPoint, xDirPoint, yDirPoint], accuracy, algorithm)
+        computeHash = getComputeHash(unfoldKey, constructionPlane, xOffset, yOffset)
+        computeHashAttribute = customFeature.attributes.itemByName(constants.PREFIX, constants.UNFOLD_COMPUTE_HASH)
+        if computeHashAttribute is not None and computeHashAttribute.value == computeHash and sketch.sketchCurves.count > 0:
+            return True
+
+        # Edits that only move the layout (plane or offsets) reuse the last unfold of this feature.
+        featureToken = customFeature.entityToken
+        cachedUnfold = _featureUnfoldCache.get(featureToken)
+        if cachedUnfold is not None and cachedUnfold[0] == unfoldKey:
+            result = cachedUnfold[1]
+        else:
+            if isMesh:
+                meshBody: adsk.fusion.MeshBody = source
+                result = unfoldMesh(meshBody.displayMesh, originPoint, xDirPoint, yDirPoint)
+            else:
+                faceEntity: adsk.fusion.BRepFace = source
+                result = unfoldFace(faceEntity, accuracy, originPoint, xDirPoint, yDirPoint, algorithm)
 
-            try:
-                accuracy = customFeature.parameters.itemById(accuracyInputDef.id).value
-            except:
-                accuracy = 0.5
+        if result is not None:
+            cacheFeatureUnfold(featureToken, unfoldKey, result)
 
-            try:
-                algorithmVal = customFeature.parameters.itemById(algorithmInputDef.id).value
-                try:
-                    algorithmIndex = int(algorithmVal)
-                    algorithmEnumList = list(constants.UnfoldAlgorithm)
-                    if 0 <= algorithmIndex < len(algorithmEnumList):
-                        algorithm = algorithmEnumList[algorithmIndex]
-                    else:
-                        algorithm = constants.UnfoldAlgorithm.Mesh
-                except (ValueError, TypeError):
-                    algorithmName = str(algorithmVal).strip()
-                    match = None
-                    for member in constants.UnfoldAlgorithm:
-                        if member.name.lower() == algorithmName.lower():
-                            match = member
-                            break
-                    algorithm = match if match is not None else constants.UnfoldAlgorithm.Mesh
-            except:
-                algorithm = constants.UnfoldAlgorithm.Mesh
-
-            unfoldFaceToSketch(faceEntity, accuracy, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset, algorithm)
-
-        baseFeature.finishEdit()
+        baseFeature.startEdit()
+        try:
+            clearSketch(sketch, component.parentDesign)
+            emitUnfoldToSketch(result, sketch, constructionPlane, xOffset, yOffset)
+        finally:
+            baseFeature.finishEdit()
+
+        customFeature.attributes.add(constants.PREFIX, constants.UNFOLD_COMPUTE_HASH, computeHash)
 
         return True
 
     except:
-        baseFeature.finishEdit()
         showMessage(f'updateFeature: {traceback.format_exc()}\n', True)
         return False
 
@@ -32,6 +32,10 @@ GEMSTONE_ROUND_CUT = 'round'
 
 PRONG_SIZE = 'prongSize'
 PRONG_HEIGHT = 'prongHeight'
+PRONG_PARAMETERS_HASH = 'prongParametersHash'
+PRONG_COMPUTE_HASH = 'prongComputeHash'
+
+UNFOLD_COMPUTE_HASH = 'unfoldComputeHash'
 
 zeroPoint = adsk.core.Point3D.create(0, 0, 0)
 xVector = adsk.core.Vector3D.create(1, 0, 0)
@@ -72,6 +76,8 @@ class CommandStrings:
 class InputDef:
     """Describe a command input shown in the Fusion UI."""
 
+    __slots__ = ('id', 'name', 'tooltip')
+
     def __init__(self, id: str, name: str, tooltip: str):
         self.id = id
         self.name = name
@@ -3,6 +3,11 @@ import adsk.core, adsk.fusion, traceback
 from .. import constants
 from .showMessage import showMessage
 
+_temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
+
+# Reused by placeBody; transform() reads the matrix values and does not keep a reference.
+_placementMatrix: adsk.core.Matrix3D = adsk.core.Matrix3D.create()
+
 
 def convertBodyToNurbs(body: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody | None:
     """Convert a body to an all-NURBS temporary body."""
@@ -30,16 +35,29 @@ def placeBody(body: adsk.fusion.BRepBody, newOriginPoint: adsk.core.Point3D,
         if body is None:
             return
 
-        temporaryBRep = adsk.fusion.TemporaryBRepManager.get()
-
-        transformation = adsk.core.Matrix3D.create()
-        transformation.setWithCoordinateSystem(newOriginPoint, newLengthDirection, newWidthDirection, newNormal)
-        temporaryBRep.transform(body, transformation)
+        _placementMatrix.setWithCoordinateSystem(newOriginPoint, newLengthDirection, newWidthDirection, newNormal)
+        _temporaryBRep.transform(body, _placementMatrix)
 
     except:
         showMessage(f'placeBody: {traceback.format_exc()}\n', True)
 
 
+def deleteBodiesAfter(baseFeature: adsk.fusion.BaseFeature, keepCount: int) -> None:
+    """Delete the bodies of a base feature that is being edited, keeping the first keepCount.
+
+    The surplus bodies are collected first and then deleted, so the body collection is
+    not queried again after every deletion.
+
+    Args:
+        baseFeature: The base feature in edit mode
+        keepCount: The number of leading bodies to keep
+    """
+    bodies = baseFeature.bodies
+    extraBodies = [bodies.item(i) for i in range(bodies.count - 1, keepCount - 1, -1)]
+    for extraBody in extraBodies:
+        extraBody.deleteMe()
+
+
 def copyAttributes(sourceBody: adsk.fusion.BRepBody, targetBody: adsk.fusion.BRepBody) -> None:
     """Copy attributes, appearance, material, and name from sourceBody to targetBody.
 
@@ -56,8 +74,13 @@ def copyAttributes(sourceBody: adsk.fusion.BRepBody, targetBody: adsk.fusion.BRe
 
         targetBody.name = sourceBody.name
 
-        for attr in sourceBody.attributes:
-            targetBody.attributes.add(attr.groupName, attr.name, attr.value)
+        sourceAttributes = sourceBody.attributes
+        if sourceAttributes.count == 0:
+            return
+
+        addAttribute = targetBody.attributes.add
+        for attr in sourceAttributes:
+            addAttribute(attr.groupName, attr.name, attr.value)
 
     except:
         showMessage(f'copyAttributes: {traceback.format_exc()}\n', True)
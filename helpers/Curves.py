@@ -1,9 +1,12 @@
 import math
+from bisect import bisect_right
+from itertools import accumulate
 import adsk.core, adsk.fusion, traceback
 
 from .showMessage import showMessage
 from ..constants import measureManager, minimumGemstoneSize, gemstoneOverlapMergeThreshold, cornerAngleThresholdRadians, chainConnectionTolerance
-from .Points import averagePosition
+
+_temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
 
 
 def getCurve3D(entity: adsk.core.Base) -> adsk.core.Curve3D | None:
@@ -240,6 +243,12 @@ class CurveChainEvaluator:
         if self.chainEndTangent:
             self.chainEndTangent.normalize()
 
+        # Extrapolation beyond the chain ends works on plain floats.
+        self._chainStartCoordinates = self.chainStartPoint.asArray()
+        self._chainEndCoordinates = self.chainEndPoint.asArray()
+        self._chainStartTangentCoordinates = self.chainStartTangent.asArray() if self.chainStartTangent else None
+        self._chainEndTangentCoordinates = self.chainEndTangent.asArray() if self.chainEndTangent else None
+
         self._detectCorners()
 
     def _getSegmentPoint(self, segIndex: int, localLength: float) -> adsk.core.Point3D:
@@ -281,28 +290,28 @@ class CurveChainEvaluator:
             if angle > cornerAngleThresholdRadians:
                 self.cornerPositions.append(self.cumulativeLengths[i] + self.segmentLengths[i])
 
-    def getPointAtLength(self, length: float) -> adsk.core.Point3D:
-        """Get point at a given length along the chain, with extrapolation beyond bounds."""
+    def _getExtrapolatedCoordinates(self, length: float) -> tuple[float, float, float] | None:
+        """Get coordinates beyond the chain ends along the end tangents, or None inside the chain."""
         if length < 0:
+            if self.chainStartTangent is None:
+                return self._chainStartCoordinates
             overshoot = -length
-            if self.chainStartPoint and self.chainStartTangent:
-                return adsk.core.Point3D.create(
-                    self.chainStartPoint.x - self.chainStartTangent.x * overshoot,
-                    self.chainStartPoint.y - self.chainStartTangent.y * overshoot,
-                    self.chainStartPoint.z - self.chainStartTangent.z * overshoot
-                )
-            return self.chainStartPoint
+            startX, startY, startZ = self._chainStartCoordinates
+            tangentX, tangentY, tangentZ = self._chainStartTangentCoordinates
+            return startX - tangentX * overshoot, startY - tangentY * overshoot, startZ - tangentZ * overshoot
 
         if length > self.totalLength:
+            if self.chainEndTangent is None:
+                return self._chainEndCoordinates
             overshoot = length - self.totalLength
-            if self.chainEndPoint and self.chainEndTangent:
-                return adsk.core.Point3D.create(
-                    self.chainEndPoint.x + self.chainEndTangent.x * overshoot,
-                    self.chainEndPoint.y + self.chainEndTangent.y * overshoot,
-                    self.chainEndPoint.z + self.chainEndTangent.z * overshoot
-                )
-            return self.chainEndPoint
+            endX, endY, endZ = self._chainEndCoordinates
+            tangentX, tangentY, tangentZ = self._chainEndTangentCoordinates
+            return endX + tangentX * overshoot, endY + tangentY * overshoot, endZ + tangentZ * overshoot
 
+        return None
+
+    def _getChainPoint(self, length: float) -> adsk.core.Point3D:
+        """Get the curve point at a length inside the chain."""
         for i in range(len(self.segmentLengths)):
             segStart = self.cumulativeLengths[i]
             segEnd = segStart + self.segmentLengths[i]
@@ -313,6 +322,23 @@ class CurveChainEvaluator:
 
         return None
 
+    def getPointAtLength(self, length: float) -> adsk.core.Point3D:
+        """Get point at a given length along the chain, with extrapolation beyond bounds."""
+        extrapolatedCoordinates = self._getExtrapolatedCoordinates(length)
+        if extrapolatedCoordinates is not None:
+            return adsk.core.Point3D.create(*extrapolatedCoordinates)
+
+        return self._getChainPoint(length)
+
+    def getCoordinatesAtLength(self, length: float) -> tuple[float, float, float] | None:
+        """Get (x, y, z) at a given length along the chain, with extrapolation beyond bounds."""
+        extrapolatedCoordinates = self._getExtrapolatedCoordinates(length)
+        if extrapolatedCoordinates is not None:
+            return extrapolatedCoordinates
+
+        point = self._getChainPoint(length)
+        return point.asArray() if point else None
+
 
 def _mergeOverlappingGemstones(gemstones: list[tuple[adsk.core.Point3D, float]]) -> list[tuple[adsk.core.Point3D, float]]:
     """Merge consecutive gemstones whose centers are closer than the sum of their radii.
@@ -330,27 +356,129 @@ def _mergeOverlappingGemstones(gemstones: list[tuple[adsk.core.Point3D, float]])
     if len(gemstones) < 2:
         return gemstones
 
-    merged = [gemstones[0]]
-    for i in range(1, len(gemstones)):
-        prevPoint, prevSize = merged[-1]
-        currPoint, currSize = gemstones[i]
-        if prevPoint.distanceTo(currPoint) < (prevSize + currSize) / 3:
-            mergedPoint = adsk.core.Point3D.create(
-                (prevPoint.x + currPoint.x) / 2.0,
-                (prevPoint.y + currPoint.y) / 2.0,
-                (prevPoint.z + currPoint.z) / 2.0
+    def getSquaredDistance(firstCoordinates: tuple, secondCoordinates: tuple) -> float:
+        """Get the squared distance between two coordinate triples."""
+        dx = firstCoordinates[0] - secondCoordinates[0]
+        dy = firstCoordinates[1] - secondCoordinates[1]
+        dz = firstCoordinates[2] - secondCoordinates[2]
+        return dx * dx + dy * dy + dz * dz
+
+    # Points are read once as coordinate triples and compared by squared distance,
+    # so the overlap checks need neither API calls nor square roots.
+    merged = [(gemstones[0][0], gemstones[0][0].asArray(), gemstones[0][1])]
+    for point, size in gemstones[1:]:
+        _, prevCoordinates, prevSize = merged[-1]
+        coordinates = point.asArray()
+        mergeDistance = (prevSize + size) / 3
+        if getSquaredDistance(prevCoordinates, coordinates) < mergeDistance * mergeDistance:
+            mergedCoordinates = (
+                (prevCoordinates[0] + coordinates[0]) / 2.0,
+                (prevCoordinates[1] + coordinates[1]) / 2.0,
+                (prevCoordinates[2] + coordinates[2]) / 2.0
             )
-            merged[-1] = (mergedPoint, (prevSize + currSize) / 2.0)
+            merged[-1] = (adsk.core.Point3D.create(*mergedCoordinates), mergedCoordinates, (prevSize + size) / 2.0)
         else:
-            merged.append(gemstones[i])
+            merged.append((point, coordinates, size))
 
     if len(merged) > 1:
-        firstPoint, firstSize = merged[0]
-        lastPoint, lastSize = merged[-1]
-        if firstPoint.distanceTo(lastPoint) < (firstSize + lastSize) / 2.0:
+        _, firstCoordinates, firstSize = merged[0]
+        _, lastCoordinates, lastSize = merged[-1]
+        wrapDistance = (firstSize + lastSize) / 2.0
+        if getSquaredDistance(firstCoordinates, lastCoordinates) < wrapDistance * wrapDistance:
             merged.pop()
 
-    return merged
+    return [(point, size) for point, _, size in merged]
+
+
+def _placeGemstonesAlongLength(startPosition: float, endPosition: float, targetGap: float,
+                               getSizeAtLength, getCoordinatesAtLength,
+                               getSizeSlopeAtLength=None) -> tuple[list[float], list[float], list[tuple[float, float, float] | None]]:
+    """Place gemstone centers along a length so that neighbours keep the target gap between them.
+
+    Each next center is first estimated along the length and then refined a few times so the
+    straight distance between neighbouring centers matches the sum of their radii plus the gap.
+    The refinement is a Newton step on that mismatch; without a size slope it reduces to scaling
+    the step by the ratio of the target and actual distances.
+    The loop works on plain floats only; the callers supply the size and coordinate lookups.
+
+    Args:
+        startPosition: Position of the first gemstone center.
+        endPosition: Last position a gemstone center may take.
+        targetGap: Desired gap between neighbouring gemstones.
+        getSizeAtLength: Callable returning the gemstone size at a position.
+        getCoordinatesAtLength: Callable returning (x, y, z) at a position, or None.
+        getSizeSlopeAtLength: Optional callable returning the size change per unit length at a position.
+
+    Returns:
+        Tuple of center positions, gemstone sizes, and center coordinates.
+    """
+    centerPositions: list[float] = []
+    gemstoneSizes: list[float] = []
+    centerCoordinates: list[tuple[float, float, float] | None] = []
+
+    currentCenterPosition = startPosition
+
+    while currentCenterPosition <= endPosition + 1e-5:
+        currentGemstoneSize = getSizeAtLength(currentCenterPosition)
+        currentCoordinates = getCoordinatesAtLength(currentCenterPosition)
+
+        centerPositions.append(currentCenterPosition)
+        gemstoneSizes.append(currentGemstoneSize)
+        centerCoordinates.append(currentCoordinates)
+
+        currentRadiusWithGap = currentGemstoneSize / 2.0 + targetGap
+        nextCenterPosition = currentCenterPosition + currentGemstoneSize + targetGap
+
+        previousGemstoneSize = None
+        for _ in range(3):
+            nextGemstoneSize = getSizeAtLength(nextCenterPosition)
+            if nextGemstoneSize != previousGemstoneSize:
+                targetDistance = currentRadiusWithGap + nextGemstoneSize / 2.0
+                previousGemstoneSize = nextGemstoneSize
+
+            nextCoordinates = getCoordinatesAtLength(nextCenterPosition)
+            if currentCoordinates is None or nextCoordinates is None: break
+
+            actualDistance = math.dist(currentCoordinates, nextCoordinates)
+            distanceError = actualDistance - targetDistance
+            if abs(distanceError) < 1e-5: break
+
+            lengthDelta = nextCenterPosition - currentCenterPosition
+            if actualDistance <= 1e-5 or abs(lengthDelta) <= 1e-10: break
+
+            # The distance grows with the chord ratio, the target with half the size slope.
+            chordRatio = actualDistance / lengthDelta
+            errorSlope = chordRatio
+            if getSizeSlopeAtLength is not None and lengthDelta > 0:
+                errorSlope -= getSizeSlopeAtLength(nextCenterPosition) / 2.0
+                if errorSlope < 0.5 * chordRatio: errorSlope = chordRatio
+
+            nextCenterPosition -= distanceError / errorSlope
+
+        currentCenterPosition = nextCenterPosition
+
+    return centerPositions, gemstoneSizes, centerCoordinates
+
+
+def _distributeUniformly(startPosition: float, endPosition: float, sizes: list[float]) -> list[float]:
+    """Spread gemstone centers so the outer ones sit on the range ends with equal gaps in between.
+
+    Args:
+        startPosition: Position of the first gemstone center.
+        endPosition: Position of the last gemstone center.
+        sizes: Gemstone sizes in placement order.
+
+    Returns:
+        Center positions for the gemstones, one per size.
+    """
+    if len(sizes) == 1:
+        return [(startPosition + endPosition) / 2.0]
+
+    occupiedLength = sum(sizes) - (sizes[0] + sizes[-1]) / 2.0
+    uniformGap = ((endPosition - startPosition) - occupiedLength) / (len(sizes) - 1)
+
+    centerSteps = ((size + nextSize) / 2.0 + uniformGap for size, nextSize in zip(sizes, sizes[1:]))
+    return list(accumulate(centerSteps, initial=startPosition))
 
 
 def calculatePointsAndSizesAlongCurve(curve: adsk.core.Curve3D, startOffset: float, endOffset: float,
@@ -405,129 +533,145 @@ def calculatePointsAndSizesAlongCurve(curve: adsk.core.Curve3D, startOffset: flo
         
         isConstantSize = abs(startSize - endSize) < 1e-5 and not nonlinear
 
+        # The size law is size = a * t^2 + b * t + startSize over the normalized position t;
+        # its coefficients depend only on the inputs, so they are resolved once.
+        quadraticCoeffA = 0.0
+        linearCoeffB = endSize - startSize
+        if nonlinear:
+            clampedNonlinearPosition = max(0.01, min(0.99, nonlinearPosition))
+            denominator = clampedNonlinearPosition * (clampedNonlinearPosition - 1)
+            
+            if abs(denominator) >= 1e-5:
+                numerator = (nonlinearSize - startSize) - (endSize - startSize) * clampedNonlinearPosition
+                quadraticCoeffA = numerator / denominator
+                linearCoeffB = (endSize - startSize) - quadraticCoeffA
+
+        inverseAvailableLength = 1.0 / availableLength
+        inverseSizeStep = 1.0 / sizeStep if sizeStep > 0 else 0.0
+
         def getSizeAtLength(positionAlongCurve):
             if isConstantSize: return startSize
 
-            normalizedPosition = (positionAlongCurve - effectiveStartPosition) / availableLength if availableLength > 0 else 0.0
+            normalizedPosition = (positionAlongCurve - effectiveStartPosition) * inverseAvailableLength
             normalizedPosition = max(0.0, min(1.0, normalizedPosition))
             
-            interpolatedSize = 0.0
-            
-            if not nonlinear:
-                interpolatedSize = startSize + (endSize - startSize) * normalizedPosition
-                
-            else:
-                clampedNonlinearPosition = max(0.01, min(0.99, nonlinearPosition))
-                denominator = clampedNonlinearPosition * (clampedNonlinearPosition - 1)
-                
-                if abs(denominator) < 1e-5:
-                    interpolatedSize = startSize + (endSize - startSize) * normalizedPosition
-                else:
-                    numerator = (nonlinearSize - startSize) - (endSize - startSize) * clampedNonlinearPosition
-                    quadraticCoeffA = numerator / denominator
-                    linearCoeffB = (endSize - startSize) - quadraticCoeffA
-
-                    interpolatedSize = quadraticCoeffA * normalizedPosition * normalizedPosition + linearCoeffB * normalizedPosition + startSize
-            
+            interpolatedSize = (quadraticCoeffA * normalizedPosition + linearCoeffB) * normalizedPosition + startSize
             interpolatedSize = max(0.001, interpolatedSize)
 
             if sizeStep > 0:
-                return max(minimumGemstoneSize, round(interpolatedSize / sizeStep) * sizeStep)
+                return max(minimumGemstoneSize, int(interpolatedSize * inverseSizeStep + 0.5) * sizeStep)
             else:
                 return interpolatedSize
 
-        def getPointAtCalculationPosition(calcPos):
-            positionOnCurve = totalCurveLength - calcPos if flipDirection else calcPos
-            
+        # The placement loop below queries many lengths, so the curve is sampled once at uniform
+        # arc-length steps and queries interpolate between the samples instead of calling the evaluator.
+        sampleCount = max(256, int(totalCurveLength / minimumGemstoneSize) + 1)
+        sampleStep = totalCurveLength / (sampleCount - 1)
+        sampleParameters: list[float] = []
+        for i in range(sampleCount):
+            success, param = curveEvaluator.getParameterAtLength(startParameter, i * sampleStep)
+            sampleParameters.append(param if success else (sampleParameters[-1] if sampleParameters else startParameter))
+
+        success, samplePoints = curveEvaluator.getPointsAtParameters(sampleParameters)
+        if not success:
+            return result
+        sampleXs = [point.x for point in samplePoints]
+        sampleYs = [point.y for point in samplePoints]
+        sampleZs = [point.z for point in samplePoints]
+
+        def getSizeSlopeAtLength(positionAlongCurve: float) -> float:
+            """Get the change of the unsnapped size law per unit length at a position."""
+            normalizedPosition = (positionAlongCurve - effectiveStartPosition) * inverseAvailableLength
+            if normalizedPosition <= 0.0 or normalizedPosition >= 1.0:
+                return 0.0
+            return (2.0 * quadraticCoeffA * normalizedPosition + linearCoeffB) * inverseAvailableLength
+
+        def getSampleSegment(positionOnCurve: float) -> tuple[int, float]:
+            """Return the sample index and blend factor for a position inside the curve."""
+            scaledPosition = positionOnCurve / sampleStep
+            index = min(sampleCount - 2, int(scaledPosition))
+            return index, scaledPosition - index
+
+        startX, startY, startZ = curveStartPoint.asArray()
+        startTangentX, startTangentY, startTangentZ = curveStartTangent.asArray()
+        endX, endY, endZ = curveEndPoint.asArray()
+        endTangentX, endTangentY, endTangentZ = curveEndTangent.asArray()
+
+        def getExtrapolatedCoordinates(positionOnCurve: float) -> tuple[float, float, float] | None:
+            """Extend the curve along its end tangents for positions outside of it."""
             if positionOnCurve < 0:
                 overshoot = -positionOnCurve
-                return adsk.core.Point3D.create(
-                    curveStartPoint.x - curveStartTangent.x * overshoot,
-                    curveStartPoint.y - curveStartTangent.y * overshoot,
-                    curveStartPoint.z - curveStartTangent.z * overshoot
+                return (
+                    startX - startTangentX * overshoot,
+                    startY - startTangentY * overshoot,
+                    startZ - startTangentZ * overshoot
                 )
             
             if positionOnCurve > totalCurveLength:
                 overshoot = positionOnCurve - totalCurveLength
-                return adsk.core.Point3D.create(
-                    curveEndPoint.x + curveEndTangent.x * overshoot,
-                    curveEndPoint.y + curveEndTangent.y * overshoot,
-                    curveEndPoint.z + curveEndTangent.z * overshoot
+                return (
+                    endX + endTangentX * overshoot,
+                    endY + endTangentY * overshoot,
+                    endZ + endTangentZ * overshoot
                 )
-            
-            success, param = curveEvaluator.getParameterAtLength(startParameter, positionOnCurve)
-            if success:
-                success, point = curveEvaluator.getPointAtParameter(param)
-                if success:
-                    return point
+
             return None
 
-        centerPositions: list[float] = []
-        gemstoneSizes: list[float] = []
-        
-        currentCenterPosition = effectiveStartPosition
-        
-        while currentCenterPosition <= effectiveEndPosition + 1e-5:
-            currentGemstoneSize = getSizeAtLength(currentCenterPosition)
-            
-            centerPositions.append(currentCenterPosition)
-            gemstoneSizes.append(currentGemstoneSize)
+        def getCoordinatesAtCalculationPosition(calcPos: float) -> tuple[float, float, float]:
+            """Get the interpolated coordinates for a position measured in the placement direction."""
+            positionOnCurve = totalCurveLength - calcPos if flipDirection else calcPos
             
-            currentRadius = currentGemstoneSize / 2.0
-            nextCenterPosition = currentCenterPosition + currentGemstoneSize + targetGap
+            extrapolatedCoordinates = getExtrapolatedCoordinates(positionOnCurve)
+            if extrapolatedCoordinates is not None:
+                return extrapolatedCoordinates
             
-            currentPoint = getPointAtCalculationPosition(currentCenterPosition)
+            index, blend = getSampleSegment(positionOnCurve)
+            return (
+                sampleXs[index] + (sampleXs[index + 1] - sampleXs[index]) * blend,
+                sampleYs[index] + (sampleYs[index + 1] - sampleYs[index]) * blend,
+                sampleZs[index] + (sampleZs[index + 1] - sampleZs[index]) * blend
+            )
 
-            for _ in range(3):
-                nextGemstoneSize = getSizeAtLength(nextCenterPosition)
-                nextRadius = nextGemstoneSize / 2.0
-                targetDistance = currentRadius + nextRadius + targetGap
-                
-                nextPoint = getPointAtCalculationPosition(nextCenterPosition)
-                
-                if currentPoint is None or nextPoint is None:
-                    break
-                
-                actualDistance = currentPoint.distanceTo(nextPoint)
-                
-                if abs(actualDistance - targetDistance) < 1e-5:
-                    break
-                
-                scaleFactor = targetDistance / actualDistance if actualDistance > 1e-5 else 1.0
-                lengthDelta = nextCenterPosition - currentCenterPosition
-                nextCenterPosition = currentCenterPosition + lengthDelta * scaleFactor
-            
-            currentCenterPosition = nextCenterPosition
+        def getCurvePointsAtCalculationPositions(calcPositions: list[float]) -> list[adsk.core.Point3D | None]:
+            """Evaluate the final gemstone points exactly on the curve with one batch call."""
+            points: list[adsk.core.Point3D | None] = []
+            parameters: list[float] = []
+            parameterSlots: list[int] = []
+            for calcPos in calcPositions:
+                positionOnCurve = totalCurveLength - calcPos if flipDirection else calcPos
+                extrapolatedCoordinates = getExtrapolatedCoordinates(positionOnCurve)
+                if extrapolatedCoordinates is None:
+                    index, blend = getSampleSegment(positionOnCurve)
+                    parameters.append(sampleParameters[index] + (sampleParameters[index + 1] - sampleParameters[index]) * blend)
+                    parameterSlots.append(len(points))
+                    points.append(None)
+                else:
+                    points.append(adsk.core.Point3D.create(*extrapolatedCoordinates))
+
+            if parameters:
+                success, curvePoints = curveEvaluator.getPointsAtParameters(parameters)
+                if success:
+                    for slot, point in zip(parameterSlots, curvePoints):
+                        points[slot] = point
+
+            return points
+
+        # Snapped sizes change in steps, so their slope is only used for the continuous size law.
+        centerPositions, gemstoneSizes, _ = _placeGemstonesAlongLength(
+            effectiveStartPosition, effectiveEndPosition, targetGap,
+            getSizeAtLength, getCoordinatesAtCalculationPosition,
+            getSizeSlopeAtLength if not isConstantSize and sizeStep <= 0 else None
+        )
         
         if len(centerPositions) == 0:
             return result
 
-        if uniformDistribution and len(centerPositions) > 0:
-            if len(centerPositions) == 1:
-                centerPositions[0] = (effectiveStartPosition + effectiveEndPosition) / 2.0
-            else:
-                firstRadius = gemstoneSizes[0] / 2.0
-                lastRadius = gemstoneSizes[-1] / 2.0
-                middleSizesSum = sum(gemstoneSizes[1:-1]) if len(gemstoneSizes) > 2 else 0.0
-                
-                occupiedLength = firstRadius + middleSizesSum + lastRadius
-                totalGapSpace = availableLength - occupiedLength
-                uniformGap = totalGapSpace / (len(centerPositions) - 1)
-                
-                newCenterPositions = []
-                currentPos = effectiveStartPosition
-                
-                for i in range(len(gemstoneSizes)):
-                    newCenterPositions.append(currentPos)
-                    if i < len(gemstoneSizes) - 1:
-                        currentRadius = gemstoneSizes[i] / 2.0
-                        nextRadius = gemstoneSizes[i + 1] / 2.0
-                        currentPos += currentRadius + uniformGap + nextRadius
-                
-                centerPositions = newCenterPositions
+        if uniformDistribution:
+            centerPositions = _distributeUniformly(effectiveStartPosition, effectiveEndPosition, gemstoneSizes)
         
+        centerPoints = getCurvePointsAtCalculationPositions(centerPositions)
         for i in range(len(centerPositions)):
-            point = getPointAtCalculationPosition(centerPositions[i])
+            point = centerPoints[i]
             if point is not None:
                 result.append((point, gemstoneSizes[i]))
         
@@ -599,6 +743,12 @@ def calculatePointsAlongCurve(curve: adsk.core.Curve3D, spacing: float, startOff
         curveStartTangent.normalize()
         curveEndTangent.normalize()
 
+        # Extrapolation beyond the curve ends works on plain floats.
+        startX, startY, startZ = curveStartPoint.asArray()
+        startTangentX, startTangentY, startTangentZ = curveStartTangent.asArray()
+        endX, endY, endZ = curveEndPoint.asArray()
+        endTangentX, endTangentY, endTangentZ = curveEndTangent.asArray()
+
         for i in range(numberOfPositions):
             positionAlongCurve = effectiveStartPosition + i * actualSpacing
 
@@ -610,17 +760,17 @@ def calculatePointsAlongCurve(curve: adsk.core.Curve3D, spacing: float, startOff
             if actualPosition < 0:
                 overshoot = -actualPosition
                 point = adsk.core.Point3D.create(
-                    curveStartPoint.x - curveStartTangent.x * overshoot,
-                    curveStartPoint.y - curveStartTangent.y * overshoot,
-                    curveStartPoint.z - curveStartTangent.z * overshoot
+                    startX - startTangentX * overshoot,
+                    startY - startTangentY * overshoot,
+                    startZ - startTangentZ * overshoot
                 )
                 tangent = curveStartTangent.copy()
             elif actualPosition > totalCurveLength:
                 overshoot = actualPosition - totalCurveLength
                 point = adsk.core.Point3D.create(
-                    curveEndPoint.x + curveEndTangent.x * overshoot,
-                    curveEndPoint.y + curveEndTangent.y * overshoot,
-                    curveEndPoint.z + curveEndTangent.z * overshoot
+                    endX + endTangentX * overshoot,
+                    endY + endTangentY * overshoot,
+                    endZ + endTangentZ * overshoot
                 )
                 tangent = curveEndTangent.copy()
             else:
@@ -715,109 +865,108 @@ def calculatePointsAndSizesBetweenCurves(
         stepSize = minimumGemstoneSize
         numPoints = max(2, int(maxLength / stepSize) + 1)
         
-        averagePolyline: list[tuple[float, adsk.core.Point3D]] = []
+        # The curve points of all samples are evaluated with one batch call per curve.
+        positions: list[float] = []
+        parameters1: list[float] = []
+        parameters2: list[float] = []
         
         for i in range(numPoints):
             ratio = i / (numPoints - 1) if numPoints > 1 else 0.0
             
-            position = ratio * averageLength
+            positions.append(ratio * averageLength)
             
             curveRatio1 = 1.0 - ratio if flipDirection else ratio
             curveRatio2 = 1.0 - curveRatio1 if curvesOpposed else curveRatio1
             
-            length1 = curveRatio1 * curve1Length
-            _, param1 = curve1Evaluator.getParameterAtLength(startParam1, length1)
-            _, point1 = curve1Evaluator.getPointAtParameter(param1)
+            _, param1 = curve1Evaluator.getParameterAtLength(startParam1, curveRatio1 * curve1Length)
+            parameters1.append(param1)
             
-            length2 = curveRatio2 * curve2Length
-            _, param2 = curve2Evaluator.getParameterAtLength(startParam2, length2)
-            _, point2 = curve2Evaluator.getPointAtParameter(param2)
+            _, param2 = curve2Evaluator.getParameterAtLength(startParam2, curveRatio2 * curve2Length)
+            parameters2.append(param2)
 
-            midpoint = averagePosition([point1, point2])
-            if midpoint is None: continue
+        success, points1 = curve1Evaluator.getPointsAtParameters(parameters1)
+        if not success: return result
+
+        success, points2 = curve2Evaluator.getPointsAtParameters(parameters2)
+        if not success: return result
+
+        # The polyline coordinates are collected as floats while the samples are built, and
+        # interior samples are moved to the middle of their closest points on both curves.
+        polylinePositions: list[float] = []
+        polylinePoints: list[adsk.core.Point3D] = []
+        polylineXs: list[float] = []
+        polylineYs: list[float] = []
+        polylineZs: list[float] = []
+        interiorDistances: list[float] = []
+        
+        for i, (position, point1, point2) in enumerate(zip(positions, points1, points2)):
+            x1, y1, z1 = point1.asArray()
+            x2, y2, z2 = point2.asArray()
+            midX, midY, midZ = (x1 + x2) / 2.0, (y1 + y2) / 2.0, (z1 + z2) / 2.0
+            midpoint = adsk.core.Point3D.create(midX, midY, midZ)
             
             if i != 0 and i != numPoints - 1:
-                firstClosest = measureManager.measureMinimumDistance(midpoint, curve1Geometry).positionOne
-                secondClosest = measureManager.measureMinimumDistance(midpoint, curve2Geometry).positionOne
-            
-                midpoint = averagePosition([firstClosest, secondClosest])
-                if midpoint is None: continue
-
-            averagePolyline.append((position, midpoint))
+                measure1 = measureManager.measureMinimumDistance(midpoint, curve1Geometry)
+                measure2 = measureManager.measureMinimumDistance(midpoint, curve2Geometry)
+                interiorDistances.append((measure1.value + measure2.value) / 2.0)
+                x1, y1, z1 = measure1.positionOne.asArray()
+                x2, y2, z2 = measure2.positionOne.asArray()
+                midX, midY, midZ = (x1 + x2) / 2.0, (y1 + y2) / 2.0, (z1 + z2) / 2.0
+                midpoint = adsk.core.Point3D.create(midX, midY, midZ)
+
+            polylinePositions.append(position)
+            polylinePoints.append(midpoint)
+            polylineXs.append(midX)
+            polylineYs.append(midY)
+            polylineZs.append(midZ)
                 
-        def getPointAtLength(positionAlongPolyline: float) -> adsk.core.Point3D | None:
-            """Get interpolated or extrapolated point on the average polyline at a given position."""
-            if len(averagePolyline) == 0:
+        # The samples are spaced uniformly along the polyline, so a position maps straight to its segment.
+        polylineCount = len(polylinePositions)
+        polylineStep = averageLength / (numPoints - 1)
+        isUniformPolyline = polylineCount == numPoints and polylineStep > 1e-10
+
+        def getPolylineSegmentIndex(positionAlongPolyline: float) -> int:
+            """Get the index of the polyline segment that contains or is nearest to a position."""
+            if positionAlongPolyline <= polylinePositions[0]:
+                return 0
+            if positionAlongPolyline >= polylinePositions[-1]:
+                return polylineCount - 2
+            if isUniformPolyline:
+                return min(polylineCount - 2, int(positionAlongPolyline / polylineStep))
+
+            return min(polylineCount - 2, bisect_right(polylinePositions, positionAlongPolyline) - 1)
+
+        def getCoordinatesAtLength(positionAlongPolyline: float) -> tuple[float, float, float] | None:
+            """Get interpolated or extrapolated coordinates on the average polyline at a given position."""
+            if polylineCount == 0:
                 return None
             
-            if len(averagePolyline) < 2:
-                return averagePolyline[0][1]
+            if polylineCount < 2:
+                return polylineXs[0], polylineYs[0], polylineZs[0]
             
-            if positionAlongPolyline < averagePolyline[0][0]:
-                pos1, point1 = averagePolyline[0]
-                pos2, point2 = averagePolyline[1]
-                segmentLength = pos2 - pos1
-                if segmentLength < 1e-10:
-                    return point1
-                overshoot = pos1 - positionAlongPolyline
-                dx = (point2.x - point1.x) / segmentLength
-                dy = (point2.y - point1.y) / segmentLength
-                dz = (point2.z - point1.z) / segmentLength
-                return adsk.core.Point3D.create(
-                    point1.x - dx * overshoot,
-                    point1.y - dy * overshoot,
-                    point1.z - dz * overshoot
-                )
-            
-            if positionAlongPolyline > averagePolyline[-1][0]:
-                pos1, point1 = averagePolyline[-2]
-                pos2, point2 = averagePolyline[-1]
-                segmentLength = pos2 - pos1
-                if segmentLength < 1e-10:
-                    return point2
-                overshoot = positionAlongPolyline - pos2
-                dx = (point2.x - point1.x) / segmentLength
-                dy = (point2.y - point1.y) / segmentLength
-                dz = (point2.z - point1.z) / segmentLength
-                return adsk.core.Point3D.create(
-                    point2.x + dx * overshoot,
-                    point2.y + dy * overshoot,
-                    point2.z + dz * overshoot
-                )
+            i = getPolylineSegmentIndex(positionAlongPolyline)
+            pos1 = polylinePositions[i]
+            segmentLength = polylinePositions[i + 1] - pos1
+            if segmentLength < 1e-10:
+                if positionAlongPolyline > pos1: i += 1
+                return polylineXs[i], polylineYs[i], polylineZs[i]
             
-            for i in range(len(averagePolyline) - 1):
-                pos1, point1 = averagePolyline[i]
-                pos2, point2 = averagePolyline[i + 1]
-                
-                if pos1 <= positionAlongPolyline <= pos2:
-                    segmentLength = pos2 - pos1
-                    if segmentLength < 1e-10:
-                        return point1
-                    
-                    t = (positionAlongPolyline - pos1) / segmentLength
-                    
-                    interpolatedPoint = adsk.core.Point3D.create(
-                        point1.x + t * (point2.x - point1.x),
-                        point1.y + t * (point2.y - point1.y),
-                        point1.z + t * (point2.z - point1.z)
-                    )
-                    return interpolatedPoint
+            t = (positionAlongPolyline - pos1) / segmentLength
             
-            return None
+            return (
+                polylineXs[i] + t * (polylineXs[i + 1] - polylineXs[i]),
+                polylineYs[i] + t * (polylineYs[i + 1] - polylineYs[i]),
+                polylineZs[i] + t * (polylineZs[i + 1] - polylineZs[i])
+            )
+
+        def getPointAtLength(positionAlongPolyline: float) -> adsk.core.Point3D | None:
+            """Get interpolated or extrapolated point on the average polyline at a given position."""
+            coordinates = getCoordinatesAtLength(positionAlongPolyline)
+            return adsk.core.Point3D.create(*coordinates) if coordinates else None
         
             
-        def getMinDistanceToCurves(point: adsk.core.Point3D) -> float:
-            """Get the minimum distance from a point to either curve."""
-            if point is None:
-                return 0.0
-            
-            dist1 = measureManager.measureMinimumDistance(point, curve1Geometry).value
-            dist2 = measureManager.measureMinimumDistance(point, curve2Geometry).value
-            
-            return min(dist1, dist2)
-        
         def getAverageDistanceToCurves(point: adsk.core.Point3D) -> float:
-            """Get the minimum distance from a point to either curve."""
+            """Get the average of the minimum distances from a point to both curves."""
             if point is None:
                 return 0.0
             
@@ -825,27 +974,54 @@ def calculatePointsAndSizesBetweenCurves(
             dist2 = measureManager.measureMinimumDistance(point, curve2Geometry).value
             
             return (dist1 + dist2) / 2.0
+
+        # Distance measurements are expensive, so each polyline sample is measured at most once,
+        # and only when a size query lands next to it.
+        sampleDistances: dict[int, float] = {}
+
+        def getAverageDistanceAtSample(sampleIndex: int) -> float:
+            """Get the cached average distance from a polyline sample to both curves."""
+            distance = sampleDistances.get(sampleIndex)
+            if distance is None:
+                distance = getAverageDistanceToCurves(polylinePoints[sampleIndex])
+                sampleDistances[sampleIndex] = distance
+            return distance
         
+        inverseSizeStep = 1.0 / sizeStep if sizeStep > 0 else 0.0
+
         def getSizeAtLength(positionAlongPolyline: float) -> float:
             """Get gemstone size at a given position along the average polyline.
             
-            The size is calculated as 2 * minDistance * sizeRatio, where minDistance
-            is the minimum distance from the polyline point to either curve.
+            The size is calculated as 2 * avgDistance * sizeRatio, where avgDistance is the
+            average distance to the two curves, interpolated between the neighbouring polyline samples.
             For positions outside the polyline bounds, the size of the nearest edge gemstone is used.
             """
-            clampedPosition = positionAlongPolyline
-            if len(averagePolyline) >= 2:
-                clampedPosition = max(averagePolyline[0][0], min(averagePolyline[-1][0], positionAlongPolyline))
-            
-            point = getPointAtLength(clampedPosition)
-            if point is None:
+            if constantGemstoneSize is not None: return constantGemstoneSize
+
+            if polylineCount == 0:
                 return minimumGemstoneSize
-            
-            avgDist = getAverageDistanceToCurves(point)
+
+            if polylineCount < 2:
+                avgDist = getAverageDistanceAtSample(0)
+            else:
+                clampedPosition = max(polylinePositions[0], min(polylinePositions[-1], positionAlongPolyline))
+                i = getPolylineSegmentIndex(clampedPosition)
+                segmentLength = polylinePositions[i + 1] - polylinePositions[i]
+                t = (clampedPosition - polylinePositions[i]) / segmentLength if segmentLength >= 1e-10 else 0.0
+                t = max(0.0, min(1.0, t))
+
+                avgDist = getAverageDistanceAtSample(i)
+                if t > 0.0:
+                    avgDist += t * (getAverageDistanceAtSample(i + 1) - avgDist)
+
+            return getSizeFromDistance(avgDist)
+
+        def getSizeFromDistance(avgDist: float) -> float:
+            """Convert an average distance to both curves into a snapped and clamped gemstone size."""
             gemstoneSize = 2.0 * avgDist * sizeRatio
             
             if sizeStep > 0:
-                gemstoneSize = max(minimumGemstoneSize, round(gemstoneSize / sizeStep) * sizeStep)
+                gemstoneSize = max(minimumGemstoneSize, int(gemstoneSize * inverseSizeStep + 0.5) * sizeStep)
             else:
                 gemstoneSize = max(minimumGemstoneSize, gemstoneSize)
 
@@ -856,68 +1032,29 @@ def calculatePointsAndSizesBetweenCurves(
 
             return gemstoneSize
         
+        # Equidistant curves, such as offsets of each other, give the same size everywhere,
+        # which the distances measured while building the polyline already reveal.
+        constantGemstoneSize = None
+        if interiorDistances and max(interiorDistances) - min(interiorDistances) < 1e-5:
+            constantGemstoneSize = getSizeFromDistance(sum(interiorDistances) / len(interiorDistances))
+        
         effectiveStartPosition = startOffset
         effectiveEndPosition = averageLength - endOffset
         
         if effectiveEndPosition < effectiveStartPosition:
             return result
 
-        currentCenterPosition = effectiveStartPosition
-        
-        while currentCenterPosition <= effectiveEndPosition + 1e-5:
-            currentGemstoneSize = getSizeAtLength(currentCenterPosition)
-            
-            point = getPointAtLength(currentCenterPosition)
-            if point: result.append((point, currentGemstoneSize))
-            
-            currentRadius = currentGemstoneSize / 2.0
-            nextCenterPosition = currentCenterPosition + currentGemstoneSize + targetGap
-            
-            for _ in range(3):
-                nextGemstoneSize = getSizeAtLength(nextCenterPosition)
-                nextRadius = nextGemstoneSize / 2.0
-                targetDistance = currentRadius + nextRadius + targetGap
-                
-                nextPoint = getPointAtLength(nextCenterPosition)
-                if point is None or nextPoint is None: break
-                
-                actualDistance = point.distanceTo(nextPoint)
-                if abs(actualDistance - targetDistance) < 1e-5: break
-                
-                scaleFactor = targetDistance / actualDistance if actualDistance > 1e-5 else 1.0
-                lengthDelta = nextCenterPosition - currentCenterPosition
-                nextCenterPosition = currentCenterPosition + lengthDelta * scaleFactor
-            
-            currentCenterPosition = nextCenterPosition
+        _, gemstoneSizes, centerCoordinates = _placeGemstonesAlongLength(
+            effectiveStartPosition, effectiveEndPosition, targetGap,
+            getSizeAtLength, getCoordinatesAtLength
+        )
+        for coordinates, gemstoneSize in zip(centerCoordinates, gemstoneSizes):
+            if coordinates: result.append((adsk.core.Point3D.create(*coordinates), gemstoneSize))
         
         if uniformDistribution and len(result) > 0:
-            if len(result) == 1:
-                centerPosition = (effectiveStartPosition + effectiveEndPosition) / 2.0
-                point = getPointAtLength(centerPosition)
-                if point:
-                    result[0] = (point, result[0][1])
-            else:
-                firstRadius = result[0][1] / 2.0
-                lastRadius = result[-1][1] / 2.0
-                middleSizesSum = sum(size for _, size in result[1:-1]) if len(result) > 2 else 0.0
-                
-                occupiedLength = firstRadius + middleSizesSum + lastRadius
-                totalGapSpace = (effectiveEndPosition - effectiveStartPosition) - occupiedLength
-                uniformGap = totalGapSpace / (len(result) - 1)
-                
-                newResult = []
-                currentPos = effectiveStartPosition
-                
-                for i, (_, size) in enumerate(result):
-                    point = getPointAtLength(currentPos)
-                    if point:
-                        newResult.append((point, size))
-                    if i < len(result) - 1:
-                        currentRadius = size / 2.0
-                        nextRadius = result[i + 1][1] / 2.0
-                        currentPos += currentRadius + uniformGap + nextRadius
-                
-                result = newResult
+            sizes = [size for _, size in result]
+            centerPositions = _distributeUniformly(effectiveStartPosition, effectiveEndPosition, sizes)
+            result = [(point, size) for point, size in zip(map(getPointAtLength, centerPositions), sizes) if point]
         
         return _mergeOverlappingGemstones(result)
     
@@ -980,32 +1117,35 @@ def calculatePointsAndSizesAlongCurveChain(
             return []
 
         isConstantSize = abs(startSize - endSize) < 1e-5 and not nonlinear
+        inverseSizeStep = 1.0 / sizeStep if sizeStep > 0 else 0.0
+
+        # The size law is size = a * t^2 + b * t + startSize over the normalized position t;
+        # its coefficients depend only on the inputs, so they are resolved once.
+        quadraticCoeffA = 0.0
+        linearCoeffB = endSize - startSize
+        if nonlinear:
+            clampedNonlinearPosition = max(0.01, min(0.99, nonlinearPosition))
+            denominator = clampedNonlinearPosition * (clampedNonlinearPosition - 1)
+
+            if abs(denominator) >= 1e-5:
+                numerator = (nonlinearSize - startSize) - (endSize - startSize) * clampedNonlinearPosition
+                quadraticCoeffA = numerator / denominator
+                linearCoeffB = (endSize - startSize) - quadraticCoeffA
+
+        inverseAvailableLength = 1.0 / availableLength
 
         def getSizeAtLength(positionAlongChain: float) -> float:
             if isConstantSize:
                 return startSize
 
-            normalizedPosition = (positionAlongChain - effectiveStartPosition) / availableLength if availableLength > 0 else 0.0
+            normalizedPosition = (positionAlongChain - effectiveStartPosition) * inverseAvailableLength
             normalizedPosition = max(0.0, min(1.0, normalizedPosition))
 
-            if not nonlinear:
-                interpolatedSize = startSize + (endSize - startSize) * normalizedPosition
-            else:
-                clampedNonlinearPosition = max(0.01, min(0.99, nonlinearPosition))
-                denominator = clampedNonlinearPosition * (clampedNonlinearPosition - 1)
-
-                if abs(denominator) < 1e-5:
-                    interpolatedSize = startSize + (endSize - startSize) * normalizedPosition
-                else:
-                    numerator = (nonlinearSize - startSize) - (endSize - startSize) * clampedNonlinearPosition
-                    quadraticCoeffA = numerator / denominator
-                    linearCoeffB = (endSize - startSize) - quadraticCoeffA
-                    interpolatedSize = quadraticCoeffA * normalizedPosition * normalizedPosition + linearCoeffB * normalizedPosition + startSize
-
+            interpolatedSize = (quadraticCoeffA * normalizedPosition + linearCoeffB) * normalizedPosition + startSize
             interpolatedSize = max(0.001, interpolatedSize)
 
             if sizeStep > 0:
-                return max(minimumGemstoneSize, round(interpolatedSize / sizeStep) * sizeStep)
+                return max(minimumGemstoneSize, int(interpolatedSize * inverseSizeStep + 0.5) * sizeStep)
             else:
                 return interpolatedSize
 
@@ -1013,69 +1153,15 @@ def calculatePointsAndSizesAlongCurveChain(
             positionOnChain = totalLength - calcPos if flipDirection else calcPos
             return chainEval.getPointAtLength(positionOnChain)
 
+        def getCoordinatesAtCalcPos(calcPos: float) -> tuple[float, float, float] | None:
+            positionOnChain = totalLength - calcPos if flipDirection else calcPos
+            return chainEval.getCoordinatesAtLength(positionOnChain)
+
         def placeGemstonesInRange(rangeStart: float, rangeEnd: float) -> tuple[list[float], list[float]]:
             """Place gemstones using standard algorithm within a range."""
-            positions: list[float] = []
-            sizes: list[float] = []
-            currentCenterPosition = rangeStart
-
-            while currentCenterPosition <= rangeEnd + 1e-5:
-                currentGemstoneSize = getSizeAtLength(currentCenterPosition)
-                positions.append(currentCenterPosition)
-                sizes.append(currentGemstoneSize)
-
-                currentRadius = currentGemstoneSize / 2.0
-                nextCenterPosition = currentCenterPosition + currentGemstoneSize + targetGap
-                currentPoint = getPointAtCalcPos(currentCenterPosition)
-
-                for _ in range(3):
-                    nextGemstoneSize = getSizeAtLength(nextCenterPosition)
-                    nextRadius = nextGemstoneSize / 2.0
-                    targetDistance = currentRadius + nextRadius + targetGap
-                    nextPoint = getPointAtCalcPos(nextCenterPosition)
-
-                    if currentPoint is None or nextPoint is None:
-                        break
-
-                    actualDistance = currentPoint.distanceTo(nextPoint)
-                    if abs(actualDistance - targetDistance) < 1e-5:
-                        break
-
-                    scaleFactor = targetDistance / actualDistance if actualDistance > 1e-5 else 1.0
-                    lengthDelta = nextCenterPosition - currentCenterPosition
-                    nextCenterPosition = currentCenterPosition + lengthDelta * scaleFactor
-
-                currentCenterPosition = nextCenterPosition
-
+            positions, sizes, _ = _placeGemstonesAlongLength(rangeStart, rangeEnd, targetGap, getSizeAtLength, getCoordinatesAtCalcPos)
             return positions, sizes
 
-        def applyUniformDistribution(positions: list[float], sizes: list[float], rangeStart: float, rangeEnd: float) -> list[float]:
-            """Apply uniform distribution to positions within a range."""
-            if len(positions) == 0:
-                return positions
-
-            if len(positions) == 1:
-                positions[0] = (rangeStart + rangeEnd) / 2.0
-                return positions
-
-            firstRadius = sizes[0] / 2.0
-            lastRadius = sizes[-1] / 2.0
-            middleSizesSum = sum(sizes[1:-1]) if len(sizes) > 2 else 0.0
-            occupiedLength = firstRadius + middleSizesSum + lastRadius
-            totalGapSpace = (rangeEnd - rangeStart) - occupiedLength
-            uniformGap = totalGapSpace / (len(positions) - 1)
-
-            newPositions: list[float] = []
-            currentPos = rangeStart
-            for i in range(len(sizes)):
-                newPositions.append(currentPos)
-                if i < len(sizes) - 1:
-                    currentRadius = sizes[i] / 2.0
-                    nextRadius = sizes[i + 1] / 2.0
-                    currentPos += currentRadius + uniformGap + nextRadius
-
-            return newPositions
-
         centerPositions: list[float] = []
         gemstoneSizes: list[float] = []
 
@@ -1125,7 +1211,7 @@ def calculatePointsAndSizesAlongCurveChain(
                     segPositions, segSizes = placeGemstonesInRange(innerStart, innerEnd)
 
                     if uniformDistribution and len(segPositions) > 0:
-                        segPositions = applyUniformDistribution(segPositions, segSizes, innerStart, innerEnd)
+                        segPositions = _distributeUniformly(innerStart, innerEnd, segSizes)
 
                     centerPositions.extend(segPositions)
                     gemstoneSizes.extend(segSizes)
@@ -1138,7 +1224,7 @@ def calculatePointsAndSizesAlongCurveChain(
             centerPositions, gemstoneSizes = placeGemstonesInRange(effectiveStartPosition, effectiveEndPosition)
 
             if uniformDistribution and len(centerPositions) > 0:
-                centerPositions = applyUniformDistribution(centerPositions, gemstoneSizes, effectiveStartPosition, effectiveEndPosition)
+                centerPositions = _distributeUniformly(effectiveStartPosition, effectiveEndPosition, gemstoneSizes)
 
         result: list[tuple[adsk.core.Point3D, float]] = []
         for i in range(len(centerPositions)):
@@ -1153,6 +1239,30 @@ def calculatePointsAndSizesAlongCurveChain(
         return []
 
 
+def _getChainDistanceGeometry(curves: list[adsk.core.Curve3D]) -> list:
+    """Get the geometry to measure distances to a curve chain against.
+
+    A chain of several curves is combined into one temporary wire body, so the minimum
+    distance to the whole chain takes a single measurement instead of one per curve.
+    If the wire cannot be built, the curves themselves are returned.
+
+    Args:
+        curves: Ordered curves of the chain.
+
+    Returns:
+        A list holding the wire body, or the original curves.
+    """
+    if len(curves) < 2:
+        return curves
+
+    try:
+        wireBody, _ = _temporaryBRep.createWireFromCurves(curves, True)
+    except RuntimeError:
+        return curves
+
+    return [wireBody] if wireBody else curves
+
+
 def calculatePointsAndSizesBetweenCurveChains(
     rail1Entities: list,
     rail2Entities: list,
@@ -1218,7 +1328,10 @@ def calculatePointsAndSizesBetweenCurveChains(
         stepSize = minimumGemstoneSize
         numPoints = max(2, int(maxLength / stepSize) + 1)
 
-        averagePolyline: list[tuple[float, adsk.core.Point3D]] = []
+        polylinePositions: list[float] = []
+        polylineXs: list[float] = []
+        polylineYs: list[float] = []
+        polylineZs: list[float] = []
 
         for i in range(numPoints):
             ratio = i / (numPoints - 1) if numPoints > 1 else 0.0
@@ -1227,83 +1340,65 @@ def calculatePointsAndSizesBetweenCurveChains(
             curveRatio1 = 1.0 - ratio if flipDirection else ratio
             curveRatio2 = 1.0 - curveRatio1 if chainsOpposed else curveRatio1
 
-            point1 = chain1.getPointAtLength(curveRatio1 * chain1Length)
-            point2 = chain2.getPointAtLength(curveRatio2 * chain2Length)
-
-            midpoint = averagePosition([point1, point2])
-            if midpoint is None:
+            coordinates1 = chain1.getCoordinatesAtLength(curveRatio1 * chain1Length)
+            coordinates2 = chain2.getCoordinatesAtLength(curveRatio2 * chain2Length)
+            if coordinates1 is None or coordinates2 is None:
                 continue
 
-            averagePolyline.append((position, midpoint))
+            polylinePositions.append(position)
+            polylineXs.append((coordinates1[0] + coordinates2[0]) / 2.0)
+            polylineYs.append((coordinates1[1] + coordinates2[1]) / 2.0)
+            polylineZs.append((coordinates1[2] + coordinates2[2]) / 2.0)
 
-        if len(averagePolyline) < 2:
+        polylineCount = len(polylinePositions)
+        if polylineCount < 2:
             return []
 
-        def getPointAtLength(positionAlongPolyline: float) -> adsk.core.Point3D | None:
-            if len(averagePolyline) == 0:
-                return None
-            if len(averagePolyline) < 2:
-                return averagePolyline[0][1]
-
-            if positionAlongPolyline < averagePolyline[0][0]:
-                pos1, pt1 = averagePolyline[0]
-                pos2, pt2 = averagePolyline[1]
-                segLen = pos2 - pos1
-                if segLen < 1e-10:
-                    return pt1
-                overshoot = pos1 - positionAlongPolyline
-                dx = (pt2.x - pt1.x) / segLen
-                dy = (pt2.y - pt1.y) / segLen
-                dz = (pt2.z - pt1.z) / segLen
-                return adsk.core.Point3D.create(pt1.x - dx * overshoot, pt1.y - dy * overshoot, pt1.z - dz * overshoot)
-
-            if positionAlongPolyline > averagePolyline[-1][0]:
-                pos1, pt1 = averagePolyline[-2]
-                pos2, pt2 = averagePolyline[-1]
-                segLen = pos2 - pos1
-                if segLen < 1e-10:
-                    return pt2
-                overshoot = positionAlongPolyline - pos2
-                dx = (pt2.x - pt1.x) / segLen
-                dy = (pt2.y - pt1.y) / segLen
-                dz = (pt2.z - pt1.z) / segLen
-                return adsk.core.Point3D.create(pt2.x + dx * overshoot, pt2.y + dy * overshoot, pt2.z + dz * overshoot)
-
-            for idx in range(len(averagePolyline) - 1):
-                pos1, pt1 = averagePolyline[idx]
-                pos2, pt2 = averagePolyline[idx + 1]
-                if pos1 <= positionAlongPolyline <= pos2:
-                    segLen = pos2 - pos1
-                    if segLen < 1e-10:
-                        return pt1
-                    t = (positionAlongPolyline - pos1) / segLen
-                    return adsk.core.Point3D.create(
-                        pt1.x + t * (pt2.x - pt1.x),
-                        pt1.y + t * (pt2.y - pt1.y),
-                        pt1.z + t * (pt2.z - pt1.z))
-            return None
+        def getCoordinatesAtLength(positionAlongPolyline: float) -> tuple[float, float, float]:
+            """Get interpolated or extrapolated coordinates on the average polyline at a given position."""
+            # Samples whose midpoint could not be built are skipped, so the positions are searched by bisection.
+            if positionAlongPolyline > polylinePositions[-1]:
+                idx = polylineCount - 2
+            else:
+                idx = max(0, min(polylineCount - 2, bisect_right(polylinePositions, positionAlongPolyline) - 1))
+
+            segLen = polylinePositions[idx + 1] - polylinePositions[idx]
+            if segLen < 1e-10:
+                if positionAlongPolyline > polylinePositions[-1]: idx += 1
+                return polylineXs[idx], polylineYs[idx], polylineZs[idx]
+
+            t = (positionAlongPolyline - polylinePositions[idx]) / segLen
+            return (
+                polylineXs[idx] + t * (polylineXs[idx + 1] - polylineXs[idx]),
+                polylineYs[idx] + t * (polylineYs[idx + 1] - polylineYs[idx]),
+                polylineZs[idx] + t * (polylineZs[idx + 1] - polylineZs[idx])
+            )
+
+        def getPointAtLength(positionAlongPolyline: float) -> adsk.core.Point3D:
+            """Get interpolated or extrapolated point on the average polyline at a given position."""
+            return adsk.core.Point3D.create(*getCoordinatesAtLength(positionAlongPolyline))
+
+        distanceGeometry1 = _getChainDistanceGeometry(curves1)
+        distanceGeometry2 = _getChainDistanceGeometry(curves2)
 
         def getAverageDistanceToChains(point: adsk.core.Point3D) -> float:
             if point is None:
                 return 0.0
-            dist1 = min(measureManager.measureMinimumDistance(point, c).value for c in curves1)
-            dist2 = min(measureManager.measureMinimumDistance(point, c).value for c in curves2)
+            dist1 = min(measureManager.measureMinimumDistance(point, g).value for g in distanceGeometry1)
+            dist2 = min(measureManager.measureMinimumDistance(point, g).value for g in distanceGeometry2)
             return (dist1 + dist2) / 2.0
 
-        def getSizeAtLength(positionAlongPolyline: float) -> float:
-            clampedPosition = positionAlongPolyline
-            if len(averagePolyline) >= 2:
-                clampedPosition = max(averagePolyline[0][0], min(averagePolyline[-1][0], positionAlongPolyline))
+        inverseSizeStep = 1.0 / sizeStep if sizeStep > 0 else 0.0
 
+        def getSizeAtLength(positionAlongPolyline: float) -> float:
+            clampedPosition = max(polylinePositions[0], min(polylinePositions[-1], positionAlongPolyline))
             point = getPointAtLength(clampedPosition)
-            if point is None:
-                return minimumGemstoneSize
 
             avgDist = getAverageDistanceToChains(point)
             gemstoneSize = 2.0 * avgDist * sizeRatio
 
             if sizeStep > 0:
-                gemstoneSize = max(minimumGemstoneSize, round(gemstoneSize / sizeStep) * sizeStep)
+                gemstoneSize = max(minimumGemstoneSize, int(gemstoneSize * inverseSizeStep + 0.5) * sizeStep)
             else:
                 gemstoneSize = max(minimumGemstoneSize, gemstoneSize)
 
@@ -1322,67 +1417,9 @@ def calculatePointsAndSizesBetweenCurveChains(
 
         def placeGemstonesInRange(rangeStart: float, rangeEnd: float) -> tuple[list[float], list[float]]:
             """Place gemstones using standard algorithm within a range."""
-            positions: list[float] = []
-            sizes: list[float] = []
-            currentCenterPosition = rangeStart
-
-            while currentCenterPosition <= rangeEnd + 1e-5:
-                currentGemstoneSize = getSizeAtLength(currentCenterPosition)
-                positions.append(currentCenterPosition)
-                sizes.append(currentGemstoneSize)
-
-                currentRadius = currentGemstoneSize / 2.0
-                nextCenterPosition = currentCenterPosition + currentGemstoneSize + targetGap
-                currentPoint = getPointAtLength(currentCenterPosition)
-
-                for _ in range(3):
-                    nextGemstoneSize = getSizeAtLength(nextCenterPosition)
-                    nextRadius = nextGemstoneSize / 2.0
-                    targetDistance = currentRadius + nextRadius + targetGap
-                    nextPoint = getPointAtLength(nextCenterPosition)
-
-                    if currentPoint is None or nextPoint is None:
-                        break
-
-                    actualDistance = currentPoint.distanceTo(nextPoint)
-                    if abs(actualDistance - targetDistance) < 1e-5:
-                        break
-
-                    scaleFactor = targetDistance / actualDistance if actualDistance > 1e-5 else 1.0
-                    lengthDelta = nextCenterPosition - currentCenterPosition
-                    nextCenterPosition = currentCenterPosition + lengthDelta * scaleFactor
-
-                currentCenterPosition = nextCenterPosition
-
+            positions, sizes, _ = _placeGemstonesAlongLength(rangeStart, rangeEnd, targetGap, getSizeAtLength, getCoordinatesAtLength)
             return positions, sizes
 
-        def applyUniformDistribution(positions: list[float], sizes: list[float], rangeStart: float, rangeEnd: float) -> list[float]:
-            """Apply uniform distribution to positions within a range."""
-            if len(positions) == 0:
-                return positions
-
-            if len(positions) == 1:
-                positions[0] = (rangeStart + rangeEnd) / 2.0
-                return positions
-
-            firstRadius = sizes[0] / 2.0
-            lastRadius = sizes[-1] / 2.0
-            middleSizesSum = sum(sizes[1:-1]) if len(sizes) > 2 else 0.0
-            occupiedLength = firstRadius + middleSizesSum + lastRadius
-            totalGapSpace = (rangeEnd - rangeStart) - occupiedLength
-            uniformGap = totalGapSpace / (len(positions) - 1)
-
-            newPositions: list[float] = []
-            currentPos = rangeStart
-            for i in range(len(sizes)):
-                newPositions.append(currentPos)
-                if i < len(sizes) - 1:
-                    currentRadius = sizes[i] / 2.0
-                    nextRadius = sizes[i + 1] / 2.0
-                    currentPos += currentRadius + uniformGap + nextRadius
-
-            return newPositions
-
         centerPositions: list[float] = []
         gemstoneSizes: list[float] = []
 
@@ -1456,7 +1493,7 @@ def calculatePointsAndSizesBetweenCurveChains(
                     segPositions, segSizes = placeGemstonesInRange(innerStart, innerEnd)
 
                     if uniformDistribution and len(segPositions) > 0:
-                        segPositions = applyUniformDistribution(segPositions, segSizes, innerStart, innerEnd)
+                        segPositions = _distributeUniformly(innerStart, innerEnd, segSizes)
 
                     centerPositions.extend(segPositions)
                     gemstoneSizes.extend(segSizes)
@@ -1469,7 +1506,7 @@ def calculatePointsAndSizesBetweenCurveChains(
             centerPositions, gemstoneSizes = placeGemstonesInRange(effectiveStartPosition, effectiveEndPosition)
 
             if uniformDistribution and len(centerPositions) > 0:
-                centerPositions = applyUniformDistribution(centerPositions, gemstoneSizes, effectiveStartPosition, effectiveEndPosition)
+                centerPositions = _distributeUniformly(effectiveStartPosition, effectiveEndPosition, gemstoneSizes)
 
         result: list[tuple[adsk.core.Point3D, float]] = []
         for i in range(len(centerPositions)):
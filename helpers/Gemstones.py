@@ -1,4 +1,5 @@
 import adsk.core, adsk.fusion
+import math
 import os
 import traceback
 import json
@@ -10,6 +11,9 @@ from .Surface import getDataFromPointAndFace
 
 _temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
 
+# Parsed body, girdle centroid and girdle thickness of each gemstone template file, loaded on first use.
+_gemstoneTemplates: dict[str, tuple[adsk.fusion.BRepBody, adsk.core.Point3D, float]] = {}
+
 
 def isGemstone(body: adsk.fusion.BRepBody, forceGeometryCheck: bool = True) -> bool:
     """Check if a body is a gemstone.
@@ -66,7 +70,7 @@ def isGemstone(body: adsk.fusion.BRepBody, forceGeometryCheck: bool = True) -> b
         cylinder = adsk.core.Cylinder.cast(cylindricalFace.geometry)
         cylinderAxis = cylinder.axis
         
-        topFace = sorted(planarFaces, key=lambda x: x.area, reverse=True)[0] if planarFaces else None
+        topFace = max(planarFaces, key=lambda x: x.area) if planarFaces else None
         if topFace is None:
             return False
         
@@ -95,6 +99,7 @@ class GemstoneInfo:
         self.cylindricalFace: adsk.fusion.BRepFace = None
         self.cylinder: adsk.core.Cylinder = None
         self.centroid: adsk.core.Point3D = None
+        self.centroidCoordinates: tuple[float, float, float] = None
         self.girdleThickness: float = 0.0
         self.radius: float = 0.0
         self.diameter: float = 0.0
@@ -102,9 +107,12 @@ class GemstoneInfo:
         self.flipFaceNormal: bool = False
         self.absoluteDepthOffset: float = 0.0
         self.relativeDepthOffset: float = 0.0
+        self._unitNormal: adsk.core.Vector3D = None
         
         self._extractGeometryFromBody()
         self._extractParametersFromAttributes()
+
+        self._totalDepthOffset: float = self.absoluteDepthOffset + (self.relativeDepthOffset * self.radius * 2)
     
     def _extractGeometryFromBody(self) -> None:
         """Extract geometric information (faces, planes, centroid) from the body."""
@@ -112,23 +120,35 @@ class GemstoneInfo:
             global _temporaryBRep
             tempBody = _temporaryBRep.copy(self.body)
 
-            # Find top face (largest planar face)
-            self.topFace = sorted(tempBody.faces, key=lambda x: x.area, reverse=True)[0]
+            # Find top face (largest planar face) and collect the cylindrical faces in one pass
+            topArea = -1.0
+            cylindricalFaces: list[tuple[adsk.fusion.BRepFace, adsk.core.Surface]] = []
+            for face in tempBody.faces:
+                area = face.area
+                if area > topArea:
+                    self.topFace = face
+                    topArea = area
+
+                geometry = face.geometry
+                if geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType:
+                    cylindricalFaces.append((face, geometry))
+
             self.topPlane = adsk.core.Plane.cast(self.topFace.geometry)
             
             # Find the cylindrical girdle face
             normal = self.topPlane.normal
-            for face in tempBody.faces:
-                if face.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType:
-                    tempCylinder = adsk.core.Cylinder.cast(face.geometry)
-                    cylinderAxis = tempCylinder.axis
-                    if cylinderAxis.isParallelTo(normal):
-                        self.cylindricalFace = face
-                        self.cylinder = tempCylinder
-                        self.centroid = face.centroid
-                        self.radius = tempCylinder.radius
-                        self.diameter = self.radius * 2
-                        break
+            self._unitNormal = normal.copy()
+            self._unitNormal.normalize()
+            for face, geometry in cylindricalFaces:
+                tempCylinder = adsk.core.Cylinder.cast(geometry)
+                cylinderAxis = tempCylinder.axis
+                if cylinderAxis.isParallelTo(normal):
+                    self.cylindricalFace = face
+                    self.cylinder = tempCylinder
+                    self.centroid = face.centroid
+                    self.radius = tempCylinder.radius
+                    self.diameter = self.radius * 2
+                    break
             
             # Fallback to bounding box if no cylindrical face found
             if self.cylindricalFace is None or self.cylinder is None:
@@ -147,6 +167,9 @@ class GemstoneInfo:
                 self.cylinder = FakeCylinder(radius)
                 self.radius = radius
 
+            # Plain floats let distance checks between gemstones skip the Point3D accessors.
+            self.centroidCoordinates = self.centroid.asArray()
+
             transformation = adsk.core.Matrix3D.create()
             transformation.setToAlignCoordinateSystems(
                 self.centroid, self.topPlane.uDirection, self.topPlane.vDirection, normal,
@@ -170,20 +193,21 @@ class GemstoneInfo:
                             for body in baseFeature.bodies:
                                 if body.entityToken == self.body.entityToken:
                                     # Found the matching feature, extract parameters
+                                    parameters = feature.parameters
                                     try:
-                                        flipParam = feature.parameters.itemById('flip')
+                                        flipParam = parameters.itemById('flip')
                                         self.flip = flipParam.expression.lower() == 'true' if flipParam else False
                                     except:
                                         self.flip = False
                                     
                                     try:
-                                        absoluteDepthOffsetParam = feature.parameters.itemById('absoluteDepthOffset')
+                                        absoluteDepthOffsetParam = parameters.itemById('absoluteDepthOffset')
                                         self.absoluteDepthOffset = absoluteDepthOffsetParam.value if absoluteDepthOffsetParam else 0.0
                                     except:
                                         self.absoluteDepthOffset = 0.0
                                     
                                     try:
-                                        relativeDepthOffsetParam = feature.parameters.itemById('relativeDepthOffset')
+                                        relativeDepthOffsetParam = parameters.itemById('relativeDepthOffset')
                                         self.relativeDepthOffset = relativeDepthOffsetParam.value if relativeDepthOffsetParam else 0.0
                                     except:
                                         self.relativeDepthOffset = 0.0
@@ -206,11 +230,10 @@ class GemstoneInfo:
     
     def getNormalizedNormal(self) -> adsk.core.Vector3D:
         """Get the normalized normal vector from topPlane, accounting for flip state."""
-        if self.topPlane is None:
+        if self._unitNormal is None:
             return None
         
-        normal = self.topPlane.normal.copy()
-        normal.normalize()
+        normal = self._unitNormal.copy()
         
         if self.flip:
             normal.scaleBy(-1)
@@ -219,7 +242,7 @@ class GemstoneInfo:
     
     def getTotalDepthOffset(self) -> float:
         """Get the total depth offset: absolute + relative (relative is multiplied by gemstone size)."""
-        return self.absoluteDepthOffset + (self.relativeDepthOffset * self.radius * 2)
+        return self._totalDepthOffset
 
 
 def extractGemstonesInfo(gemstones: list[adsk.fusion.BRepBody]) -> list[GemstoneInfo]:
@@ -256,16 +279,43 @@ def findValidConnections(gemstoneInfos: list[GemstoneInfo], maxGap: float) -> li
         List of tuples containing GemstoneInfo pairs that should be connected.
     """
     connections = []
-    
-    for i in range(len(gemstoneInfos)):
-        for j in range(i + 1, len(gemstoneInfos)):
-            info1 = gemstoneInfos[i]
+
+    count = len(gemstoneInfos)
+    if count < 2:
+        return connections
+
+    # Gemstones are binned into cells as wide as the longest possible connection,
+    # so only gemstones in neighbouring cells need to be compared.
+    cellSize = max(2 * max(info.radius for info in gemstoneInfos) + maxGap, 1e-6)
+    coordinates = [info.centroidCoordinates for info in gemstoneInfos]
+    cells: list[tuple[int, int, int]] = []
+    grid: dict[tuple[int, int, int], list[int]] = {}
+    for index, (x, y, z) in enumerate(coordinates):
+        cell = (math.floor(x / cellSize), math.floor(y / cellSize), math.floor(z / cellSize))
+        cells.append(cell)
+        grid.setdefault(cell, []).append(index)
+
+    neighbourOffsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+    for i in range(count):
+        cellX, cellY, cellZ = cells[i]
+        candidates = sorted(
+            j for dx, dy, dz in neighbourOffsets
+            for j in grid.get((cellX + dx, cellY + dy, cellZ + dz), ())
+            if j > i
+        )
+
+        info1 = gemstoneInfos[i]
+        x1, y1, z1 = coordinates[i]
+        radiusWithGap = info1.radius + maxGap
+        for j in candidates:
             info2 = gemstoneInfos[j]
+            x2, y2, z2 = coordinates[j]
             
-            distance = info1.centroid.distanceTo(info2.centroid)
-            maxAllowedDistance = info1.radius + maxGap + info2.radius
+            dx, dy, dz = x2 - x1, y2 - y1, z2 - z1
+            maxAllowedDistance = radiusWithGap + info2.radius
             
-            if distance <= maxAllowedDistance:
+            if dx * dx + dy * dy + dz * dz <= maxAllowedDistance * maxAllowedDistance:
                 connections.append((info1, info2))
     
     return connections
@@ -302,12 +352,16 @@ def createGemstone(face: adsk.fusion.BRepFace, point: adsk.core.Point3D, size: f
         if flipFaceNormal: normal.scaleBy(-1)
         
         filePath = os.path.join(constants.ASSETS_FOLDER, constants.GEMSTONE_ROUND_CUT + '.sat')
-        gemstone = temporaryBRep.createFromFile(filePath).item(0)
-        
-        cylindricalFace = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType, gemstone.faces))[0]
-        originPoint = cylindricalFace.centroid
+        template = _gemstoneTemplates.get(filePath)
+        if template is None:
+            templateBody = temporaryBRep.createFromFile(filePath).item(0)
+            cylindricalFace = next(face for face in templateBody.faces if face.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType)
+            girdleBox = cylindricalFace.boundingBox
+            template = (templateBody, cylindricalFace.centroid, abs(girdleBox.minPoint.z - girdleBox.maxPoint.z))
+            _gemstoneTemplates[filePath] = template
 
-        girdleThickness = abs(cylindricalFace.boundingBox.minPoint.z - cylindricalFace.boundingBox.maxPoint.z)
+        templateBody, originPoint, girdleThickness = template
+        gemstone = temporaryBRep.copy(templateBody)
 
 
         translate = normal.copy()
@@ -359,9 +413,9 @@ def updateGemstone(body: adsk.fusion.BRepBody, face: adsk.fusion.BRepFace, point
         temporaryBRep = adsk.fusion.TemporaryBRepManager.get()
         tempBody = temporaryBRep.copy(body)
 
-        topFace = sorted(tempBody.faces, key = lambda x: x.area, reverse = True)[0]
+        topFace = max(tempBody.faces, key = lambda x: x.area)
         topPlane = adsk.core.Plane.cast(topFace.geometry)
-        cylindricalFace = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType, tempBody.faces))[0]
+        cylindricalFace = next(face for face in tempBody.faces if face.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType)
         cylinder = adsk.core.Cylinder.cast(cylindricalFace.geometry)
         gridleCentroid = cylindricalFace.centroid
 
@@ -451,23 +505,25 @@ def updateGemstoneFeature(customFeature: adsk.fusion.CustomFeature):
     Args:
         customFeature: The custom feature containing the gemstone bodies.
     """
+    parameters = customFeature.parameters
+
     try:
-        flip = customFeature.parameters.itemById('flip').expression.lower() == 'true'
+        flip = parameters.itemById('flip').expression.lower() == 'true'
     except:
         flip = None
     
     try:
-        flipFaceNormal = customFeature.parameters.itemById('flipFaceNormal').expression.lower() == 'true'
+        flipFaceNormal = parameters.itemById('flipFaceNormal').expression.lower() == 'true'
     except:
         flipFaceNormal = None
     
     try:
-        absoluteDepthOffset = customFeature.parameters.itemById('absoluteDepthOffset').value
+        absoluteDepthOffset = parameters.itemById('absoluteDepthOffset').value
     except:
         absoluteDepthOffset = None
     
     try:
-        relativeDepthOffset = customFeature.parameters.itemById('relativeDepthOffset').value
+        relativeDepthOffset = parameters.itemById('relativeDepthOffset').value
     except:
         relativeDepthOffset = None
     
@@ -6,6 +6,7 @@ from .core import (
     TriangleMeshData,
     buildTriangleSamplingData,
     createFaceMesh,
+    getMeshDataCoordinates,
     getMeshDataPoints,
     getMeshDataTriangles,
     getMeshTriangles,
@@ -22,6 +23,7 @@ __all__ = [
     'buildTriangleSamplingData',
     'createAcvdTessellationResult',
     'createFaceMesh',
+    'getMeshDataCoordinates',
     'getMeshDataPoints',
     'getMeshDataTriangles',
     'getMeshTriangles',
@@ -20,10 +20,7 @@ TriangleIndices = tuple[int, int, int]
 
 def triangleMeshToMeshData(mesh: adsk.fusion.TriangleMesh) -> 'TriangleMeshData':
     """Convert a Fusion TriangleMesh to the internal flat mesh representation."""
-    coordinates: list[float] = []
-    for point in mesh.nodeCoordinates:
-        coordinates.extend([point.x, point.y, point.z])
-    return TriangleMeshData(coordinates, list(mesh.nodeIndices))
+    return TriangleMeshData(list(mesh.nodeCoordinatesAsDouble), list(mesh.nodeIndices))
 
 
 def createFaceMesh(
@@ -60,6 +57,16 @@ def getMeshDataPoints(meshData: TriangleMeshData | None) -> list[adsk.core.Point
     return points
 
 
+def getMeshDataCoordinates(meshData: TriangleMeshData | None) -> list[tuple[float, float, float]]:
+    """Group flat mesh coordinates into (x, y, z) tuples without creating point objects."""
+    if meshData is None:
+        return []
+
+    coordinates, _ = meshData
+    usableLength = len(coordinates) - len(coordinates) % 3
+    return list(zip(coordinates[0:usableLength:3], coordinates[1:usableLength:3], coordinates[2:usableLength:3]))
+
+
 def getTriangleIndicesFromMeshData(meshData: TriangleMeshData | None) -> list[TriangleIndices]:
     """Convert flat mesh indices to triangle tuples."""
     if meshData is None:
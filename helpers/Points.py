@@ -2,18 +2,13 @@ import adsk.core, adsk.fusion
 import math
 
 
-def findClosestPointIndex(targetPoint: adsk.core.Point3D, points: list[adsk.core.Point3D]) -> int:
-    """Find index of the closest point to targetPoint in the points list."""
-    if not points:
+def findClosestCoordinateIndex(targetPoint: adsk.core.Point3D, coordinates: list[tuple[float, float, float]]) -> int:
+    """Find index of the closest (x, y, z) coordinate tuple to targetPoint."""
+    if not coordinates:
         return 0
-    minimumDistance = float('inf')
-    closestIndex = 0
-    for index, point in enumerate(points):
-        distance = targetPoint.distanceTo(point)
-        if distance < minimumDistance:
-            minimumDistance = distance
-            closestIndex = index
-    return closestIndex
+    target = targetPoint.asArray()
+    distance = math.dist
+    return min(range(len(coordinates)), key=lambda index: distance(target, coordinates[index]))
 
 
 def minDistanceToPoints(point: adsk.core.Point3D, points: list[adsk.core.Point3D]) -> float:
@@ -336,22 +331,22 @@ def getPolygonCentroid(points: list[adsk.core.Point3D]) -> adsk.core.Point3D:
     )
 
 
-def trianglesOverlap(triangle1Points: tuple[adsk.core.Point2D, adsk.core.Point2D, adsk.core.Point2D], 
-                     triangle2Points: tuple[adsk.core.Point2D, adsk.core.Point2D, adsk.core.Point2D]) -> bool:
+def trianglesOverlap(triangle1Points: tuple[tuple[float, float], tuple[float, float], tuple[float, float]], 
+                     triangle2Points: tuple[tuple[float, float], tuple[float, float], tuple[float, float]]) -> bool:
     """
-    Check if two triangles overlap in 2D space.
+    Check if two triangles given as (x, y) tuples overlap in 2D space.
     
     Uses SAT (Separating Axis Theorem) to detect overlap.
     """
     def projectTriangleOnAxis(triangle: tuple, axis: tuple[float, float]) -> tuple[float, float]:
         projections = [
-            p.x * axis[0] + p.y * axis[1] for p in triangle
+            p[0] * axis[0] + p[1] * axis[1] for p in triangle
         ]
         return min(projections), max(projections)
     
-    def axisFromEdge(p1: adsk.core.Point2D, p2: adsk.core.Point2D) -> tuple[float, float]:
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
+    def axisFromEdge(p1: tuple[float, float], p2: tuple[float, float]) -> tuple[float, float]:
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
         length = math.sqrt(dx * dx + dy * dy)
         if length < 1e-9:
             return 1.0, 0.0
@@ -7,10 +7,12 @@ from .. import constants
 
 from .showMessage import showMessage
 from .Gemstones import GemstoneInfo
-from .Bodies import placeBody
 from .Vectors import averageVector
 from .Points import averagePosition
 
+_temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
+
+
 class ProngInfo:
     """Class to store all information needed to create or update a single prong.
     
@@ -33,26 +35,36 @@ class ProngInfo:
         self.height = height
 
 
-def createProng(size: float, height: float) -> adsk.fusion.BRepBody | None:
-    """Creates a prong body geometry at the origin without positioning.
-    
-    Returns the prong as a BRepBody with specified size and height.
-    
+def createProngAt(size: float, height: float, originPoint: adsk.core.Point3D, normal: adsk.core.Vector3D) -> adsk.fusion.BRepBody | None:
+    """Creates a prong body directly in its target position.
+
+    The prong is round, so the origin and the normal are enough to build it in place
+    instead of creating it at the origin and transforming it afterwards.
+
     Args:
         size: The diameter of the prong base
         height: The height of the prong
-        
+        originPoint: The center of the prong
+        normal: The unit direction of the prong height
+
     Returns:
         The created prong body or None if creation failed
     """
     try:
-        temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
+        temporaryBRep = _temporaryBRep
         bodies = []
 
         radius = size / 2
 
-        bottomPoint = adsk.core.Point3D.create(0, 0, -height)
-        topPoint = adsk.core.Point3D.create(0, 0, height)
+        heightVector = normal.copy()
+        heightVector.scaleBy(height)
+
+        topPoint = originPoint.copy()
+        topPoint.translateBy(heightVector)
+
+        heightVector.scaleBy(-1)
+        bottomPoint = originPoint.copy()
+        bottomPoint.translateBy(heightVector)
 
         bodies.append(temporaryBRep.createCylinderOrCone(topPoint, radius, bottomPoint, radius))
 
@@ -66,78 +78,102 @@ def createProng(size: float, height: float) -> adsk.fusion.BRepBody | None:
         return prong
 
     except:
-        showMessage(f'createProng: {traceback.format_exc()}\n', True)
+        showMessage(f'createProngAt: {traceback.format_exc()}\n', True)
         return None
 
 
-def updateProngAndNormalize(body: adsk.fusion.BRepBody, size: float, height: float) -> adsk.fusion.BRepBody | None:
-    """Updates a prong body to new size and places it at the origin coordinate system.
-    
-    Returns the updated prong as a BRepBody positioned at constants.zeroPoint with the specified size and height.
-    
+def updateProngAt(body: adsk.fusion.BRepBody, size: float, height: float, newOriginPoint: adsk.core.Point3D,
+                  newLengthDirection: adsk.core.Vector3D, newWidthDirection: adsk.core.Vector3D,
+                  newNormal: adsk.core.Vector3D) -> adsk.fusion.BRepBody | None:
+    """Updates a prong body to new size and moves it to a new coordinate system in one transform.
+
     Args:
         body: The existing prong body to update
         size: The new diameter of the prong base
         height: The new height of the prong
-        
+        newOriginPoint: The new origin point for the prong
+        newLengthDirection: The new length direction vector
+        newWidthDirection: The new width direction vector
+        newNormal: The new normal direction vector
+
     Returns:
-        The updated prong body positioned at origin or None if update failed
+        The updated and placed prong body or None if update failed
     """
     try:
         if body is None: return None
 
-        temporaryBRep = adsk.fusion.TemporaryBRepManager.get()
-        tempBody = temporaryBRep.copy(body)
+        tempBody = _temporaryBRep.copy(body)
 
-        planarFaces = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.PlaneSurfaceType, tempBody.faces))
-        cylindricalFaces = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType, tempBody.faces))
-        
-        # Validate that required faces exist
-        if not cylindricalFaces or len(planarFaces) < 2:
-            showMessage(f'updateProngAndNormalize: Body geometry corrupted - found {len(cylindricalFaces)} cylindrical faces and {len(planarFaces)} planar faces\n', True)
-            return None
-        
-        cylindricalFace = cylindricalFaces[0]
+        transformation = getProngNormalizeTransform(tempBody, size, height)
+        if transformation is None: return None
 
-        plane = adsk.core.Plane.cast(planarFaces[0].geometry)
-        cylinder = adsk.core.Cylinder.cast(cylindricalFace.geometry)
-        oldOriginPoint = cylindricalFace.centroid
+        placement = adsk.core.Matrix3D.create()
+        placement.setWithCoordinateSystem(newOriginPoint, newLengthDirection, newWidthDirection, newNormal)
+        transformation.transformBy(placement)
 
-        oldHeight = planarFaces[0].centroid.distanceTo(planarFaces[1].centroid) / 2
-        oldSize = cylinder.radius * 2
+        _temporaryBRep.transform(tempBody, transformation)
 
-        sizeScale = size / oldSize
-        heightScale = height / oldHeight
-
-        oldNormal = plane.normal
-        oldLengthDirection = plane.uDirection
-        oldWidthDirection = plane.vDirection
+        return tempBody
 
-        transformation = adsk.core.Matrix3D.create()
+    except:
+        showMessage(f'updateProngAt: {traceback.format_exc()}\n', True)
+        return None
 
-        transformation.setToAlignCoordinateSystems(
-            oldOriginPoint, oldLengthDirection, oldWidthDirection, oldNormal,
-            constants.zeroPoint, constants.xVector, constants.yVector, constants.zVector
-            )
-        temporaryBRep.transform(tempBody, transformation)
 
-        # Create scaled coordinate vectors more efficiently
-        scaledXVector = adsk.core.Vector3D.create(sizeScale, 0, 0)
-        scaledYVector = adsk.core.Vector3D.create(0, sizeScale, 0)
-        scaledZVector = adsk.core.Vector3D.create(0, 0, heightScale)
+def getProngNormalizeTransform(body: adsk.fusion.BRepBody, size: float, height: float) -> adsk.core.Matrix3D | None:
+    """Builds the transform that moves a prong body to the origin and rescales it to a new size and height.
 
-        transformation.setToIdentity()
-        transformation.setToAlignCoordinateSystems(
-            constants.zeroPoint, constants.xVector, constants.yVector, constants.zVector,
-            constants.zeroPoint, scaledXVector, scaledYVector, scaledZVector
-            )
-        temporaryBRep.transform(tempBody, transformation)
+    Args:
+        body: The prong body to measure
+        size: The new diameter of the prong base
+        height: The new height of the prong
 
-        return tempBody
+    Returns:
+        The combined normalize and scale transform or None if the body geometry is corrupted
+    """
+    planarFaces = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.PlaneSurfaceType, body.faces))
+    cylindricalFaces = list(filter(lambda x: x.geometry.surfaceType == adsk.core.SurfaceTypes.CylinderSurfaceType, body.faces))
     
-    except:
-        showMessage(f'updateProngAndNormalize: {traceback.format_exc()}\n', True)
+    # Validate that required faces exist
+    if not cylindricalFaces or len(planarFaces) < 2:
+        showMessage(f'getProngNormalizeTransform: Body geometry corrupted - found {len(cylindricalFaces)} cylindrical faces and {len(planarFaces)} planar faces\n', True)
         return None
+    
+    cylindricalFace = cylindricalFaces[0]
+
+    plane = adsk.core.Plane.cast(planarFaces[0].geometry)
+    cylinder = adsk.core.Cylinder.cast(cylindricalFace.geometry)
+    oldOriginPoint = cylindricalFace.centroid
+
+    oldHeight = planarFaces[0].centroid.distanceTo(planarFaces[1].centroid) / 2
+    oldSize = cylinder.radius * 2
+
+    sizeScale = size / oldSize
+    heightScale = height / oldHeight
+
+    oldNormal = plane.normal
+    oldLengthDirection = plane.uDirection
+    oldWidthDirection = plane.vDirection
+
+    transformation = adsk.core.Matrix3D.create()
+    transformation.setToAlignCoordinateSystems(
+        oldOriginPoint, oldLengthDirection, oldWidthDirection, oldNormal,
+        constants.zeroPoint, constants.xVector, constants.yVector, constants.zVector
+        )
+
+    # Create scaled coordinate vectors more efficiently
+    scaledXVector = adsk.core.Vector3D.create(sizeScale, 0, 0)
+    scaledYVector = adsk.core.Vector3D.create(0, sizeScale, 0)
+    scaledZVector = adsk.core.Vector3D.create(0, 0, heightScale)
+
+    scale = adsk.core.Matrix3D.create()
+    scale.setToAlignCoordinateSystems(
+        constants.zeroPoint, constants.xVector, constants.yVector, constants.zVector,
+        constants.zeroPoint, scaledXVector, scaledYVector, scaledZVector
+        )
+    transformation.transformBy(scale)
+
+    return transformation
 
 
 def createProngFromInfo(prongInfo: ProngInfo) -> adsk.fusion.BRepBody | None:
@@ -150,15 +186,8 @@ def createProngFromInfo(prongInfo: ProngInfo) -> adsk.fusion.BRepBody | None:
         Created prong body or None if creation failed.
     """
     try:
-        # Create the prong geometry at the origin
-        prong = createProng(prongInfo.size, prongInfo.height)
-        if prong is None:
-            return None
-        
-        # Place the prong at the specified position with proper orientation
-        placeBody(prong, prongInfo.position, prongInfo.lengthDirection, prongInfo.widthDirection, prongInfo.normal)
-        
-        return prong
+        # Build the prong geometry directly at the specified position
+        return createProngAt(prongInfo.size, prongInfo.height, prongInfo.position, prongInfo.normal)
     
     except:
         showMessage(f'createProngFromInfo: {traceback.format_exc()}\n', True)
@@ -176,17 +205,13 @@ def updateProngFromInfo(body: adsk.fusion.BRepBody, prongInfo: ProngInfo) -> ads
         Updated prong body or None if update failed.
     """
     try:
-        # First try to update the existing body
-        tempBody = updateProngAndNormalize(body, prongInfo.size, prongInfo.height)
+        # First try to update the existing body, rescaling and placing it in one transform
+        tempBody = updateProngAt(body, prongInfo.size, prongInfo.height, prongInfo.position,
+                                 prongInfo.lengthDirection, prongInfo.widthDirection, prongInfo.normal)
         
         # If update failed (body geometry corrupted), create a fresh prong instead
         if tempBody is None:
-            tempBody = createProng(prongInfo.size, prongInfo.height)
-            if tempBody is None:
-                return None
-        
-        # Place the prong at the specified position with proper orientation
-        placeBody(tempBody, prongInfo.position, prongInfo.lengthDirection, prongInfo.widthDirection, prongInfo.normal)
+            tempBody = createProngAt(prongInfo.size, prongInfo.height, prongInfo.position, prongInfo.normal)
         
         return tempBody
     
@@ -326,11 +351,9 @@ def computeChainCurvatureRatio(info1: GemstoneInfo, info2: GemstoneInfo, neighbo
         if not extraCentroids:
             return 0.0
 
-        chordMidpoint = adsk.core.Point3D.create(
-            (info1.centroid.x + info2.centroid.x) * 0.5,
-            (info1.centroid.y + info2.centroid.y) * 0.5,
-            (info1.centroid.z + info2.centroid.z) * 0.5
-        )
+        x1, y1, z1 = info1.centroidCoordinates
+        x2, y2, z2 = info2.centroidCoordinates
+        chordMidpoint = adsk.core.Point3D.create((x1 + x2) * 0.5, (y1 + y2) * 0.5, (z1 + z2) * 0.5)
         neighborsCentroid = averagePosition(extraCentroids)
         curvatureVector = adsk.core.Vector3D.create(
             neighborsCentroid.x - chordMidpoint.x,
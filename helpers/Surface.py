@@ -1,14 +1,16 @@
 import math
 import json
 import traceback
-from typing import List, Dict, Tuple, Set
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Tuple, Set
 import adsk.core
 import adsk.fusion
 from .. import constants
 from .showMessage import showMessage
-from .Meshes.core import createFaceMesh, getMeshDataPoints, getTriangleIndicesFromMeshData
+from .Meshes.core import createFaceMesh, getMeshDataPoints, getMeshDataCoordinates, getTriangleIndicesFromMeshData
 from .Meshes import isotropic as meshIsotropic
-from .Points import point3dToStr, strToPoint3d, averagePosition, findClosestPointIndex, triangleArea, isPointInTriangle, trianglesOverlap, toPlaneSpace, projectToPlane
+from .Points import point3dToStr, strToPoint3d, averagePosition, findClosestCoordinateIndex, triangleArea, isPointInTriangle, trianglesOverlap, toPlaneSpace, projectToPlane
 from .Vectors import vector3dToStr, strToVector3d, averageVector
 
 
@@ -41,6 +43,35 @@ def getClosestFace(faces: list[adsk.fusion.BRepFace], point: adsk.core.Point3D)
     return closestFace
 
 
+@dataclass
+class FaceContext:
+    """Face-derived data that stays constant while evaluating many points on one support."""
+
+    face: adsk.fusion.BRepFace | adsk.fusion.ConstructionPlane
+    evaluator: adsk.core.SurfaceEvaluator
+    planeOrigin: adsk.core.Point3D | None = None
+    planeNormal: adsk.core.Vector3D | None = None
+
+
+def getFaceContext(face: adsk.fusion.BRepFace | adsk.fusion.ConstructionPlane) -> FaceContext | None:
+    """Query the evaluator and plane frame of a face or construction plane once.
+
+    Args:
+        face: The BRepFace or ConstructionPlane to evaluate
+
+    Returns:
+        The face context, or None if no face is given.
+    """
+    if face is None:
+        return None
+
+    if face.objectType == adsk.fusion.ConstructionPlane.classType():
+        plane = face.geometry
+        return FaceContext(face, plane.evaluator, plane.origin, plane.normal)
+
+    return FaceContext(face, face.evaluator)
+
+
 def getDataFromPointAndFace(face: adsk.fusion.BRepFace | adsk.fusion.ConstructionPlane, point: adsk.core.Point3D) -> tuple[adsk.core.Point3D, adsk.core.Vector3D, adsk.core.Vector3D, adsk.core.Vector3D]:
     """Get the surface point and orientation vectors (normal, length direction, width direction) at a given point on a face or construction plane.
 
@@ -65,17 +96,29 @@ def getDataFromPointAndFace(face: adsk.fusion.BRepFace | adsk.fusion.Constructio
 
     Returns (None, None, None, None) if evaluation fails.
     """
+    if face is None or point is None:
+        return None, None, None, None
+
+    return getDataFromPointAndFaceContext(getFaceContext(face), point)
+
+
+def getDataFromPointAndFaceContext(faceContext: FaceContext, point: adsk.core.Point3D) -> tuple[adsk.core.Point3D, adsk.core.Vector3D, adsk.core.Vector3D, adsk.core.Vector3D]:
+    """Same as getDataFromPointAndFace, but reuses a precomputed face context.
+
+    Args:
+        faceContext: The context returned by getFaceContext
+        point: The 3D point to project onto the face or construction plane
+
+    Returns:
+        The same tuple as getDataFromPointAndFace.
+    """
     try:
-        if face is None or point is None:
+        if faceContext is None or point is None:
             return None, None, None, None
-        
-        if face.objectType == adsk.fusion.ConstructionPlane.classType():
-            constructionPlane: adsk.fusion.ConstructionPlane = face
-            point = projectToPlane(point, constructionPlane)
-            evaluator = constructionPlane.geometry.evaluator
-        else:
-            brepFace: adsk.fusion.BRepFace = face
-            evaluator = brepFace.evaluator
+
+        point = projectToFaceContextPlane(faceContext, point)
+
+        evaluator = faceContext.evaluator
 
         _, parameter = evaluator.getParameterAtPoint(point)
         _, pointOnFace = evaluator.getPointAtParameter(parameter)
@@ -95,6 +138,80 @@ def getDataFromPointAndFace(face: adsk.fusion.BRepFace | adsk.fusion.Constructio
         return None, None, None, None
 
 
+def getDataFromPointsAndFaceContext(faceContext: FaceContext, points: list[adsk.core.Point3D]) -> list[tuple[adsk.core.Point3D, adsk.core.Vector3D, adsk.core.Vector3D, adsk.core.Vector3D]] | None:
+    """Batched getDataFromPointAndFaceContext for many points on the same face.
+
+    Uses the array variants of the surface evaluator, so the face is queried a fixed number
+    of times regardless of the number of points.
+
+    Args:
+        faceContext: The context returned by getFaceContext
+        points: The 3D points to project onto the face or construction plane
+
+    Returns:
+        One (pointOnFace, lengthDirection, widthDirection, normal) tuple per point,
+        or None if evaluation fails.
+    """
+    try:
+        if faceContext is None or any(point is None for point in points):
+            return None
+
+        if len(points) == 0:
+            return []
+
+        points = [projectToFaceContextPlane(faceContext, point) for point in points]
+
+        evaluator = faceContext.evaluator
+
+        isOk, parameters = evaluator.getParametersAtPoints(points)
+        if not isOk: return None
+        isOk, pointsOnFace = evaluator.getPointsAtParameters(parameters)
+        if not isOk: return None
+        isOk, normals = evaluator.getNormalsAtParameters(parameters)
+        if not isOk: return None
+        isOk, lengthDirections, _ = evaluator.getFirstDerivatives(parameters)
+        if not isOk: return None
+
+        data = []
+        for pointOnFace, lengthDirection, normal in zip(pointsOnFace, lengthDirections, normals):
+            widthDirection = normal.crossProduct(lengthDirection)
+
+            lengthDirection.normalize()
+            widthDirection.normalize()
+            normal.normalize()
+
+            data.append((pointOnFace, lengthDirection, widthDirection, normal))
+
+        return data
+
+    except:
+        showMessage(f'getDataFromPointsAndFaceContext: {traceback.format_exc()}\n', True)
+        return None
+
+
+def projectToFaceContextPlane(faceContext: FaceContext, point: adsk.core.Point3D) -> adsk.core.Point3D:
+    """Project a point onto the construction plane of a face context.
+
+    Args:
+        faceContext: The context returned by getFaceContext
+        point: The 3D point to project
+
+    Returns:
+        The projected point, or the point itself when the context is not a construction plane.
+    """
+    if faceContext.planeNormal is None:
+        return point
+
+    normal = faceContext.planeNormal
+    distance = faceContext.planeOrigin.vectorTo(point).dotProduct(normal)
+    translation = normal.copy()
+    translation.scaleBy(-distance)
+    point = point.copy()
+    point.translateBy(translation)
+
+    return point
+
+
 def snapPointToFaces(faces: list[adsk.fusion.BRepFace], point: adsk.core.Point3D) -> adsk.core.Point3D | None:
     """Project a point onto the closest face and return the projected point.
 
@@ -116,26 +233,26 @@ def snapPointToFaces(faces: list[adsk.fusion.BRepFace], point: adsk.core.Point3D
     return projected
 
 
-def calculateThirdPointOrdered(pointStart: adsk.core.Point2D, pointEnd: adsk.core.Point2D, 
+def calculateThirdPointOrdered(pointStart: Tuple[float, float], pointEnd: Tuple[float, float], 
                                distanceStart: float, distanceEnd: float, 
-                               minHeight: float = 0.01) -> adsk.core.Point2D:
+                               minHeight: float = 0.01) -> Tuple[float, float]:
     """
     Calculate the position of the third point of a triangle given two points and distances.
     
     Args:
-        pointStart: First point of the edge
-        pointEnd: Second point of the edge
+        pointStart: First point of the edge as (x, y)
+        pointEnd: Second point of the edge as (x, y)
         distanceStart: Distance from pointStart to the third point
         distanceEnd: Distance from pointEnd to the third point
         minHeight: Minimum height to prevent degenerate triangles
         
     Returns:
-        Position of the third point
+        Position of the third point as (x, y)
     """
-    x1, y1 = pointStart.x, pointStart.y
-    x2, y2 = pointEnd.x, pointEnd.y
+    x1, y1 = pointStart
+    x2, y2 = pointEnd
     
-    distance = pointStart.distanceTo(pointEnd)
+    distance = math.hypot(x2 - x1, y2 - y1)
     
     if distance == 0:
         return pointStart
@@ -152,30 +269,31 @@ def calculateThirdPointOrdered(pointStart: adsk.core.Point2D, pointEnd: adsk.cor
     x2Proj = x1 + a * dx / distance
     y2Proj = y1 + a * dy / distance
     
-    return adsk.core.Point2D.create(x2Proj - h * dy / distance, y2Proj + h * dx / distance)
+    return (x2Proj - h * dy / distance, y2Proj + h * dx / distance)
 
 
 def calculateThirdPointWithCollisionCheck(
-    pointStart: adsk.core.Point2D, 
-    pointEnd: adsk.core.Point2D, 
+    pointStart: Tuple[float, float], 
+    pointEnd: Tuple[float, float], 
     distanceStart: float, 
     distanceEnd: float,
-    positions2D: Dict[int, adsk.core.Point2D],
+    positions2D: Dict[int, Tuple[float, float]],
     triangles: List[List[int]],
     visitedTriangles: Set[int],
     edgeToTriangles: Dict[Tuple[int, int], List[int]],
     u: int,
     v: int
-) -> adsk.core.Point2D:
+) -> Tuple[float, float]:
     """
     Calculate third point position, choosing the side that doesn't cause overlaps with triangles sharing the edge.
     
     Checks if the new triangle would overlap with triangles that share the edge (pointStart, pointEnd).
+    Points are (x, y) tuples.
     """
-    x1, y1 = pointStart.x, pointStart.y
-    x2, y2 = pointEnd.x, pointEnd.y
+    x1, y1 = pointStart
+    x2, y2 = pointEnd
     
-    distance = pointStart.distanceTo(pointEnd)
+    distance = math.hypot(x2 - x1, y2 - y1)
     
     if distance == 0:
         return pointStart
@@ -188,14 +306,14 @@ def calculateThirdPointWithCollisionCheck(
     x2Proj = x1 + a * dx / distance
     y2Proj = y1 + a * dy / distance
     
-    point1 = adsk.core.Point2D.create(x2Proj - h * dy / distance, y2Proj + h * dx / distance)
-    point2 = adsk.core.Point2D.create(x2Proj + h * dy / distance, y2Proj - h * dx / distance)
+    point1 = (x2Proj - h * dy / distance, y2Proj + h * dx / distance)
+    point2 = (x2Proj + h * dy / distance, y2Proj - h * dx / distance)
     
     newTriangle1 = (pointStart, pointEnd, point1)
     newTriangle2 = (pointStart, pointEnd, point2)
     
     # Find triangles that share the edge (u, v)
-    edge = tuple(sorted((u, v)))
+    edge = (u, v) if u < v else (v, u)
     neighborTriangles = edgeToTriangles.get(edge, [])
     
     overlaps1 = 0
@@ -228,25 +346,27 @@ def calculateThirdPointWithCollisionCheck(
 def buildEdgeToTrianglesMap(triangles: List[List[int]]) -> Dict[Tuple[int, int], List[int]]:
     """Build adjacency map from edges to triangle indices."""
     edgeToTriangles = {}
-    for triangleIndex, triangle in enumerate(triangles):
-        for index in range(3):
-            edge = tuple(sorted((triangle[index], triangle[(index + 1) % 3])))
+    for triangleIndex, (index0, index1, index2) in enumerate(triangles):
+        for indexA, indexB in ((index0, index1), (index1, index2), (index2, index0)):
+            edge = (indexA, indexB) if indexA < indexB else (indexB, indexA)
             edgeToTriangles.setdefault(edge, []).append(triangleIndex)
     return edgeToTriangles
 
 
 def unfoldTrianglesToPositions2D(
     triangles: List[List[int]], 
-    points3D: List[adsk.core.Point3D], 
+    coordinates3D: List[Tuple[float, float, float]], 
     originIndex: int,
     edgeToTriangles: Dict[Tuple[int, int], List[int]],
-) -> Tuple[Dict[int, adsk.core.Point2D], Set[int]]:
+) -> Tuple[Dict[int, Tuple[float, float]], Set[int]]:
     """
     Unfold triangles to 2D positions using BFS traversal.
+
+    Works on plain coordinate tuples only, so the traversal makes no API calls.
     
     Args:
         triangles: List of triangles, each triangle is a list of 3 vertex indices.
-        points3D: List of 3D points.
+        coordinates3D: List of 3D point coordinates as (x, y, z).
         originIndex: Index of the origin point (will be at 0,0).
         edgeToTriangles: Map from edge to triangle indices.
         relaxationIterations: Number of relaxation iterations.
@@ -256,7 +376,7 @@ def unfoldTrianglesToPositions2D(
     
     positions2D = {}
     visitedTriangles = {startTriangle}
-    queue = [startTriangle]
+    queue = deque([startTriangle])
     
     triangleNodes = triangles[startTriangle]
     if originIndex in triangleNodes:
@@ -266,21 +386,23 @@ def unfoldTrianglesToPositions2D(
     else:
         index0, index1, index2 = triangleNodes[0], triangleNodes[1], triangleNodes[2]
     
-    point0_3D, point1_3D, point2_3D = points3D[index0], points3D[index1], points3D[index2]
+    distance = math.dist
+
+    point0_3D, point1_3D, point2_3D = coordinates3D[index0], coordinates3D[index1], coordinates3D[index2]
     
-    positions2D[index0] = adsk.core.Point2D.create(0, 0)
-    positions2D[index1] = adsk.core.Point2D.create(point0_3D.distanceTo(point1_3D), 0)
+    positions2D[index0] = (0.0, 0.0)
+    positions2D[index1] = (distance(point0_3D, point1_3D), 0.0)
     positions2D[index2] = calculateThirdPointOrdered(
         positions2D[index0], positions2D[index1], 
-        point0_3D.distanceTo(point2_3D), point1_3D.distanceTo(point2_3D)
+        distance(point0_3D, point2_3D), distance(point1_3D, point2_3D)
     )
     
     while queue:
-        currentTriangle = triangles[queue.pop(0)]
+        currentTriangle = triangles[queue.popleft()]
         
         for index in range(3):
             u, v = currentTriangle[index], currentTriangle[(index + 1) % 3]
-            edgeKey = tuple(sorted((u, v)))
+            edgeKey = (u, v) if u < v else (v, u)
             
             for nextTriangleIndex in edgeToTriangles.get(edgeKey, []):
                 if nextTriangleIndex in visitedTriangles:
@@ -299,20 +421,21 @@ def unfoldTrianglesToPositions2D(
                 
                 if (indexU + 1) % 3 == indexV:
                     pointStart, pointEnd = positions2D[u], positions2D[v]
-                    pointStart3D, pointEnd3D = points3D[u], points3D[v]
+                    pointStart3D, pointEnd3D = coordinates3D[u], coordinates3D[v]
                 else:
                     pointStart, pointEnd = positions2D[v], positions2D[u]
-                    pointStart3D, pointEnd3D = points3D[v], points3D[u]
+                    pointStart3D, pointEnd3D = coordinates3D[v], coordinates3D[u]
 
+                pointW3D = coordinates3D[w]
                 positions2D[w] = calculateThirdPointWithCollisionCheck(
                     pointStart, pointEnd,
-                    pointStart3D.distanceTo(points3D[w]),
-                    pointEnd3D.distanceTo(points3D[w]),
+                    distance(pointStart3D, pointW3D),
+                    distance(pointEnd3D, pointW3D),
                     positions2D, triangles, visitedTriangles, edgeToTriangles, u, v
                 )
     
     positions2D = edgeLengthRelaxation(
-        positions2D, triangles, points3D, visitedTriangles, originIndex,
+        positions2D, triangles, coordinates3D, visitedTriangles, originIndex,
         iterations=100, stiffness=0.3
     )
 
@@ -320,33 +443,42 @@ def unfoldTrianglesToPositions2D(
 
 
 def edgeLengthRelaxation(
-    positions2D: Dict[int, adsk.core.Point2D],
+    positions2D: Dict[int, Tuple[float, float]],
     triangles: List[List[int]],
-    points3D: List[adsk.core.Point3D],
+    coordinates3D: List[Tuple[float, float, float]],
     visitedTriangles: Set[int],
     fixedIndex: int,
     iterations: int = 50,
     stiffness: float = 0.5
-) -> Dict[int, adsk.core.Point2D]:
+) -> Dict[int, Tuple[float, float]]:
     """
     Apply edge-length preserving relaxation to all mesh vertices.
     
     Args:
-        positions2D: 2D positions of vertices.
+        positions2D: 2D positions of vertices as (x, y).
         triangles: List of triangles.
-        points3D: Original 3D positions for target edge lengths.
+        coordinates3D: Original 3D coordinates as (x, y, z) for target edge lengths.
         visitedTriangles: Set of valid triangle indices.
         fixedIndex: Index of vertex to keep fixed (origin).
         iterations: Number of relaxation iterations.
         stiffness: Correction factor per iteration (0-1).
         
     Returns:
-        Dictionary of relaxed 2D positions.
+        Dictionary of relaxed 2D positions as (x, y).
     """
     if not positions2D:
         return positions2D
     
-    edges: List[Tuple[int, int, float]] = []
+    # The loop below runs iterations * edges times, so it works on plain floats in flat lists
+    # and the per-edge weights are resolved up front.
+    pointCount = max(len(coordinates3D), max(positions2D) + 1)
+    posX = [0.0] * pointCount
+    posY = [0.0] * pointCount
+    for idx, (x, y) in positions2D.items():
+        posX[idx] = x
+        posY[idx] = y
+    
+    edges: List[Tuple[int, int, float, float, float]] = []
     seenEdges: Set[Tuple[int, int]] = set()
     
     for triangleIndex in visitedTriangles:
@@ -360,45 +492,39 @@ def edgeLengthRelaxation(
                 continue
             
             if indexA in positions2D and indexB in positions2D:
-                targetLength = points3D[indexA].distanceTo(points3D[indexB])
-                edges.append((indexA, indexB, targetLength))
                 seenEdges.add((indexA, indexB))
+
+                weightA = 0.0 if indexA == fixedIndex else 1.0
+                weightB = 0.0 if indexB == fixedIndex else 1.0
+                weightTotal = weightA + weightB
+                if weightTotal == 0:
+                    continue
+
+                xA, yA, zA = coordinates3D[indexA]
+                xB, yB, zB = coordinates3D[indexB]
+                targetLength = math.sqrt((xB - xA) ** 2 + (yB - yA) ** 2 + (zB - zA) ** 2)
+                edges.append((indexA, indexB, targetLength, weightA / weightTotal, weightB / weightTotal))
     
-    posX = {idx: pos.x for idx, pos in positions2D.items()}
-    posY = {idx: pos.y for idx, pos in positions2D.items()}
-    
+    sqrt = math.sqrt
     for _ in range(iterations):
-        for indexA, indexB, targetLength in edges:
-            x1, y1 = posX[indexA], posY[indexA]
-            x2, y2 = posX[indexB], posY[indexB]
-            
-            dx = x2 - x1
-            dy = y2 - y1
-            currentLength = math.sqrt(dx * dx + dy * dy)
+        for indexA, indexB, targetLength, ratioA, ratioB in edges:
+            dx = posX[indexB] - posX[indexA]
+            dy = posY[indexB] - posY[indexA]
+            currentLength = sqrt(dx * dx + dy * dy)
             
             if currentLength < 1e-9:
                 continue
             
-            error = currentLength - targetLength
-            correction = error * stiffness / currentLength
-            
+            correction = (currentLength - targetLength) * stiffness / currentLength
             correctionX = dx * correction
             correctionY = dy * correction
             
-            weightA = 0.0 if indexA == fixedIndex else 1.0
-            weightB = 0.0 if indexB == fixedIndex else 1.0
-            weightTotal = weightA + weightB
-            
-            if weightTotal > 0:
-                ratioA = weightA / weightTotal
-                ratioB = weightB / weightTotal
-                
-                posX[indexA] += correctionX * ratioA
-                posY[indexA] += correctionY * ratioA
-                posX[indexB] -= correctionX * ratioB
-                posY[indexB] -= correctionY * ratioB
+            posX[indexA] += correctionX * ratioA
+            posY[indexA] += correctionY * ratioA
+            posX[indexB] -= correctionX * ratioB
+            posY[indexB] -= correctionY * ratioB
     
-    result = {idx: adsk.core.Point2D.create(posX[idx], posY[idx]) for idx in positions2D}
+    result = {idx: (posX[idx], posY[idx]) for idx in positions2D}
     return result
 
 
@@ -565,7 +691,7 @@ def interpolateDataInPointTriangles(
 
 
 def preprocess(
-    positions2D: Dict[int, adsk.core.Point2D],
+    positions2D: Dict[int, Tuple[float, float]],
     xDirectionIndex: int = None,
     yDirectionIndex: int = None,
     points3D: List[adsk.core.Point3D] = None,
@@ -578,7 +704,7 @@ def preprocess(
     """Apply rotation to align xDirectionIndex with X axis and transform to 3D construction plane coordinates.
     
     Args:
-        positions2D: Dictionary mapping point indices to 2D positions.
+        positions2D: Dictionary mapping point indices to 2D positions as (x, y).
         xDirectionIndex: Index of the point defining X direction.
         yDirectionIndex: Index of the point defining Y direction.
         points3D: Optional list of 3D points for attribute generation.
@@ -594,12 +720,12 @@ def preprocess(
     rotationAngle = 0.0
     reflectX = False
     if xDirectionIndex is not None and xDirectionIndex in positions2D:
-        xDirectionPosition = positions2D[xDirectionIndex]
-        rotationAngle = -math.atan2(xDirectionPosition.y, xDirectionPosition.x)
+        xDirectionX, xDirectionY = positions2D[xDirectionIndex]
+        rotationAngle = -math.atan2(xDirectionY, xDirectionX)
         
         if yDirectionIndex is not None and yDirectionIndex in positions2D:
-            yDirectionPosition = positions2D[yDirectionIndex]
-            rotatedYDirectionY = yDirectionPosition.x * math.sin(rotationAngle) + yDirectionPosition.y * math.cos(rotationAngle)
+            yDirectionX, yDirectionY = positions2D[yDirectionIndex]
+            rotatedYDirectionY = yDirectionX * math.sin(rotationAngle) + yDirectionY * math.cos(rotationAngle)
             if rotatedYDirectionY < 0:
                 reflectX = True
     
@@ -616,23 +742,27 @@ def preprocess(
         planeOrigin = constants.zeroPoint
         planeXAxis = constants.xVector
         planeYAxis = constants.yVector
+
+    # Resolve the plane frame to floats once, so each point costs a single Point3D.create.
+    originX, originY, originZ = planeOrigin.x, planeOrigin.y, planeOrigin.z
+    xAxisX, xAxisY, xAxisZ = planeXAxis.x, planeXAxis.y, planeXAxis.z
+    yAxisX, yAxisY, yAxisZ = planeYAxis.x, planeYAxis.y, planeYAxis.z
+    createPoint3D = adsk.core.Point3D.create
     
-    for index, position in positions2D.items():
-        rotatedX = position.x * cosA - position.y * sinA
-        rotatedY = position.x * sinA + position.y * cosA
+    for index, (positionX, positionY) in positions2D.items():
+        rotatedX = positionX * cosA - positionY * sinA
+        rotatedY = positionX * sinA + positionY * cosA
         if reflectX:
             rotatedY = -rotatedY
         
         totalX = rotatedX + xOffset
         totalY = rotatedY + yOffset
         
-        point3D = planeOrigin.copy()
-        xVec = planeXAxis.copy()
-        xVec.scaleBy(totalX)
-        point3D.translateBy(xVec)
-        yVec = planeYAxis.copy()
-        yVec.scaleBy(totalY)
-        point3D.translateBy(yVec)
+        point3D = createPoint3D(
+            originX + xAxisX * totalX + yAxisX * totalY,
+            originY + xAxisY * totalX + yAxisY * totalY,
+            originZ + xAxisZ * totalX + yAxisZ * totalY
+        )
         
         mappedPoints[index] = point3D
         
@@ -662,25 +792,31 @@ def drawEdgesToSketch(
     skipDiagonalFunction = None,
     drawOnlyBoundaryEdges: bool = True
 ):
-    """Draw triangle edges to sketch, marking boundary edges as non-construction."""
+    """Draw triangle edges to sketch, marking boundary edges as non-construction.
+
+    The sketch API methods are bound once outside the loops, and every sketch point is
+    created only once and shared by all lines that end at it. Callers are expected to
+    defer the sketch compute while drawing.
+    """
     try:
-        boundaryEdges = {edge for edge, triangles in edgeToTriangles.items() if len(triangles) == 1}
+        boundaryEdges = {edge for edge, edgeTriangles in edgeToTriangles.items() if len(edgeTriangles) == 1}
         drawnEdges = set()
-        sketchLines = sketch.sketchCurves.sketchLines
-        sketchPoints = sketch.sketchPoints
+        addSketchPoint = sketch.sketchPoints.add
+        addSketchLine = sketch.sketchCurves.sketchLines.addByTwoPoints
         createdSketchPoints: Dict[int, adsk.fusion.SketchPoint] = {}
+
+        def getSketchPoint(index: int) -> adsk.fusion.SketchPoint:
+            sketchPoint = createdSketchPoints.get(index)
+            if sketchPoint is None:
+                sketchPoint = addSketchPoint(mappedPoints[index])
+                createdSketchPoints[index] = sketchPoint
+            return sketchPoint
         
         if drawOnlyBoundaryEdges:
             for edgeKey in boundaryEdges:
                 indexA, indexB = edgeKey
                 if indexA in mappedPoints and indexB in mappedPoints:
-                    if indexA not in createdSketchPoints:
-                        createdSketchPoints[indexA] = sketchPoints.add(mappedPoints[indexA])
-                    if indexB not in createdSketchPoints:
-                        createdSketchPoints[indexB] = sketchPoints.add(mappedPoints[indexB])
-                    
-                    point1, point2 = createdSketchPoints[indexA], createdSketchPoints[indexB]
-                    newLine = sketchLines.addByTwoPoints(point1, point2)
+                    newLine = addSketchLine(getSketchPoint(indexA), getSketchPoint(indexB))
                     newLine.isFixed = True
                     drawnEdges.add(edgeKey)
 
@@ -690,7 +826,7 @@ def drawEdgesToSketch(
                 
                 for k in range(3):
                     indexA, indexB = triangle[k], triangle[(k + 1) % 3]
-                    edgeKey = tuple(sorted((indexA, indexB)))
+                    edgeKey = (indexA, indexB) if indexA < indexB else (indexB, indexA)
                     
                     if edgeKey in drawnEdges:
                         continue
@@ -699,13 +835,7 @@ def drawEdgesToSketch(
                         continue
                     
                     if indexA in mappedPoints and indexB in mappedPoints:
-                        if indexA not in createdSketchPoints:
-                            createdSketchPoints[indexA] = sketchPoints.add(mappedPoints[indexA])
-                        if indexB not in createdSketchPoints:
-                            createdSketchPoints[indexB] = sketchPoints.add(mappedPoints[indexB])
-                        
-                        point1, point2 = createdSketchPoints[indexA], createdSketchPoints[indexB]
-                        newLine = sketchLines.addByTwoPoints(point1, point2)
+                        newLine = addSketchLine(getSketchPoint(indexA), getSketchPoint(indexB))
                         if edgeKey not in boundaryEdges:
                             newLine.isConstruction = True
                         newLine.isFixed = True
@@ -714,171 +844,160 @@ def drawEdgesToSketch(
         showMessage(f'drawEdgesToSketch: {traceback.format_exc()}\n', True)
 
 
-def unfoldFaceToSketch(face: adsk.fusion.BRepFace, accuracy: float, sketch: adsk.fusion.Sketch, 
-                       originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D, 
-                       constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float,
-                       algorithm: constants.UnfoldAlgorithm = constants.UnfoldAlgorithm.Mesh):
-    """
-    Unfold a face to a flat sketch representation.
-    
-    Supports two algorithms:
-    - Mesh: Uses mesh triangulation (fastest, less accurate)
-    - NURBS: Uses SurfaceEvaluator with uniform grid (balanced)
+@dataclass
+class UnfoldResult:
+    """Flat layout of a triangulated surface, independent of the target sketch placement.
+
+    Holds everything needed to emit the unfold into a sketch, so the same layout can be
+    emitted again for a different construction plane or offset without unfolding again.
     """
-    if algorithm == constants.UnfoldAlgorithm.Mesh:
-        unfoldFaceToSketchWithMesh(face, accuracy, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
-    else:
-        unfoldFaceToSketchWithNurbs(face, accuracy, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
+    points3D: List[adsk.core.Point3D]
+    triangles: List[List[int]]
+    edgeToTriangles: Dict[Tuple[int, int], List[int]]
+    positions2D: Dict[int, Tuple[float, float]]
+    visitedTriangles: Set[int]
+    normals: Dict[int, adsk.core.Vector3D]
+    xDirectionIndex: int
+    yDirectionIndex: int
+    skipDiagonal: Callable[[int, int], bool] | None = None
 
 
-def unfoldFacesToSketch(
-    faces: list[adsk.fusion.BRepFace],
-    accuracy: float,
-    sketch: adsk.fusion.Sketch,
-    originPoint: adsk.core.Point3D,
-    xDirPoint: adsk.core.Point3D,
-    yDirPoint: adsk.core.Point3D,
-    constructionPlane: adsk.fusion.ConstructionPlane,
-    xOffset: float,
-    yOffset: float,
-    algorithm: constants.UnfoldAlgorithm = constants.UnfoldAlgorithm.Mesh
-) -> None:
-    """Unfold one or more connected faces to a flat sketch representation."""
-    if not faces:
+def emitUnfoldToSketch(result: UnfoldResult, sketch: adsk.fusion.Sketch,
+                       constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float) -> None:
+    """Draw an unfolded layout to a sketch on the given construction plane.
+
+    Args:
+        result: The unfolded layout to draw.
+        sketch: The sketch to draw the unfolded layout to.
+        constructionPlane: The construction plane for 3D transformation.
+        xOffset: Offset along the X axis of the construction plane.
+        yOffset: Offset along the Y axis of the construction plane.
+    """
+    if result is None:
         return
 
-    if len(faces) == 1:
-        unfoldFaceToSketch(
-            faces[0],
-            accuracy,
+    try:
+        sketch.isComputeDeferred = True
+
+        mappedPoints = preprocess(
+            result.positions2D,
+            result.xDirectionIndex,
+            result.yDirectionIndex,
+            result.points3D,
+            result.normals,
             sketch,
-            originPoint,
-            xDirPoint,
-            yDirPoint,
             constructionPlane,
             xOffset,
-            yOffset,
-            algorithm
+            yOffset
         )
-        return
 
-    unfoldFacesToSketchWithMesh(
-        faces,
-        accuracy,
-        sketch,
-        originPoint,
-        xDirPoint,
-        yDirPoint,
-        constructionPlane,
-        xOffset,
-        yOffset
-    )
+        drawEdgesToSketch(result.triangles, result.visitedTriangles, mappedPoints, result.edgeToTriangles, sketch, result.skipDiagonal)
+
+    except:
+        showMessage(f'emitUnfoldToSketch: {traceback.format_exc()}\n', True)
+
+    finally:
+        sketch.isComputeDeferred = False
+
+
+def unfoldFace(face: adsk.fusion.BRepFace, accuracy: float,
+               originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D,
+               algorithm: constants.UnfoldAlgorithm = constants.UnfoldAlgorithm.Mesh) -> UnfoldResult | None:
+    """Unfold a face to a flat layout with the given algorithm.
+
+    Supports two algorithms:
+    - Mesh: Uses mesh triangulation (fastest, less accurate)
+    - NURBS: Uses SurfaceEvaluator with uniform grid (balanced)
+    """
+    if algorithm == constants.UnfoldAlgorithm.Mesh:
+        return unfoldFaceWithMesh(face, accuracy, originPoint, xDirPoint, yDirPoint)
+    return unfoldFaceWithNurbs(face, accuracy, originPoint, xDirPoint, yDirPoint)
 
 
-def unfoldMeshToSketch(mesh: adsk.fusion.TriangleMesh, sketch: adsk.fusion.Sketch, 
-                       originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D,
-                       constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float):
-    """Unfold a mesh body to a flat sketch representation.
+def unfoldMesh(mesh: adsk.fusion.TriangleMesh, originPoint: adsk.core.Point3D,
+               xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D) -> UnfoldResult | None:
+    """Unfold a mesh to a flat layout.
     
     Args:
         mesh: The mesh to unfold.
-        sketch: The sketch to draw the unfolded mesh to.
-        originPoint: The point to use as the origin (0,0) in the sketch.
+        originPoint: The point to use as the origin (0,0) of the layout.
         xDirPoint: The point to define the +X direction from origin.
         yDirPoint: The point to define the +Y direction from origin.
-        constructionPlane: The construction plane for 3D transformation.
-        xOffset: Offset along the X axis of the construction plane.
-        yOffset: Offset along the Y axis of the construction plane.
+
+    Returns:
+        The unfolded layout, or None if the mesh could not be unfolded.
     """
     try:
         nodes = mesh.nodeCoordinates
         normalVectorsArray = mesh.normalVectors
+        # The unfold math reads the flat coordinate array, so it makes no per-point API calls.
+        coordinates = mesh.nodeCoordinatesAsDouble
+        coordinates3D = list(zip(coordinates[0::3], coordinates[1::3], coordinates[2::3]))
         indices = mesh.nodeIndices
-        triangleCount = mesh.triangleCount
-        triangles = [[indices[t * 3], indices[t * 3 + 1], indices[t * 3 + 2]] for t in range(triangleCount)]
+        triangles = [list(triangle) for triangle in zip(indices[0::3], indices[1::3], indices[2::3])]
         normals = {index: normalVectorsArray[index] for index in range(len(normalVectorsArray))}
 
-        unfoldTrianglesToSketch(
-            list(nodes),
-            triangles,
-            sketch,
-            originPoint,
-            xDirPoint,
-            yDirPoint,
-            constructionPlane,
-            xOffset,
-            yOffset,
-            normals
-        )
+        return unfoldTriangles(list(nodes), triangles, originPoint, xDirPoint, yDirPoint, normals, coordinates3D)
 
     except:
-        showMessage(f'unfoldMeshToSketch: {traceback.format_exc()}\n', True)
+        showMessage(f'unfoldMesh: {traceback.format_exc()}\n', True)
+        return None
 
 
-def unfoldTrianglesToSketch(
+def unfoldTriangles(
     points3D: List[adsk.core.Point3D],
     triangles: List[List[int]],
-    sketch: adsk.fusion.Sketch,
     originPoint: adsk.core.Point3D,
     xDirPoint: adsk.core.Point3D,
     yDirPoint: adsk.core.Point3D,
-    constructionPlane: adsk.fusion.ConstructionPlane,
-    xOffset: float,
-    yOffset: float,
-    normals: Dict[int, adsk.core.Vector3D] | None = None
-) -> None:
-    """Unfold triangle data to a flat sketch representation."""
-    try:
-        sketch.isComputeDeferred = True
+    normals: Dict[int, adsk.core.Vector3D] | None = None,
+    coordinates3D: List[Tuple[float, float, float]] | None = None
+) -> UnfoldResult | None:
+    """Unfold triangle data to a flat layout.
 
+    coordinates3D can be passed when the caller already has the (x, y, z) values of
+    points3D, for example from a bulk mesh array; otherwise they are read from the points.
+    """
+    try:
         edgeToTriangles = buildEdgeToTrianglesMap(triangles)
 
-        originIndex = findClosestPointIndex(originPoint, points3D)
-        xDirectionIndex = findClosestPointIndex(xDirPoint, points3D)
-        yDirectionIndex = findClosestPointIndex(yDirPoint, points3D)
+        if coordinates3D is None:
+            coordinates3D = [point.asArray() for point in points3D]
+
+        originIndex = findClosestCoordinateIndex(originPoint, coordinates3D)
+        xDirectionIndex = findClosestCoordinateIndex(xDirPoint, coordinates3D)
+        yDirectionIndex = findClosestCoordinateIndex(yDirPoint, coordinates3D)
 
-        positions2D, visitedTriangles = unfoldTrianglesToPositions2D(triangles, points3D, originIndex, edgeToTriangles)
+        positions2D, visitedTriangles = unfoldTrianglesToPositions2D(triangles, coordinates3D, originIndex, edgeToTriangles)
 
         if normals is None:
             normals = calculateVertexNormals(triangles, points3D, visitedTriangles)
         else:
             normals = {index: normal for index, normal in normals.items() if index in positions2D}
 
-        mappedPoints = preprocess(
-            positions2D,
-            xDirectionIndex,
-            yDirectionIndex,
-            points3D,
-            normals,
-            sketch,
-            constructionPlane,
-            xOffset,
-            yOffset
-        )
-
-        drawEdgesToSketch(triangles, visitedTriangles, mappedPoints, edgeToTriangles, sketch)
+        return UnfoldResult(points3D, triangles, edgeToTriangles, positions2D, visitedTriangles, normals, xDirectionIndex, yDirectionIndex)
 
     except:
-        showMessage(f'unfoldTrianglesToSketch: {traceback.format_exc()}\n', True)
+        showMessage(f'unfoldTriangles: {traceback.format_exc()}\n', True)
+        return None
 
-    finally:
-        sketch.isComputeDeferred = False
 
+def getUnfoldMeshSettings() -> meshIsotropic.IsotropicRemeshSettings:
+    """Return the isotropic remesh settings used for mesh based unfolding."""
+    return meshIsotropic.IsotropicRemeshSettings(
+        constants.MeshRemesh.surfaceTolerance,
+        constants.MeshRemesh.maxNormalDeviation,
+        constants.MeshRemesh.maxAspectRatio,
+        constants.Unfold.meshIsotropicIterationCount,
+        constants.Unfold.meshIsotropicSmoothingBlend,
+    )
 
 
-def unfoldFaceToSketchWithMesh(face: adsk.fusion.BRepFace, accuracy: float, sketch: adsk.fusion.Sketch, 
-                           originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D,
-                           constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float):
-    """Unfold a face to a flat sketch representation using mesh triangulation."""
+def unfoldFaceWithMesh(face: adsk.fusion.BRepFace, accuracy: float,
+                       originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D) -> UnfoldResult | None:
+    """Unfold a face to a flat layout using mesh triangulation."""
     try:
-        meshSettings = meshIsotropic.IsotropicRemeshSettings(
-            constants.MeshRemesh.surfaceTolerance,
-            constants.MeshRemesh.maxNormalDeviation,
-            constants.MeshRemesh.maxAspectRatio,
-            constants.Unfold.meshIsotropicIterationCount,
-            constants.Unfold.meshIsotropicSmoothingBlend,
-        )
-        tessellationResult = meshIsotropic.createIsotropicTessellationResult([face], accuracy, meshSettings)
+        tessellationResult = meshIsotropic.createIsotropicTessellationResult([face], accuracy, getUnfoldMeshSettings())
         meshData = tessellationResult.finalMeshData if tessellationResult is not None else None
         if meshData is not None:
             points3D = getMeshDataPoints(meshData)
@@ -886,91 +1005,31 @@ def unfoldFaceToSketchWithMesh(face: adsk.fusion.BRepFace, accuracy: float, sket
             triangles = [list(triangle) for triangle in triangleIndices]
 
             if points3D and triangles:
-                unfoldTrianglesToSketch(
-                    points3D,
-                    triangles,
-                    sketch,
-                    originPoint,
-                    xDirPoint,
-                    yDirPoint,
-                    constructionPlane,
-                    xOffset,
-                    yOffset
-                )
-                return
+                return unfoldTriangles(points3D, triangles, originPoint, xDirPoint, yDirPoint,
+                                       coordinates3D=getMeshDataCoordinates(meshData))
 
         mesh = createFaceMesh(face, accuracy)
 
         if mesh is None:
-            return
-
-        unfoldMeshToSketch(mesh, sketch, originPoint, xDirPoint, yDirPoint, constructionPlane, xOffset, yOffset)
-
-    except:
-        showMessage(f'unfoldFaceToSketchMesh: {traceback.format_exc()}\n', True)
-
-
-def unfoldFacesToSketchWithMesh(
-    faces: list[adsk.fusion.BRepFace],
-    accuracy: float,
-    sketch: adsk.fusion.Sketch,
-    originPoint: adsk.core.Point3D,
-    xDirPoint: adsk.core.Point3D,
-    yDirPoint: adsk.core.Point3D,
-    constructionPlane: adsk.fusion.ConstructionPlane,
-    xOffset: float,
-    yOffset: float
-) -> None:
-    """Unfold multiple connected faces using one combined tessellated mesh."""
-    try:
-        meshSettings = meshIsotropic.IsotropicRemeshSettings(
-            constants.MeshRemesh.surfaceTolerance,
-            constants.MeshRemesh.maxNormalDeviation,
-            constants.MeshRemesh.maxAspectRatio,
-            constants.Unfold.meshIsotropicIterationCount,
-            constants.Unfold.meshIsotropicSmoothingBlend,
-        )
-        tessellationResult = meshIsotropic.createIsotropicTessellationResult(faces, accuracy, meshSettings)
-        meshData = tessellationResult.finalMeshData if tessellationResult is not None else None
-        if meshData is None:
-            return
+            return None
 
-        points3D = getMeshDataPoints(meshData)
-        triangleIndices = getTriangleIndicesFromMeshData(meshData)
-        triangles = [list(triangle) for triangle in triangleIndices]
-
-        if not points3D or not triangles:
-            return
-
-        unfoldTrianglesToSketch(
-            points3D,
-            triangles,
-            sketch,
-            originPoint,
-            xDirPoint,
-            yDirPoint,
-            constructionPlane,
-            xOffset,
-            yOffset
-        )
+        return unfoldMesh(mesh, originPoint, xDirPoint, yDirPoint)
 
     except:
-        showMessage(f'unfoldFacesToSketchWithMesh: {traceback.format_exc()}\n', True)
+        showMessage(f'unfoldFaceWithMesh: {traceback.format_exc()}\n', True)
+        return None
 
 
-def unfoldFaceToSketchWithNurbs(face: adsk.fusion.BRepFace, stepSize: float, sketch: adsk.fusion.Sketch, 
-                            originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D,
-                            constructionPlane: adsk.fusion.ConstructionPlane, xOffset: float, yOffset: float):
-    """Unfold a face to a flat sketch representation using SurfaceEvaluator."""
+def unfoldFaceWithNurbs(face: adsk.fusion.BRepFace, stepSize: float,
+                        originPoint: adsk.core.Point3D, xDirPoint: adsk.core.Point3D, yDirPoint: adsk.core.Point3D) -> UnfoldResult | None:
+    """Unfold a face to a flat layout using SurfaceEvaluator."""
     try:
-        sketch.isComputeDeferred = True
-
         evaluator = face.evaluator
         stepSize = max(0.05, stepSize or 0.1)
         
         rangeBox = evaluator.parametricRange()
         if rangeBox is None:
-            return
+            return None
         
         uMin, uMax = rangeBox.minPoint.x, rangeBox.maxPoint.x
         vMin, vMax = rangeBox.minPoint.y, rangeBox.maxPoint.y
@@ -982,7 +1041,7 @@ def unfoldFaceToSketchWithNurbs(face: adsk.fusion.BRepFace, stepSize: float, ske
         
         success, cornerPoints = evaluator.getPointsAtParameters(cornerParams)
         if not success or len(cornerPoints) < 4:
-            return
+            return None
         
         uDist = (cornerPoints[0].distanceTo(cornerPoints[1]) + cornerPoints[2].distanceTo(cornerPoints[3])) / 2
         vDist = (cornerPoints[0].distanceTo(cornerPoints[2]) + cornerPoints[1].distanceTo(cornerPoints[3])) / 2
@@ -998,13 +1057,13 @@ def unfoldFaceToSketchWithNurbs(face: adsk.fusion.BRepFace, stepSize: float, ske
         
         success, points3D = evaluator.getPointsAtParameters(paramGrid)
         if not success:
-            return
+            return None
         
         validData = [(idx, param, points3D[idx]) for idx, param in enumerate(paramGrid) 
                      if evaluator.isParameterOnFace(param)]
         
         if len(validData) < 3:
-            return
+            return None
         
         validIndices = [d[0] for d in validData]
         validParams = [d[1] for d in validData]
@@ -1029,23 +1088,23 @@ def unfoldFaceToSketchWithNurbs(face: adsk.fusion.BRepFace, stepSize: float, ske
                     triangles.append([index10, index11, index01])
 
         if not triangles:
-            return
+            return None
 
         edgeToTriangles = buildEdgeToTrianglesMap(triangles)
 
-        originIndex = findClosestPointIndex(originPoint, validPoints3D)
-        xDirectionIndex = findClosestPointIndex(xDirPoint, validPoints3D)
-        yDirectionIndex = findClosestPointIndex(yDirPoint, validPoints3D)
+        coordinates3D = [point.asArray() for point in validPoints3D]
+
+        originIndex = findClosestCoordinateIndex(originPoint, coordinates3D)
+        xDirectionIndex = findClosestCoordinateIndex(xDirPoint, coordinates3D)
+        yDirectionIndex = findClosestCoordinateIndex(yDirPoint, coordinates3D)
 
-        positions2D, visitedTriangles = unfoldTrianglesToPositions2D(triangles, validPoints3D, originIndex, edgeToTriangles)
+        positions2D, visitedTriangles = unfoldTrianglesToPositions2D(triangles, coordinates3D, originIndex, edgeToTriangles)
         
         success, normalVectorsArray = evaluator.getNormalsAtParameters(validParams)
         if success:
             normals = {index: normalVectorsArray[index] for index in range(len(normalVectorsArray))}
         else:
             normals = calculateVertexNormals(triangles, validPoints3D, visitedTriangles)
-        
-        mappedPoints = preprocess(positions2D, xDirectionIndex, yDirectionIndex, validPoints3D, normals, sketch, constructionPlane, xOffset, yOffset)
 
         def skipDiagonal(iA, iB):
             if iA in validToGridPosition and iB in validToGridPosition:
@@ -1053,15 +1112,12 @@ def unfoldFaceToSketchWithNurbs(face: adsk.fusion.BRepFace, stepSize: float, ske
                 uB, vB = validToGridPosition[iB]
                 return abs(uA - uB) == 1 and abs(vA - vB) == 1
             return False
-        
-        drawEdgesToSketch(triangles, visitedTriangles, mappedPoints, edgeToTriangles, sketch, skipDiagonal)
 
-        
+        return UnfoldResult(validPoints3D, triangles, edgeToTriangles, positions2D, visitedTriangles, normals, xDirectionIndex, yDirectionIndex, skipDiagonal)
+
     except:
-        showMessage(f'unfoldFaceToSketchNurbs: {traceback.format_exc()}\n', True)
-    
-    finally:
-        sketch.isComputeDeferred = False
+        showMessage(f'unfoldFaceWithNurbs: {traceback.format_exc()}\n', True)
+        return None
 
 
 def refoldBodiesToSurface(
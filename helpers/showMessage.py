@@ -1,5 +1,9 @@
+import traceback
+
 import adsk.core
 
+from .. import config
+
 _ui = adsk.core.Application.get().userInterface
 
 
@@ -28,4 +32,22 @@ def showMessage(message, error = False):
     if error:
         _ui.messageBox(f"Error: {message}")
     else:
-        _ui.messageBox(message)
\ No newline at end of file
+        _ui.messageBox(message)
+
+
+def formatException(exception: BaseException) -> str:
+    """Describe an exception for a user message.
+
+    The full traceback is only formatted when config.DEBUG is set; otherwise
+    the exception repr is returned, which is much cheaper on repeated failures.
+
+    Args:
+        exception: The exception being handled
+
+    Returns:
+        The text to show to the user.
+    """
+    if config.DEBUG:
+        return traceback.format_exc()
+
+    return repr(exception)